@@ -5,14 +5,21 @@ from typing import Dict, List, Any, Optional, Union
 from datetime import datetime, timedelta
 from time import time
 
-from fastapi import FastAPI, HTTPException, Depends, Request, Response, status
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 from zabbia.backend.config import settings
-from zabbia.backend.zabbix_api import api_client, ZabbixAPIException
+from zabbia.backend.zabbix_api import api_client, ZabbixAPIException, HOST_REF_PROJECTION
+from zabbia.backend.zabbix_projection import projection_tracker
+from zabbia.backend.services.catalog import host_catalog
+from zabbia.backend.services.snapshot import SnapshotEngine
 from zabbia.backend.nlp_processor import nlp_processor, QueryIntent
+from zabbia.backend.query_executor import query_executor, QueryExecutionError
+from zabbia.backend.chart_render import chart_renderer
+from zabbia.backend.chart_cache import chart_cache, etag_matches, CachedChart, MEDIA_TYPES
+from zabbia.backend.utils.lazy import lazy_import, is_initialized
 
 # Configuração de logging
 logging.basicConfig(
@@ -21,6 +28,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Gerador de gráficos (e NumPy) importado apenas na primeira requisição de gráfico
+chart_generator = lazy_import("zabbia.backend.chart_utils", "chart_generator")
+
+# Nomes das severidades de triggers/problemas do Zabbix
+SEVERITY_NAMES = {
+    0: "Not classified",
+    1: "Information",
+    2: "Warning",
+    3: "Average",
+    4: "High",
+    5: "Disaster"
+}
+
 # Criar aplicação FastAPI
 app = FastAPI(
     title="Zabbia API",
@@ -127,13 +147,14 @@ async def process_query(request: ZabbiaQuery):
     query = request.query
     
     try:
-        # Identificar intenção da consulta
-        intent = nlp_processor.detect_intent(query)
+        # Analisar a consulta uma única vez (intenção, host, período, limites)
+        parsed = nlp_processor.parse(query)
+        intent = parsed.intent
         logger.info(f"Intenção detectada: {intent} para consulta: '{query}'")
         
         # Extrair parâmetros relevantes
-        host = nlp_processor.extract_host(query)
-        time_range = nlp_processor.extract_time_range(query)
+        host = parsed.host
+        time_range = parsed.time_range
         
         response_text = ""
         data = {}
@@ -143,7 +164,7 @@ async def process_query(request: ZabbiaQuery):
         # Processar conforme a intenção
         if intent == QueryIntent.GRAPH_REQUEST:
             # Gerar dados para gráfico
-            chart_data = nlp_processor.generate_graph_data(query)
+            chart_data = nlp_processor.generate_graph_data(parsed)
             
             # Em um sistema real, buscaríamos os dados históricos
             # e preencheríamos o chart_data com dados reais
@@ -170,12 +191,12 @@ async def process_query(request: ZabbiaQuery):
                 response_text = "Por favor, especifique qual host deseja colocar em manutenção."
             else:
                 # Buscar ID do host pelo nome
-                host_obj = api_client.get_host_by_name(host)
+                host_obj = api_client.get_host_by_name(host, projection=HOST_REF_PROJECTION)
                 
                 if not host_obj:
                     response_text = f"Host '{host}' não encontrado no Zabbix."
                 else:
-                    duration = nlp_processor.extract_duration(query, 60)  # Minutos
+                    duration = parsed.duration_or(60)  # Minutos
                     
                     # Colocar em manutenção
                     maintenance_id = api_client.set_host_maintenance(
@@ -198,87 +219,75 @@ async def process_query(request: ZabbiaQuery):
                         QueryIntent.HOST_STATUS, QueryIntent.HOST_UPTIME,
                         QueryIntent.UNAVAILABLE_SERVICES, QueryIntent.ALERT_SUMMARY]:
             # Gerar SQL para a consulta
-            generated_sql, context = nlp_processor.generate_sql(query)
+            generated_sql, context = nlp_processor.generate_sql(parsed)
             sql = generated_sql
             
-            # Em um sistema real, executaríamos o SQL no banco do Zabbix
-            # e preencheríamos o data com o resultado
+            # Executar o SQL no banco do Zabbix (plano compilado e cursor preparado)
+            try:
+                result = await query_executor.execute_async(generated_sql, context)
+            except QueryExecutionError as e:
+                result = None
+                response_text = f"Erro ao consultar o banco do Zabbix: {str(e)}"
             
-            # Para o exemplo, vamos simular dados
-            if intent == QueryIntent.HIGH_CPU:
-                data = {
-                    "hosts": [
-                        {"name": "web01.example.com", "cpu_usage": 92.5},
-                        {"name": "web02.example.com", "cpu_usage": 88.7},
-                        {"name": "db01.example.com", "cpu_usage": 85.3}
-                    ],
-                    "count": 3,
-                    "threshold": context.get("threshold", 80)
-                }
-                response_text = f"Encontrados {data['count']} hosts com CPU acima de {data['threshold']}%."
-                
-            elif intent == QueryIntent.HOST_STATUS:
-                data = {
-                    "hosts": [
-                        {"name": "web01.example.com", "status": "Enabled", "availability": "Available"},
-                        {"name": "web02.example.com", "status": "Enabled", "availability": "Available"},
-                        {"name": "db01.example.com", "status": "Enabled", "availability": "Available"},
-                        {"name": "monitor01.example.com", "status": "Enabled", "availability": "Unavailable"}
-                    ],
-                    "count": 4,
-                    "available": 3,
-                    "unavailable": 1
-                }
-                response_text = f"Status atual dos hosts: {data['available']} disponíveis, {data['unavailable']} indisponíveis."
-                
-            elif intent == QueryIntent.UNAVAILABLE_SERVICES:
-                data = {
-                    "services": [
-                        {
-                            "host": "web01.example.com", 
-                            "service": "HTTP Service", 
-                            "since": "2023-06-15T14:30:00"
-                        },
-                        {
-                            "host": "db01.example.com", 
-                            "service": "MySQL Service", 
-                            "since": "2023-06-15T15:45:00"
-                        }
-                    ],
-                    "count": 2
-                }
-                response_text = f"Há {data['count']} serviços indisponíveis atualmente."
-                
-            elif intent == QueryIntent.HOST_UPTIME:
-                host_name = host if host else "todos os hosts"
-                data = {
-                    "hosts": [
-                        {"name": "web01.example.com", "uptime_days": 45.2},
-                        {"name": "web02.example.com", "uptime_days": 12.7},
-                        {"name": "db01.example.com", "uptime_days": 78.5}
-                    ]
-                }
-                response_text = f"Uptime para {host_name}:"
+            if result is not None:
+                rows = result["rows"]
                 
-            elif intent == QueryIntent.ALERT_SUMMARY:
-                data = {
-                    "alerts": [
-                        {"host": "web01.example.com", "problem": "CPU alto", "severity": "High"},
-                        {"host": "db01.example.com", "problem": "Disco cheio", "severity": "Disaster"},
-                        {"host": "web02.example.com", "problem": "Serviço HTTP indisponível", "severity": "Average"}
-                    ],
-                    "count": 3,
-                    "by_severity": {
-                        "Disaster": 1,
-                        "High": 1,
-                        "Average": 1
+                if intent in (QueryIntent.HIGH_CPU, QueryIntent.MEMORY_USAGE):
+                    data = {
+                        "hosts": rows,
+                        "count": result["count"],
+                        "threshold": context.get("threshold", 80)
+                    }
+                    resource = "CPU" if intent == QueryIntent.HIGH_CPU else "memória"
+                    response_text = f"Encontrados {data['count']} hosts com {resource} acima de {data['threshold']}%."
+                    
+                elif intent == QueryIntent.HOST_STATUS:
+                    available = sum(1 for row in rows if row.get("availability") == "Available")
+                    unavailable = sum(1 for row in rows if row.get("availability") == "Unavailable")
+                    data = {
+                        "hosts": rows,
+                        "count": result["count"],
+                        "available": available,
+                        "unavailable": unavailable
+                    }
+                    response_text = f"Status atual dos hosts: {data['available']} disponíveis, {data['unavailable']} indisponíveis."
+                    
+                elif intent == QueryIntent.UNAVAILABLE_SERVICES:
+                    data = {
+                        "services": rows,
+                        "count": result["count"]
+                    }
+                    response_text = f"Há {data['count']} serviços indisponíveis atualmente."
+                    
+                elif intent == QueryIntent.HOST_UPTIME:
+                    host_name = host if host else "todos os hosts"
+                    data = {
+                        "hosts": rows,
+                        "count": result["count"]
+                    }
+                    response_text = f"Uptime para {host_name}:"
+                    
+                elif intent == QueryIntent.ALERT_SUMMARY:
+                    by_severity: Dict[str, int] = {}
+                    for row in rows:
+                        severity = SEVERITY_NAMES.get(int(row.get("severity") or 0), "Not classified")
+                        row["severity"] = severity
+                        by_severity[severity] = by_severity.get(severity, 0) + 1
+                    
+                    data = {
+                        "alerts": rows,
+                        "count": result["count"],
+                        "by_severity": by_severity
                     }
-                }
-                response_text = f"Resumo de alertas: {data['count']} problemas ativos, incluindo {data['by_severity'].get('Disaster', 0)} críticos."
+                    response_text = f"Resumo de alertas: {data['count']} problemas ativos, incluindo {data['by_severity'].get('Disaster', 0)} críticos."
+                
+                data["truncated"] = result["truncated"]
+                if result["truncated"]:
+                    response_text += f" (exibindo as primeiras {result['count']} linhas)"
                 
         else:
             # Consulta genérica - Buscar informações básicas
-            method, params = nlp_processor.generate_api_call(query)
+            method, params = nlp_processor.generate_api_call(parsed)
             
             if method:
                 try:
@@ -364,13 +373,13 @@ async def get_problems(severity_from: Optional[int] = None, severity_till: Optio
 async def create_maintenance(request: MaintenanceRequest):
     """Coloca hosts em modo de manutenção"""
     try:
-        host_names = []
-        
-        # Buscar nomes dos hosts pelo ID
-        for host_id in request.host_ids:
-            hosts = api_client.get_hosts({"filter": {"hostid": host_id}})
-            if hosts:
-                host_names.append(hosts[0]["name"])
+        # Buscar nomes dos hosts pelo ID (uma única chamada, apenas os campos usados)
+        hosts = api_client.get_hosts(
+            {"hostids": request.host_ids},
+            projection=HOST_REF_PROJECTION
+        )
+        names_by_id = {host["hostid"]: host["name"] for host in hosts}
+        host_names = [names_by_id[host_id] for host_id in request.host_ids if host_id in names_by_id]
         
         # Definir horários
         now = datetime.now()
@@ -403,13 +412,25 @@ async def create_maintenance(request: MaintenanceRequest):
             detail=f"Erro ao criar manutenção: {str(e)}"
         )
 
+# Snapshot do dashboard atualizado em segundo plano
+dashboard_snapshot = SnapshotEngine(
+    "dashboard",
+    lambda: api_client.get_dashboard_data(),
+    interval=settings.dashboard_snapshot_interval,
+    min_force_interval=settings.dashboard_min_force_interval,
+    redis_url=settings.redis_url
+)
+
 # Rota para obter dados de dashboard
 @app.get("/dashboard", tags=["Zabbix"])
-async def get_dashboard():
-    """Obtém dados resumidos para o dashboard"""
+async def get_dashboard(refresh: bool = False):
+    """Obtém dados resumidos para o dashboard
+    
+    Os dados vêm de um snapshot pré-calculado; 'snapshot' informa sua idade.
+    Use refresh=true para forçar a atualização (limitada por intervalo mínimo).
+    """
     try:
-        dashboard_data = api_client.get_dashboard_data()
-        return dashboard_data
+        return await dashboard_snapshot.get(force=refresh)
     except ZabbixAPIException as e:
         logger.error(f"Erro ao obter dados do dashboard: {str(e)}")
         raise HTTPException(
@@ -417,14 +438,144 @@ async def get_dashboard():
             detail=f"Erro ao obter dados do dashboard: {str(e)}"
         )
 
+# Limites dos parâmetros dos gráficos: tamanho em polegadas (100 px cada) e
+# pontos por série. Evitam figuras enormes nos processos de renderização e
+# variações ilimitadas das chaves do cache
+MAX_CHART_WIDTH = 40
+MAX_CHART_HEIGHT = 30
+MAX_CHART_POINTS = 20000
+
+def _chart_response(request: Request, chart: Optional[CachedChart]) -> Response:
+    """Resposta com os bytes do gráfico (sem base64) ou 304 se o cliente já os possui"""
+    if chart is None:
+        raise HTTPException(status_code=404, detail="Nenhum dado encontrado para o gráfico")
+    
+    headers = {
+        "ETag": chart.etag,
+        "Cache-Control": f"private, max-age={settings.chart_cache_bucket}"
+    }
+    if etag_matches(request.headers.get("if-none-match"), chart.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=chart.data, media_type=chart.media_type, headers=headers)
+
+def _check_chart_format(image_format: str) -> None:
+    if image_format not in MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato inválido: {image_format} (use {', '.join(MEDIA_TYPES)})"
+        )
+
+# Rota para o gráfico de uso de recursos de um host
+@app.get("/charts/resource/{host}", tags=["Gráficos"])
+async def get_resource_chart(
+    request: Request,
+    host: str,
+    resource: str = "cpu",
+    period: str = "24h",
+    width: int = Query(10, ge=1, le=MAX_CHART_WIDTH),
+    height: int = Query(6, ge=1, le=MAX_CHART_HEIGHT),
+    image_format: str = Query("png", alias="format"),
+    max_points: Optional[int] = Query(None, ge=2, le=MAX_CHART_POINTS)
+):
+    """Imagem do uso de CPU, memória ou disco de um host (ID ou nome)
+    
+    format=png ou svg retorna os bytes da imagem; format=json retorna apenas
+    as séries (reduzidas a max_points pontos) para o navegador desenhar.
+    As respostas ficam em cache e são servidas com ETag; repetir a requisição
+    com If-None-Match retorna 304 sem consultar o banco nem renderizar.
+    """
+    _check_chart_format(image_format)
+    chart = await chart_generator.resource_usage_chart_cached(
+        host_id=int(host) if host.isdigit() else None,
+        host_name=None if host.isdigit() else host,
+        resource_type=resource,
+        time_period=period,
+        width=width,
+        height=height,
+        image_format=image_format,
+        max_points=max_points
+    )
+    return _chart_response(request, chart)
+
+# Rota para o gráfico de um ou mais itens
+@app.get("/charts/items", tags=["Gráficos"])
+async def get_items_chart(
+    request: Request,
+    item_ids: List[int] = Query(..., alias="itemid"),
+    time_from: Optional[int] = None,
+    time_till: Optional[int] = None,
+    width: Optional[int] = Query(None, ge=1, le=MAX_CHART_WIDTH),
+    height: Optional[int] = Query(None, ge=1, le=MAX_CHART_HEIGHT),
+    image_format: str = Query("png", alias="format"),
+    max_points: Optional[int] = Query(None, ge=2, le=MAX_CHART_POINTS)
+):
+    """Série temporal de um item ou comparação de vários (itemid repetido)
+    
+    Aceita os mesmos formatos de /charts/resource (png, svg ou json).
+    """
+    _check_chart_format(image_format)
+    chart = await chart_generator.items_chart_cached(
+        item_ids,
+        time_from=time_from,
+        time_till=time_till,
+        width=width,
+        height=height,
+        image_format=image_format,
+        max_points=max_points
+    )
+    return _chart_response(request, chart)
+
+# Rota de estatísticas do cache de gráficos
+@app.get("/charts/cache-stats", tags=["Sistema"])
+async def get_chart_cache_stats():
+    """Retorna ocupação, acertos e taxa de acerto do cache de gráficos"""
+    return chart_cache.stats()
+
+# Rota de depuração das projeções de campos
+@app.get("/debug/projections", tags=["Sistema"])
+async def get_projection_report():
+    """Lista os campos buscados na API do Zabbix que nunca foram lidos"""
+    if not projection_tracker.enabled:
+        raise HTTPException(
+            status_code=404,
+            detail="Modo de depuração de projeções desativado (ZABBIA_PROJECTION_DEBUG)"
+        )
+    
+    return {"unused_fields": projection_tracker.report()}
+
+# Rota de estatísticas dos caches do processador de linguagem natural
+@app.get("/nlp/cache-stats", tags=["Sistema"])
+async def get_nlp_cache_stats():
+    """Retorna tamanho, acertos e taxa de acerto dos caches de consultas"""
+    return nlp_processor.cache_stats()
+
 # Evento de inicialização e encerramento
 @app.on_event("startup")
 async def startup_event():
     """Evento executado na inicialização do servidor"""
     logger.info(f"Iniciando API Zabbia v{settings.api_version} em ambiente {settings.environment}")
+    
+    # Atualização periódica do catálogo de hosts/itens
+    host_catalog.start()
+    
+    # Snapshot do dashboard
+    await dashboard_snapshot.start()
+    
+    # Processos de renderização de gráficos (pré-aquecidos)
+    await chart_renderer.start()
+    
+    # Cache de gráficos renderizados (Redis opcional)
+    await chart_cache.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Evento executado no encerramento do servidor"""
     logger.info("Encerrando API Zabbia")
-    api_client.close() 
\ No newline at end of file
+    host_catalog.stop()
+    await dashboard_snapshot.stop()
+    await chart_renderer.stop()
+    await chart_cache.stop()
+    
+    # O cliente só existe se alguma requisição o utilizou
+    if is_initialized(api_client):
+        api_client.close() 
\ No newline at end of file
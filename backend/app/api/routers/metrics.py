@@ -5,44 +5,24 @@ from sqlmodel import Session, select
 
 from app.domain.models import Host, Metric
 from app.services.zabbix import ZabbixService
+from app.services.overview import overview_snapshot
+from app.services.series import bucket_width
 from app.services.database import get_db
 
 router = APIRouter()
 
 @router.get("/overview")
 async def get_metrics_overview(
-    session: Session = Depends(get_db),
-    zabbix_service: ZabbixService = Depends(ZabbixService)
+    refresh: bool = Query(False, description="Força a atualização do snapshot (limitada)")
 ):
     """
     Retorna uma visão geral das métricas principais para o dashboard.
     Inclui CPU, RAM, e disponibilidade de todos os hosts.
+    Os dados vêm de um snapshot atualizado em segundo plano; 'snapshot' informa
+    sua idade e 'timings' o tempo de cada parte do último cálculo (ms).
     """
     try:
-        # Obter dados dos últimos hosts ativos
-        hosts = await zabbix_service.get_active_hosts()
-        
-        # Obter métricas de CPU, RAM e disponibilidade
-        cpu_metrics = await zabbix_service.get_cpu_metrics(hours=24)
-        memory_metrics = await zabbix_service.get_memory_metrics(hours=24)
-        availability_metrics = await zabbix_service.get_availability_metrics(hours=24)
-        
-        # Calcular uptime médio
-        avg_uptime = await zabbix_service.get_average_uptime()
-        
-        # Hosts em alerta
-        hosts_in_alert = await zabbix_service.get_hosts_in_alert()
-        
-        return {
-            "hosts": hosts,
-            "metrics": {
-                "cpu": cpu_metrics,
-                "memory": memory_metrics,
-                "availability": availability_metrics
-            },
-            "avg_uptime": avg_uptime,
-            "hosts_in_alert": hosts_in_alert
-        }
+        return await overview_snapshot.get(force=refresh)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao obter métricas: {str(e)}")
 
@@ -51,11 +31,15 @@ async def get_host_metrics(
     host: str,
     from_date: Optional[datetime] = Query(None, alias="from"),
     to_date: Optional[datetime] = Query(None, alias="to"),
+    max_points: Optional[int] = Query(1000, ge=2, le=20000, description="Pontos máximos por série (resolução do gráfico)"),
+    agg: str = Query("all", pattern="^(avg|min|max|all)$", description="Agregação por intervalo: avg, min, max ou all"),
     zabbix_service: ZabbixService = Depends(ZabbixService)
 ):
     """
     Retorna métricas específicas para um host.
     Permite filtrar por período.
+    As séries numéricas são agregadas em no máximo `max_points` intervalos,
+    em vetores paralelos (timestamps e min/avg/max ou values).
     """
     if not from_date:
         from_date = datetime.now() - timedelta(hours=24)
@@ -74,7 +58,9 @@ async def get_host_metrics(
         metrics = await zabbix_service.get_host_metrics(
             host_id=host_details["hostid"],
             from_date=from_date,
-            to_date=to_date
+            to_date=to_date,
+            max_points=max_points,
+            agg=agg
         )
         
         return {
@@ -83,6 +69,11 @@ async def get_host_metrics(
             "period": {
                 "from": from_date.isoformat(),
                 "to": to_date.isoformat()
+            },
+            "resolution": {
+                "max_points": max_points,
+                "agg": agg,
+                "bucket_seconds": bucket_width(int(from_date.timestamp()), int(to_date.timestamp()), max_points)
             }
         }
     except Exception as e:
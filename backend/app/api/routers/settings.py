@@ -3,11 +3,12 @@ from pydantic import BaseModel, SecretStr, validator
 from typing import Optional
 import os
 import json
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from app.services.database import get_db
 from app.domain.models import Settings
 from app.services.zabbix import ZabbixService, test_zabbix_connection
+from app.services.zabbix_connection import zabbix_connection
 
 router = APIRouter()
 
@@ -81,6 +82,9 @@ async def save_zabbix_settings(
         
         session.commit()
         
+        # Descartar credenciais e token em cache da conexão compartilhada
+        zabbix_connection.invalidate()
+        
         return {
             "message": "Configurações do Zabbix salvas com sucesso",
             "connected": True
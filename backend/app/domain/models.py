@@ -1,6 +1,6 @@
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from sqlmodel import Field, SQLModel, JSON
+from sqlmodel import Field, SQLModel, JSON, Column
 import uuid
 
 class Base(SQLModel, table=False):
@@ -16,28 +16,41 @@ class Host(Base, table=True):
     """
     Representa um host no sistema Zabbix.
     """
-    host_id: str = Field(index=True)
+    host_id: str = Field(index=True, unique=True)
     name: str = Field(index=True)
     status: int
     ip: Optional[str] = None
     dns: Optional[str] = None
     description: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = Field(default=None, sa_column=JSON)
+    host_metadata: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column("metadata", JSON))
+    content_hash: Optional[str] = None
     
     class Config:
         arbitrary_types_allowed = True
 
-class Metric(Base, table=True):
+class Metric(SQLModel, table=True):
     """
-    Armazena métricas de um host específico.
+    Amostra numérica do histórico de um item, armazenada localmente.
+    
+    A tabela é particionada por faixa de clock (partições diárias criadas sob
+    demanda no PostgreSQL) e a chave (item_id, clock, ns) atende às consultas
+    por intervalo de tempo de um item.
+    """
+    __table_args__ = {"postgresql_partition_by": "RANGE (clock)"}
+    
+    item_id: str = Field(primary_key=True)
+    clock: int = Field(primary_key=True)
+    ns: int = Field(default=0, primary_key=True)
+    host_id: str = Field(index=True)
+    value: float
+
+class MetricCoverage(Base, table=True):
+    """
+    Intervalos de tempo de um item já copiados do Zabbix para a tabela Metric.
     """
-    host_id: str = Field(foreign_key="host.host_id", index=True)
     item_id: str = Field(index=True)
-    timestamp: datetime = Field(index=True)
-    key_: str
-    value: str
-    value_type: int
-    units: Optional[str] = None
+    clock_from: int
+    clock_till: int
 
 class Alert(Base, table=True):
     """
@@ -1,16 +1,44 @@
 from fastapi import FastAPI, Depends, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
+import asyncio
+import logging
 from typing import Optional
+from contextlib import asynccontextmanager
 
 from app.api.routers import metrics, chat, settings, license
 from app.services.licensing import verify_license
+from app.services.zabbix_connection import zabbix_connection
+from app.services.overview import overview_snapshot
+from app.services.metric_store import metric_writer
+from app.services.database import create_db_and_tables
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Cria as tabelas ausentes e atualiza as de versões anteriores
+    try:
+        await asyncio.to_thread(create_db_and_tables)
+    except Exception as e:
+        logger.error(f"Erro ao criar ou atualizar as tabelas do banco: {e}")
+    # Conexão com o Zabbix compartilhada por todas as requisições
+    await zabbix_connection.startup()
+    # Gravação em segundo plano do histórico no armazenamento local
+    await metric_writer.start()
+    # Snapshot da visão geral recalculado em segundo plano
+    await overview_snapshot.start()
+    yield
+    await overview_snapshot.stop()
+    await metric_writer.stop()
+    await zabbix_connection.shutdown()
 
 def create_app() -> FastAPI:
     app = FastAPI(
         title="Zabbia API",
         description="API para o copiloto de infraestrutura Zabbia com integração ao Zabbix",
         version="1.0.0",
+        lifespan=lifespan,
     )
     
     # Configuração CORS
@@ -0,0 +1,76 @@
+from typing import Dict, List, Iterable, Tuple
+
+# Valores de evento de trigger
+EVENT_OK = 0
+EVENT_PROBLEM = 1
+
+Interval = Tuple[int, int]
+
+def problem_intervals(events: Iterable[dict], window_start: int, window_end: int) -> List[Interval]:
+    """
+    Converte os eventos de um trigger em intervalos de problema.
+
+    Os eventos devem estar ordenados por clock. Um PROBLEM abre um intervalo
+    e o OK seguinte o fecha; um OK sem PROBLEM anterior indica um problema
+    iniciado antes da janela, e um PROBLEM sem OK permanece aberto até o fim da janela.
+    """
+    intervals = []
+    problem_start = None
+    seen_event = False
+
+    for event in events:
+        clock = int(event["clock"])
+        value = int(event["value"])
+
+        if value == EVENT_PROBLEM:
+            if problem_start is None:
+                problem_start = clock
+        elif value == EVENT_OK:
+            if problem_start is not None:
+                intervals.append((problem_start, clock))
+                problem_start = None
+            elif not seen_event:
+                intervals.append((window_start, clock))
+        seen_event = True
+
+    if problem_start is not None:
+        intervals.append((problem_start, window_end))
+
+    return intervals
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """
+    Une intervalos sobrepostos (ordenação seguida de varredura).
+
+    Problemas simultâneos em vários triggers do mesmo host contam apenas uma vez.
+    """
+    if not intervals:
+        return []
+
+    ordered = sorted(intervals)
+    merged = [ordered[0]]
+
+    for start, end in ordered[1:]:
+        last_start, last_end = merged[-1]
+        if start <= last_end:
+            if end > last_end:
+                merged[-1] = (last_start, end)
+        else:
+            merged.append((start, end))
+
+    return merged
+
+def downtime_seconds(intervals: List[Interval]) -> int:
+    """
+    Soma a duração da união dos intervalos.
+    """
+    return sum(end - start for start, end in merge_intervals(intervals))
+
+def group_events_by_trigger(events: Iterable[dict]) -> Dict[str, List[dict]]:
+    """
+    Agrupa os eventos pelo trigger de origem (objectid), mantendo a ordem.
+    """
+    grouped: Dict[str, List[dict]] = {}
+    for event in events:
+        grouped.setdefault(event["objectid"], []).append(event)
+    return grouped
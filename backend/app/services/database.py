@@ -1,7 +1,11 @@
 import os
+import logging
+from sqlalchemy import inspect, text
 from sqlmodel import SQLModel, Session, create_engine
 from typing import Generator
 
+logger = logging.getLogger(__name__)
+
 # Configuração do banco de dados
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/zabbia")
 
@@ -12,11 +16,64 @@ engine = create_engine(
     pool_pre_ping=True,
 )
 
-def create_db_and_tables():
+def _upgrade_host_table(conn, inspector) -> None:
+    """
+    Acrescenta a coluna content_hash e o índice único em host_id (exigido pelo
+    upsert do cache de hosts) a tabelas host criadas por versões anteriores.
+    """
+    columns = {column["name"] for column in inspector.get_columns("host")}
+    if "content_hash" not in columns:
+        conn.execute(text("ALTER TABLE host ADD COLUMN content_hash VARCHAR"))
+        logger.info("Coluna host.content_hash criada")
+
+    unique = [index["column_names"] for index in inspector.get_indexes("host") if index["unique"]]
+    unique += [constraint["column_names"] for constraint in inspector.get_unique_constraints("host")]
+    if ["host_id"] in unique:
+        return
+
+    # Mantém apenas a linha mais recente de cada host_id antes de criar o índice
+    conn.execute(text(
+        "DELETE FROM host WHERE EXISTS ("
+        "SELECT 1 FROM host AS newer WHERE newer.host_id = host.host_id "
+        "AND (newer.updated_at > host.updated_at "
+        "OR (newer.updated_at = host.updated_at AND newer.id > host.id)))"
+    ))
+    if "ix_host_host_id" in {index["name"] for index in inspector.get_indexes("host")}:
+        conn.execute(text("DROP INDEX ix_host_host_id"))
+    conn.execute(text("CREATE UNIQUE INDEX ix_host_host_id ON host (host_id)"))
+    logger.info("Índice único host.host_id criado")
+
+def _upgrade_metric_table(conn, inspector) -> None:
+    """
+    Remove a tabela metric no formato antigo (timestamp/key_/valor em texto),
+    que nunca recebeu dados; o create_all a recria com o formato atual.
+    """
+    columns = {column["name"] for column in inspector.get_columns("metric")}
+    if "clock" in columns:
+        return
+    conn.execute(text("DROP TABLE metric"))
+    logger.info("Tabela metric no formato antigo removida para ser recriada")
+
+def upgrade_schema(db_engine=engine) -> None:
+    """
+    Ajusta tabelas existentes ao modelo atual (idempotente).
+
+    O create_all apenas cria tabelas ausentes; as alterações em tabelas já
+    existentes são aplicadas aqui.
+    """
+    with db_engine.begin() as conn:
+        inspector = inspect(conn)
+        if inspector.has_table("host"):
+            _upgrade_host_table(conn, inspector)
+        if inspector.has_table("metric"):
+            _upgrade_metric_table(conn, inspector)
+
+def create_db_and_tables(db_engine=engine):
     """
-    Cria as tabelas no banco de dados se elas não existirem.
+    Cria as tabelas no banco de dados se elas não existirem e atualiza as existentes.
     """
-    SQLModel.metadata.create_all(engine)
+    upgrade_schema(db_engine)
+    SQLModel.metadata.create_all(db_engine)
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -0,0 +1,185 @@
+import json
+import uuid
+import asyncio
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Set
+
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+
+from app.services.database import engine
+from app.domain.models import Host
+
+logger = logging.getLogger(__name__)
+
+# Quantidade de hosts por instrução INSERT ... ON CONFLICT
+# (mantém o número de parâmetros abaixo do limite do PostgreSQL)
+HOST_UPSERT_BATCH_SIZE = 5000
+
+# Colunas reescritas quando o conteúdo do host muda
+HOST_UPDATE_COLUMNS = ("name", "status", "description", "ip", "dns", "metadata", "content_hash", "updated_at")
+
+def host_content_hash(host_data: dict) -> str:
+    """
+    Calcula o hash do conteúdo de um host retornado pelo host.get.
+    """
+    payload = json.dumps(host_data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def host_row(host_data: dict, content_hash: str) -> dict:
+    """
+    Converte um host da API do Zabbix em uma linha da tabela Host.
+    """
+    interfaces = host_data.get("interfaces") or []
+    now = datetime.utcnow()
+    return {
+        "id": uuid.uuid4(),
+        "created_at": now,
+        "updated_at": now,
+        "host_id": host_data["hostid"],
+        "name": host_data["name"],
+        "status": int(host_data["status"]),
+        "description": host_data.get("description", ""),
+        "ip": interfaces[0].get("ip") if interfaces else None,
+        "dns": interfaces[0].get("dns") if interfaces else None,
+        "metadata": host_data,
+        "content_hash": content_hash
+    }
+
+class HostCache:
+    """
+    Mantém a tabela Host sincronizada com a lista de hosts do Zabbix.
+
+    Os hashes de conteúdo já gravados ficam em memória; apenas os hosts novos
+    ou alterados são enviados ao banco, em um INSERT ... ON CONFLICT DO UPDATE
+    por lote que só reescreve a linha quando o hash difere (em bancos sem
+    ON CONFLICT, consulta os existentes e faz UPDATE/INSERT). A gravação roda
+    em uma thread, fora da requisição.
+    """
+
+    def __init__(self, db_engine=engine):
+        self.engine = db_engine
+        self._hashes: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+        self._pending: Optional[List[dict]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._background: Set[asyncio.Task] = set()
+
+    def _insert(self):
+        """
+        INSERT com suporte a ON CONFLICT, ou None se o banco não tiver suporte.
+        """
+        dialect = self.engine.dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(Host.__table__)
+        if dialect == "sqlite":
+            return sqlite.insert(Host.__table__)
+        return None
+
+    def _upsert(self, session: Session, rows: List[dict]) -> None:
+        table = Host.__table__
+        stmt = self._insert().values(rows)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.host_id],
+            set_={column: excluded[column] for column in HOST_UPDATE_COLUMNS},
+            where=table.c.content_hash.is_distinct_from(excluded["content_hash"])
+        )
+        session.execute(stmt)
+
+    def _select_then_update(self, session: Session, rows: List[dict]) -> None:
+        """
+        Alternativa sem ON CONFLICT: atualiza os hosts existentes e insere os novos.
+        """
+        table = Host.__table__
+        existing = set(session.execute(
+            select(table.c.host_id).where(table.c.host_id.in_([row["host_id"] for row in rows]))
+        ).scalars())
+
+        new_rows = [row for row in rows if row["host_id"] not in existing]
+        if new_rows:
+            session.execute(table.insert(), new_rows)
+
+        changed = [
+            {"key_host_id": row["host_id"], **{f"new_{column}": row[column] for column in HOST_UPDATE_COLUMNS}}
+            for row in rows if row["host_id"] in existing
+        ]
+        if changed:
+            stmt = (
+                update(table)
+                .where(table.c.host_id == bindparam("key_host_id"))
+                .values({column: bindparam(f"new_{column}") for column in HOST_UPDATE_COLUMNS})
+            )
+            session.execute(stmt, changed)
+
+    def _load_hashes(self, session: Session) -> Dict[str, str]:
+        table = Host.__table__
+        rows = session.execute(select(table.c.host_id, table.c.content_hash)).all()
+        return {host_id: content_hash for host_id, content_hash in rows}
+
+    def sync(self, hosts: List[dict]) -> int:
+        """
+        Grava os hosts novos ou alterados.
+
+        Returns:
+            Quantidade de hosts enviados ao banco
+        """
+        with self._lock, Session(self.engine) as session:
+            if self._hashes is None:
+                self._hashes = self._load_hashes(session)
+
+            rows = []
+            for host_data in hosts:
+                content_hash = host_content_hash(host_data)
+                if self._hashes.get(host_data["hostid"]) != content_hash:
+                    rows.append(host_row(host_data, content_hash))
+
+            if not rows:
+                return 0
+
+            write = self._upsert if self._insert() is not None else self._select_then_update
+            for i in range(0, len(rows), HOST_UPSERT_BATCH_SIZE):
+                write(session, rows[i:i + HOST_UPSERT_BATCH_SIZE])
+
+            session.commit()
+
+            for row in rows:
+                self._hashes[row["host_id"]] = row["content_hash"]
+
+            logger.info(f"Cache de hosts atualizado: {len(rows)} de {len(hosts)} hosts gravados")
+            return len(rows)
+
+    async def _drain(self) -> None:
+        # Processa sempre a lista mais recente; listas intermediárias são descartadas
+        while self._pending is not None:
+            hosts, self._pending = self._pending, None
+            try:
+                await asyncio.to_thread(self.sync, hosts)
+            except Exception as e:
+                logger.error(f"Erro ao atualizar cache de hosts: {e}")
+
+    def schedule(self, hosts: List[dict]) -> None:
+        """
+        Agenda a sincronização em segundo plano, sem bloquear a requisição.
+        """
+        self._pending = hosts
+        if self._task is not None and not self._task.done():
+            return
+
+        self._task = asyncio.get_running_loop().create_task(self._drain())
+        self._background.add(self._task)
+        self._task.add_done_callback(self._background.discard)
+
+    def invalidate(self) -> None:
+        """
+        Descarta os hashes em memória (recarregados do banco na próxima sincronização).
+        """
+        with self._lock:
+            self._hashes = None
+
+# Cache global de hosts do processo
+host_cache = HostCache()
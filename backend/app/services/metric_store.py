@@ -0,0 +1,250 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import select, delete, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+
+from app.services.database import engine
+from app.domain.models import Metric, MetricCoverage
+from app.services.availability import merge_intervals
+
+logger = logging.getLogger(__name__)
+
+# Tamanho de cada partição da tabela Metric (segundos)
+PARTITION_SECONDS = 86400
+
+# Amostras por instrução INSERT
+METRIC_INSERT_BATCH_SIZE = 5000
+
+# Amostras acumuladas antes de gravar e tempo máximo de espera (segundos)
+METRIC_WRITE_BATCH = int(os.getenv("METRIC_WRITE_BATCH", "20000"))
+METRIC_FLUSH_INTERVAL = float(os.getenv("METRIC_FLUSH_INTERVAL", "2"))
+
+# Dados mais recentes que isso ainda podem chegar ao Zabbix e não são marcados como cobertos
+METRIC_INGEST_LAG = int(os.getenv("METRIC_INGEST_LAG", "300"))
+
+Range = Tuple[int, int]
+
+def subtract_ranges(start: int, end: int, covered: Iterable[Range]) -> List[Range]:
+    """
+    Retorna os trechos de [start, end] não cobertos pelos intervalos informados.
+    """
+    gaps = []
+    cursor = start
+    for cov_start, cov_end in merge_intervals(list(covered)):
+        if cov_end < cursor:
+            continue
+        if cov_start > end:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, cov_start - 1))
+        cursor = max(cursor, cov_end + 1)
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+class MetricStore:
+    """
+    Armazenamento local das amostras numéricas do histórico do Zabbix.
+
+    Grava as amostras na tabela Metric (valor float, particionada por dia no
+    PostgreSQL) e registra em MetricCoverage os intervalos já copiados, para
+    que as leituras consultem o Zabbix apenas nas lacunas.
+    """
+
+    def __init__(self, db_engine=engine):
+        self.engine = db_engine
+        self._partitions: Set[int] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def partitioned(self) -> bool:
+        return self.engine.dialect.name == "postgresql"
+
+    def _insert(self, table):
+        if self.partitioned:
+            return postgresql.insert(table)
+        return sqlite.insert(table)
+
+    def ensure_partitions(self, session: Session, clock_from: int, clock_till: int) -> None:
+        """
+        Cria as partições diárias que cobrem [clock_from, clock_till], se necessário.
+        """
+        if not self.partitioned:
+            return
+
+        first_day = clock_from - clock_from % PARTITION_SECONDS
+        for day_start in range(first_day, clock_till + 1, PARTITION_SECONDS):
+            if day_start in self._partitions:
+                continue
+            suffix = datetime.fromtimestamp(day_start, tz=timezone.utc).strftime("%Y%m%d")
+            session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS metric_p{suffix} PARTITION OF metric "
+                f"FOR VALUES FROM ({day_start}) TO ({day_start + PARTITION_SECONDS})"
+            ))
+            self._partitions.add(day_start)
+
+    def write(self, samples: List[dict], coverage: List[Tuple[str, int, int]]) -> None:
+        """
+        Grava amostras e, em seguida, os intervalos que elas cobrem.
+
+        Args:
+            samples: Amostras com item_id, clock, ns, host_id e value
+            coverage: Tuplas (item_id, clock_from, clock_till) copiadas por completo
+        """
+        with self._lock, Session(self.engine) as session:
+            if samples:
+                clocks = [sample["clock"] for sample in samples]
+                self.ensure_partitions(session, min(clocks), max(clocks))
+
+                table = Metric.__table__
+                for i in range(0, len(samples), METRIC_INSERT_BATCH_SIZE):
+                    stmt = self._insert(table).values(samples[i:i + METRIC_INSERT_BATCH_SIZE])
+                    session.execute(stmt.on_conflict_do_nothing())
+
+            if coverage:
+                self._merge_coverage(session, coverage)
+
+            session.commit()
+
+    def _merge_coverage(self, session: Session, coverage: List[Tuple[str, int, int]]) -> None:
+        table = MetricCoverage.__table__
+        new_ranges: Dict[str, List[Range]] = {}
+        for item_id, clock_from, clock_till in coverage:
+            if clock_till >= clock_from:
+                new_ranges.setdefault(item_id, []).append((clock_from, clock_till))
+        if not new_ranges:
+            return
+
+        existing = self._coverage(session, new_ranges.keys())
+        session.execute(delete(table).where(table.c.item_id.in_(list(new_ranges))))
+
+        rows = []
+        for item_id, ranges in new_ranges.items():
+            # Intervalos adjacentes (diferença de 1 segundo) também são unidos
+            merged = merge_intervals([(start, end + 1) for start, end in existing.get(item_id, []) + ranges])
+            rows.extend(
+                MetricCoverage(item_id=item_id, clock_from=start, clock_till=end - 1)
+                for start, end in merged
+            )
+        session.add_all(rows)
+
+    def _coverage(self, session: Session, item_ids: Iterable[str]) -> Dict[str, List[Range]]:
+        table = MetricCoverage.__table__
+        rows = session.execute(
+            select(table.c.item_id, table.c.clock_from, table.c.clock_till)
+            .where(table.c.item_id.in_(list(item_ids)))
+        ).all()
+        coverage: Dict[str, List[Range]] = {}
+        for item_id, clock_from, clock_till in rows:
+            coverage.setdefault(item_id, []).append((clock_from, clock_till))
+        return coverage
+
+    def gaps(self, item_ids: List[str], clock_from: int, clock_till: int) -> Dict[str, List[Range]]:
+        """
+        Retorna, por item, os trechos de [clock_from, clock_till] ausentes do armazenamento.
+        """
+        with Session(self.engine) as session:
+            coverage = self._coverage(session, item_ids)
+        return {
+            item_id: subtract_ranges(clock_from, clock_till, coverage.get(item_id, []))
+            for item_id in item_ids
+        }
+
+    def read(self, item_ids: List[str], clock_from: int, clock_till: int) -> List[dict]:
+        """
+        Lê as amostras dos itens no intervalo, ordenadas por item e clock.
+        """
+        if not item_ids:
+            return []
+
+        table = Metric.__table__
+        with Session(self.engine) as session:
+            rows = session.execute(
+                select(table.c.item_id, table.c.clock, table.c.value)
+                .where(table.c.item_id.in_(item_ids))
+                .where(table.c.clock >= clock_from)
+                .where(table.c.clock <= clock_till)
+                .order_by(table.c.item_id, table.c.clock, table.c.ns)
+            ).all()
+
+        return [{"itemid": item_id, "clock": clock, "value": value} for item_id, clock, value in rows]
+
+class MetricWriter:
+    """
+    Fila de gravação assíncrona (write-behind) para o MetricStore.
+
+    As requisições apenas enfileiram as amostras obtidas do Zabbix; uma tarefa
+    em segundo plano agrupa os lotes e grava em uma thread.
+    """
+
+    def __init__(self, store: MetricStore):
+        self.store = store
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Grava o que estiver pendente e encerra a tarefa.
+        """
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    def submit(self, samples: List[dict], coverage: List[Tuple[str, int, int]]) -> None:
+        """
+        Enfileira amostras e os intervalos que elas cobrem (não bloqueia).
+        """
+        if self._queue is None or self._task is None or self._task.done():
+            return
+        self._queue.put_nowait((samples, coverage))
+
+    async def _flush(self, samples: List[dict], coverage: List[Tuple[str, int, int]]) -> None:
+        try:
+            await asyncio.to_thread(self.store.write, samples, coverage)
+        except Exception as e:
+            logger.error(f"Erro ao gravar {len(samples)} amostras no armazenamento local: {e}")
+
+    async def _run(self) -> None:
+        samples: List[dict] = []
+        coverage: List[Tuple[str, int, int]] = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                batch = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                batch = ()
+
+            if batch is None:
+                if samples or coverage:
+                    await self._flush(samples, coverage)
+                return
+
+            if batch:
+                samples.extend(batch[0])
+                coverage.extend(batch[1])
+                if deadline is None:
+                    deadline = time.monotonic() + METRIC_FLUSH_INTERVAL
+
+            if (samples or coverage) and (len(samples) >= METRIC_WRITE_BATCH or time.monotonic() >= deadline):
+                await self._flush(samples, coverage)
+                samples, coverage, deadline = [], [], None
+
+# Armazenamento local e fila de gravação do processo
+metric_store = MetricStore()
+metric_writer = MetricWriter(metric_store)
@@ -0,0 +1,109 @@
+import os
+import time
+import asyncio
+from typing import Dict, Any, Awaitable, Callable
+
+from app.services.zabbix import ZabbixService
+from app.services.zabbix_connection import zabbix_connection
+from app.services.snapshot import SnapshotEngine
+
+# Intervalo de atualização do snapshot da visão geral (segundos)
+OVERVIEW_SNAPSHOT_INTERVAL = float(os.getenv("OVERVIEW_SNAPSHOT_INTERVAL", "60"))
+
+class OverviewBuilder:
+    """
+    Monta a visão geral do dashboard a partir de várias consultas ao Zabbix.
+
+    As consultas independentes são executadas em paralelo e os resultados
+    compartilhados (disponibilidade, lista de hosts) são memoizados durante
+    a requisição, de modo que cada um é buscado no máximo uma vez. O tempo
+    de cada parte é registrado em milissegundos.
+    """
+
+    def __init__(self, zabbix_service: ZabbixService, hours: int = 24):
+        self.zabbix_service = zabbix_service
+        self.hours = hours
+        self.timings: Dict[str, float] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def _timed(self, name: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.perf_counter()
+        try:
+            return await factory()
+        finally:
+            self.timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    def _memo(self, name: str, factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """
+        Retorna a tarefa já iniciada para `name` ou inicia uma nova.
+        """
+        task = self._tasks.get(name)
+        if task is None:
+            task = asyncio.ensure_future(self._timed(name, factory))
+            self._tasks[name] = task
+        return task
+
+    async def hosts(self) -> Any:
+        return await self._memo("hosts", self.zabbix_service.get_active_hosts)
+
+    async def availability(self) -> Any:
+        return await self._memo(
+            "availability",
+            lambda: self.zabbix_service.get_availability_metrics(hours=self.hours)
+        )
+
+    async def cpu(self) -> Any:
+        return await self._memo("cpu", lambda: self.zabbix_service.get_cpu_metrics(hours=self.hours))
+
+    async def memory(self) -> Any:
+        return await self._memo("memory", lambda: self.zabbix_service.get_memory_metrics(hours=self.hours))
+
+    async def hosts_in_alert(self) -> Any:
+        return await self._memo("hosts_in_alert", self.zabbix_service.get_hosts_in_alert)
+
+    async def avg_uptime(self) -> Any:
+        # Reaproveita a disponibilidade já calculada nesta requisição
+        availability = await self.availability()
+        return await self._memo(
+            "avg_uptime",
+            lambda: self.zabbix_service.get_average_uptime(availability=availability)
+        )
+
+    async def build(self) -> Dict[str, Any]:
+        """
+        Executa todas as partes em paralelo e monta a resposta do endpoint.
+        """
+        started = time.perf_counter()
+
+        hosts, cpu, memory, availability, avg_uptime, hosts_in_alert = await asyncio.gather(
+            self.hosts(),
+            self.cpu(),
+            self.memory(),
+            self.availability(),
+            self.avg_uptime(),
+            self.hosts_in_alert()
+        )
+
+        timings = dict(self.timings)
+        timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+
+        return {
+            "hosts": hosts,
+            "metrics": {
+                "cpu": cpu,
+                "memory": memory,
+                "availability": availability
+            },
+            "avg_uptime": avg_uptime,
+            "hosts_in_alert": hosts_in_alert,
+            "timings": timings
+        }
+
+async def build_overview() -> Dict[str, Any]:
+    """
+    Monta a visão geral usando a conexão compartilhada com o Zabbix.
+    """
+    return await OverviewBuilder(ZabbixService(zabbix_connection)).build()
+
+# Snapshot da visão geral mantido em segundo plano
+overview_snapshot = SnapshotEngine("overview", build_overview, interval=OVERVIEW_SNAPSHOT_INTERVAL)
@@ -0,0 +1,144 @@
+from typing import Dict, List, Any, Iterable, Optional
+
+# Tipos de valor numéricos do Zabbix (0 = float, 3 = inteiro sem sinal)
+NUMERIC_VALUE_TYPES = (0, 3)
+
+class SeriesAssembler:
+    """
+    Monta séries temporais a partir das linhas de history.get.
+
+    As linhas são distribuídas por item em uma única passagem (busca em
+    dicionário por itemid) e agrupadas por host na saída, com vários itens
+    por host. Cada série é representada por vetores paralelos de timestamps
+    (segundos epoch) e valores.
+    """
+
+    def __init__(self, items: Iterable[dict]):
+        """
+        Inicializa o montador a partir dos itens retornados por item.get.
+        """
+        self._items: Dict[str, dict] = {}
+        self._clocks: Dict[str, List[int]] = {}
+        self._values: Dict[str, List[Any]] = {}
+        self._numeric: Dict[str, bool] = {}
+
+        for item in items:
+            item_id = item["itemid"]
+            self._items[item_id] = item
+            self._clocks[item_id] = []
+            self._values[item_id] = []
+            self._numeric[item_id] = int(item.get("value_type", 0)) in NUMERIC_VALUE_TYPES
+
+    def item_ids_by_value_type(self) -> Dict[int, List[str]]:
+        """
+        Agrupa os IDs dos itens pelo tipo de histórico a consultar.
+        """
+        groups: Dict[int, List[str]] = {}
+        for item_id, item in self._items.items():
+            groups.setdefault(int(item.get("value_type", 0)), []).append(item_id)
+        return groups
+
+    def add(self, history: Iterable[dict]) -> None:
+        """
+        Distribui linhas de histórico entre as séries dos itens.
+        """
+        clocks_by_item = self._clocks
+        values_by_item = self._values
+        numeric = self._numeric
+
+        for entry in history:
+            item_id = entry["itemid"]
+            clocks = clocks_by_item.get(item_id)
+            if clocks is None:
+                continue
+
+            clocks.append(int(entry["clock"]))
+            value = entry["value"]
+            values_by_item[item_id].append(float(value) if numeric[item_id] else value)
+
+    def item_series(self, item_id: str) -> dict:
+        """
+        Retorna a série de um item com seus metadados.
+        """
+        item = self._items[item_id]
+        return {
+            "item_id": item_id,
+            "name": item.get("name", ""),
+            "key": item.get("key_", ""),
+            "units": item.get("units", ""),
+            "timestamps": self._clocks[item_id],
+            "values": self._values[item_id]
+        }
+
+    def series(self, item_ids: Optional[Iterable[str]] = None) -> List[dict]:
+        """
+        Retorna as séries não vazias dos itens informados (ou de todos).
+        """
+        if item_ids is None:
+            item_ids = self._items.keys()
+        return [self.item_series(item_id) for item_id in item_ids if self._clocks.get(item_id)]
+
+    def by_host(self) -> List[dict]:
+        """
+        Retorna as séries agrupadas por host, na ordem dos itens.
+        """
+        hosts: Dict[str, List[dict]] = {}
+        for item_id, item in self._items.items():
+            if self._clocks[item_id]:
+                hosts.setdefault(item["hostid"], []).append(self.item_series(item_id))
+
+        return [{"host_id": host_id, "items": series} for host_id, series in hosts.items()]
+
+# Agregações aceitas por bucket_series
+BUCKET_AGGREGATIONS = ("avg", "min", "max", "all")
+
+def bucket_width(clock_from: int, clock_till: int, max_points: int) -> int:
+    """
+    Largura em segundos dos intervalos para caber em `max_points` pontos.
+    """
+    span = max(clock_till - clock_from + 1, 1)
+    return max(-(-span // max_points), 1)
+
+def bucket_series(series: dict, clock_from: int, width: int, agg: str = "all") -> dict:
+    """
+    Agrega uma série numérica em intervalos de `width` segundos.
+
+    Em uma única passagem calcula mínimo, média e máximo de cada intervalo não
+    vazio. O timestamp de cada ponto é o início do intervalo. Com agg='all' a
+    série traz os vetores 'min', 'avg' e 'max'; caso contrário, apenas 'values'.
+    """
+    timestamps: List[int] = []
+    mins: List[float] = []
+    maxs: List[float] = []
+    sums: List[float] = []
+    counts: List[int] = []
+
+    current = None
+    for clock, value in zip(series["timestamps"], series["values"]):
+        bucket = (clock - clock_from) // width
+        if bucket != current:
+            current = bucket
+            timestamps.append(clock_from + bucket * width)
+            mins.append(value)
+            maxs.append(value)
+            sums.append(value)
+            counts.append(1)
+        else:
+            if value < mins[-1]:
+                mins[-1] = value
+            if value > maxs[-1]:
+                maxs[-1] = value
+            sums[-1] += value
+            counts[-1] += 1
+
+    avgs = [total / count for total, count in zip(sums, counts)]
+
+    result = {key: value for key, value in series.items() if key not in ("timestamps", "values")}
+    result["timestamps"] = timestamps
+    if agg == "all":
+        result["min"] = mins
+        result["avg"] = avgs
+        result["max"] = maxs
+    else:
+        result["values"] = {"min": mins, "avg": avgs, "max": maxs}[agg]
+    return result
@@ -1,111 +1,43 @@
 import json
+import time
 import aiohttp
 import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from fastapi import Depends
-from sqlmodel import Session, select
 import os
 
-from app.services.database import get_db
-from app.domain.models import Settings, Host, Metric, Alert
+from app.services.zabbix_connection import ZabbixConnection, get_zabbix_connection
+from app.services.series import SeriesAssembler, NUMERIC_VALUE_TYPES, bucket_width, bucket_series
+from app.services.metric_store import metric_store, metric_writer, METRIC_INGEST_LAG, Range
+from app.services.host_cache import host_cache
+from app.services.availability import problem_intervals, downtime_seconds, group_events_by_trigger
+
+# Quantidade máxima de triggers por chamada event.get
+EVENT_CHUNK_SIZE = 1000
 
 class ZabbixService:
-    def __init__(self, session: Session = Depends(get_db)):
-        self.session = session
-        self._api_url = None
-        self._auth_token = None
-        self._credentials = None
-        self._session = None
+    def __init__(self, connection: ZabbixConnection = Depends(get_zabbix_connection)):
+        self.connection = connection
     
     async def _get_credentials(self) -> dict:
         """
         Recupera as credenciais do Zabbix armazenadas no banco de dados.
         """
-        if self._credentials is not None:
-            return self._credentials
-        
-        settings = self.session.exec(
-            select(Settings).where(Settings.key == "zabbix")
-        ).first()
-        
-        if not settings:
-            raise ValueError("Credenciais do Zabbix não encontradas")
-        
-        self._credentials = json.loads(settings.value)
-        self._api_url = f"{self._credentials['url']}/api_jsonrpc.php"
-        
-        return self._credentials
+        credentials, _ = await self.connection.get_credentials()
+        return credentials
     
     async def _get_auth_token(self) -> str:
         """
         Obtém um token de autenticação para o Zabbix API.
         """
-        if self._auth_token is not None:
-            return self._auth_token
-        
-        credentials = await self._get_credentials()
-        
-        # Se um token de API já foi fornecido nas configurações, usar isso
-        if credentials.get("api_token"):
-            self._auth_token = credentials["api_token"]
-            return self._auth_token
-        
-        # Caso contrário, fazer login para obter um token
-        if self._session is None:
-            self._session = aiohttp.ClientSession()
-        
-        payload = {
-            "jsonrpc": "2.0",
-            "method": "user.login",
-            "params": {
-                "user": credentials["username"],
-                "password": credentials["password"]
-            },
-            "id": 1
-        }
-        
-        try:
-            async with self._session.post(self._api_url, json=payload) as response:
-                result = await response.json()
-                if "error" in result:
-                    raise ValueError(f"Erro ao autenticar com Zabbix API: {result['error']['message']}")
-                
-                self._auth_token = result["result"]
-                return self._auth_token
-        
-        except Exception as e:
-            raise ValueError(f"Falha na comunicação com Zabbix API: {str(e)}")
+        return await self.connection.get_auth_token()
     
     async def _api_call(self, method: str, params: dict = None) -> dict:
         """
         Faz uma chamada para a API Zabbix.
         """
-        if self._session is None:
-            self._session = aiohttp.ClientSession()
-        
-        auth_token = await self._get_auth_token()
-        
-        payload = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": params or {},
-            "auth": auth_token,
-            "id": 1
-        }
-        
-        try:
-            async with self._session.post(self._api_url, json=payload) as response:
-                result = await response.json()
-                if "error" in result:
-                    raise ValueError(f"Erro na API Zabbix: {result['error']['message']}")
-                
-                return result["result"]
-        
-        except Exception as e:
-            if isinstance(e, ValueError) and "Erro na API Zabbix" in str(e):
-                raise e
-            raise ValueError(f"Falha na comunicação com Zabbix API: {str(e)}")
+        return await self.connection.call(method, params)
     
     async def test_connection(self) -> bool:
         """
@@ -131,36 +63,8 @@ class ZabbixService:
         
         hosts = await self._api_call("host.get", params)
         
-        # Salvar hosts no banco de dados local para cache
-        for host_data in hosts:
-            host = Host(
-                host_id=host_data["hostid"],
-                name=host_data["name"],
-                status=int(host_data["status"]),
-                description=host_data.get("description", ""),
-                ip=host_data["interfaces"][0]["ip"] if host_data.get("interfaces") else None,
-                dns=host_data["interfaces"][0]["dns"] if host_data.get("interfaces") else None,
-                metadata=host_data
-            )
-            
-            existing = self.session.exec(
-                select(Host).where(Host.host_id == host_data["hostid"])
-            ).first()
-            
-            if existing:
-                # Atualizar host existente
-                existing.name = host.name
-                existing.status = host.status
-                existing.description = host.description
-                existing.ip = host.ip
-                existing.dns = host.dns
-                existing.metadata = host.metadata
-                existing.updated_at = datetime.utcnow()
-            else:
-                # Adicionar novo host
-                self.session.add(host)
-        
-        self.session.commit()
+        # Atualizar o cache local em segundo plano (apenas hosts alterados)
+        host_cache.schedule(hosts)
         
         return hosts
     
@@ -193,63 +97,119 @@ class ZabbixService:
         
         return hosts[0]
     
-    async def get_cpu_metrics(self, hours: int = 24) -> List[dict]:
-        """
-        Obtém métricas de CPU para todos os hosts.
+    async def _load_series(self, items: List[dict], time_from: int, time_till: Optional[int] = None) -> SeriesAssembler:
         """
-        # Obter itens de CPU (normalmente 'system.cpu.util')
-        items = await self._api_call("item.get", {
-            "output": ["itemid", "hostid", "name", "key_"],
-            "search": {
-                "key_": "system.cpu.util"
-            },
-            "searchWildcardsEnabled": True
-        })
+        Busca o histórico dos itens e monta as séries em uma única passagem.
         
-        if not items:
-            return []
-        
-        # Obter valores históricos para esses itens
-        item_ids = [item["itemid"] for item in items]
-        time_from = int((datetime.now() - timedelta(hours=hours)).timestamp())
+        Uma chamada history.get é feita por tipo de valor, em paralelo.
+        """
+        assembler = SeriesAssembler(items)
+        
+        requests = []
+        for value_type, item_ids in assembler.item_ids_by_value_type().items():
+            params = {
+                "output": ["itemid", "clock", "value"],
+                "itemids": item_ids,
+                "history": value_type,
+                "time_from": time_from,
+                "sortfield": "clock",
+                "sortorder": "ASC"
+            }
+            if time_till is not None:
+                params["time_till"] = time_till
+            requests.append(self._api_call("history.get", params))
         
-        history = await self._api_call("history.get", {
-            "output": "extend",
-            "itemids": item_ids,
-            "time_from": time_from,
-            "sortfield": "clock",
-            "sortorder": "ASC"
-        })
+        for history in await asyncio.gather(*requests):
+            assembler.add(history)
         
-        # Agrupar dados por host
-        host_to_item = {item["hostid"]: item["itemid"] for item in items}
-        result = {}
+        return assembler
+    
+    async def _load_series_from_store(self, items: List[dict], time_from: int, time_till: int) -> SeriesAssembler:
+        """
+        Monta as séries lendo primeiro o armazenamento local de métricas.
         
-        for entry in history:
-            host_id = next((hid for hid, iid in host_to_item.items() if iid == entry["itemid"]), None)
-            if not host_id:
-                continue
-            
-            if host_id not in result:
-                result[host_id] = []
-            
-            result[host_id].append({
-                "timestamp": datetime.fromtimestamp(int(entry["clock"])).isoformat(),
-                "value": float(entry["value"])
+        O Zabbix é consultado apenas nos trechos ainda não copiados de cada item
+        numérico (e para itens não numéricos); as amostras obtidas são enfileiradas
+        para gravação no armazenamento local.
+        """
+        assembler = SeriesAssembler(items)
+        numeric_ids = [item["itemid"] for item in items if int(item.get("value_type", 0)) in NUMERIC_VALUE_TYPES]
+        
+        gaps = await asyncio.to_thread(metric_store.gaps, numeric_ids, time_from, time_till)
+        stored = await asyncio.to_thread(metric_store.read, numeric_ids, time_from, time_till)
+        
+        # Trechos a buscar no Zabbix por item: cada lacuna separadamente, para que
+        # lacunas pequenas nas pontas não tragam de novo todo o período já copiado
+        # (itens não numéricos não são armazenados e são buscados no período todo)
+        ranges: Dict[str, List[Range]] = {}
+        for item in items:
+            item_id = item["itemid"]
+            item_ranges = gaps.get(item_id, [(time_from, time_till)])
+            if item_ranges:
+                ranges[item_id] = item_ranges
+        
+        # Uma chamada history.get por tipo de valor e trecho, com os itens que o compartilham
+        groups: Dict[Tuple[int, int, int], List[str]] = {}
+        for value_type, item_ids in assembler.item_ids_by_value_type().items():
+            for item_id in item_ids:
+                for start, end in ranges.get(item_id, []):
+                    groups.setdefault((value_type, start, end), []).append(item_id)
+        
+        requests = [
+            self._api_call("history.get", {
+                "output": ["itemid", "clock", "ns", "value"],
+                "itemids": fetch_ids,
+                "history": value_type,
+                "time_from": start,
+                "time_till": end,
+                "sortfield": "clock",
+                "sortorder": "ASC"
             })
-        
-        # Transformar em lista para retorno
-        return [{"host_id": host_id, "data": data} for host_id, data in result.items()]
+            for (value_type, start, end), fetch_ids in groups.items()
+        ]
+        
+        fetched = [entry for history in await asyncio.gather(*requests) for entry in history]
+        
+        # Amostras locais fora dos trechos buscados, intercaladas por clock com as do Zabbix
+        rows = [
+            row for row in stored
+            if not any(start <= row["clock"] <= end for start, end in ranges.get(row["itemid"], []))
+        ]
+        rows.extend(fetched)
+        rows.sort(key=lambda row: int(row["clock"]))
+        assembler.add(rows)
+        
+        # Gravar em segundo plano o que foi obtido do Zabbix
+        item_hosts = {item["itemid"]: item.get("hostid", "") for item in items}
+        numeric = set(numeric_ids)
+        samples = [
+            {
+                "item_id": entry["itemid"],
+                "clock": int(entry["clock"]),
+                "ns": int(entry.get("ns", 0)),
+                "host_id": item_hosts[entry["itemid"]],
+                "value": float(entry["value"])
+            }
+            for entry in fetched if entry["itemid"] in numeric
+        ]
+        settled = int(time.time()) - METRIC_INGEST_LAG
+        coverage = [
+            (item_id, start, min(end, settled))
+            for item_id, item_ranges in ranges.items() if item_id in numeric
+            for start, end in item_ranges if min(end, settled) >= start
+        ]
+        metric_writer.submit(samples, coverage)
+        
+        return assembler
     
-    async def get_memory_metrics(self, hours: int = 24) -> List[dict]:
+    async def _get_metric_series(self, key: str, hours: int) -> List[dict]:
         """
-        Obtém métricas de memória para todos os hosts.
+        Obtém as séries dos itens cuja chave contém `key`, agrupadas por host.
         """
-        # Obter itens de memória (normalmente 'vm.memory.util')
         items = await self._api_call("item.get", {
-            "output": ["itemid", "hostid", "name", "key_"],
+            "output": ["itemid", "hostid", "name", "key_", "value_type", "units"],
             "search": {
-                "key_": "vm.memory"
+                "key_": key
             },
             "searchWildcardsEnabled": True
         })
@@ -257,42 +217,42 @@ class ZabbixService:
         if not items:
             return []
         
-        # Obter valores históricos para esses itens
-        item_ids = [item["itemid"] for item in items]
         time_from = int((datetime.now() - timedelta(hours=hours)).timestamp())
+        series = await self._load_series(items, time_from)
         
-        history = await self._api_call("history.get", {
-            "output": "extend",
-            "itemids": item_ids,
-            "time_from": time_from,
-            "sortfield": "clock",
-            "sortorder": "ASC"
-        })
-        
-        # Agrupar dados por host
-        host_to_item = {item["hostid"]: item["itemid"] for item in items}
-        result = {}
+        return series.by_host()
+    
+    async def get_cpu_metrics(self, hours: int = 24) -> List[dict]:
+        """
+        Obtém métricas de CPU para todos os hosts.
         
-        for entry in history:
-            host_id = next((hid for hid, iid in host_to_item.items() if iid == entry["itemid"]), None)
-            if not host_id:
-                continue
-            
-            if host_id not in result:
-                result[host_id] = []
-            
-            result[host_id].append({
-                "timestamp": datetime.fromtimestamp(int(entry["clock"])).isoformat(),
-                "value": float(entry["value"])
-            })
+        Retorna, por host, as séries de cada item ('items') com vetores
+        paralelos de timestamps (segundos epoch) e valores.
+        """
+        # Itens de CPU (normalmente 'system.cpu.util')
+        return await self._get_metric_series("system.cpu.util", hours)
+    
+    async def get_memory_metrics(self, hours: int = 24) -> List[dict]:
+        """
+        Obtém métricas de memória para todos os hosts.
         
-        # Transformar em lista para retorno
-        return [{"host_id": host_id, "data": data} for host_id, data in result.items()]
+        Retorna, por host, as séries de cada item ('items') com vetores
+        paralelos de timestamps (segundos epoch) e valores.
+        """
+        # Itens de memória (normalmente 'vm.memory.util')
+        return await self._get_metric_series("vm.memory", hours)
     
     async def get_availability_metrics(self, hours: int = 24) -> List[dict]:
         """
         Obtém métricas de disponibilidade para todos os hosts.
+        
+        Os eventos de todos os triggers são buscados de uma vez (em blocos de
+        EVENT_CHUNK_SIZE triggers) e os intervalos de problema de cada host são
+        unidos, para que triggers simultâneos não contem o mesmo tempo duas vezes.
         """
+        window_end = int(datetime.now().timestamp())
+        window_start = window_end - hours * 3600
+        
         # Obter triggers relacionadas a disponibilidade
         triggers = await self._api_call("trigger.get", {
             "output": ["triggerid", "description", "value"],
@@ -300,10 +260,11 @@ class ZabbixService:
                 "value": 1  # 1 = problema, 0 = ok
             },
             "selectHosts": ["hostid"],
-            "lastChangeSince": int((datetime.now() - timedelta(hours=hours)).timestamp())
+            "lastChangeSince": window_start
         })
         
-        # Calcular disponibilidade por host
+        trigger_host = {}
+        trigger_names = {}
         host_availability = {}
         
         for trigger in triggers:
@@ -311,72 +272,77 @@ class ZabbixService:
                 continue
             
             host_id = trigger["hosts"][0]["hostid"]
+            trigger_host[trigger["triggerid"]] = host_id
+            trigger_names[trigger["triggerid"]] = trigger["description"]
             
             if host_id not in host_availability:
                 host_availability[host_id] = {
                     "total_downtime_seconds": 0,
                     "events": []
                 }
-            
-            # Obter eventos relacionados a este trigger
-            events = await self._api_call("event.get", {
-                "output": "extend",
-                "objectids": trigger["triggerid"],
-                "time_from": int((datetime.now() - timedelta(hours=hours)).timestamp()),
-                "sortfield": "clock",
+        
+        # Obter eventos de todos os triggers em blocos paralelos
+        trigger_ids = list(trigger_host.keys())
+        requests = [
+            self._api_call("event.get", {
+                "output": ["eventid", "objectid", "clock", "value"],
+                "source": 0,  # eventos de trigger
+                "object": 0,
+                "objectids": trigger_ids[i:i + EVENT_CHUNK_SIZE],
+                "time_from": window_start,
+                "sortfield": ["clock", "eventid"],
                 "sortorder": "ASC"
             })
+            for i in range(0, len(trigger_ids), EVENT_CHUNK_SIZE)
+        ]
+        
+        events_by_trigger = {}
+        for events in await asyncio.gather(*requests):
+            for trigger_id, trigger_events in group_events_by_trigger(events).items():
+                events_by_trigger.setdefault(trigger_id, []).extend(trigger_events)
+        
+        # Intervalos de problema por host
+        host_intervals = {host_id: [] for host_id in host_availability}
+        
+        for trigger_id, events in events_by_trigger.items():
+            host_id = trigger_host.get(trigger_id)
+            if host_id is None:
+                continue
+            
+            host_intervals[host_id].extend(problem_intervals(events, window_start, window_end))
             
             for event in events:
                 host_availability[host_id]["events"].append({
                     "timestamp": datetime.fromtimestamp(int(event["clock"])).isoformat(),
                     "value": int(event["value"]),  # 0 = OK, 1 = PROBLEM
-                    "name": trigger["description"],
+                    "name": trigger_names[trigger_id],
                     "event_id": event["eventid"]
                 })
         
         # Calcular disponibilidade (porcentagem)
+        total_period = hours * 3600
+        
         for host_id, data in host_availability.items():
-            if data["events"]:
-                # Calcular tempo total de indisponibilidade
-                events = sorted(data["events"], key=lambda e: e["timestamp"])
-                
-                # Analisar eventos em pares (problema -> resolução)
-                problem_time = None
-                total_downtime = 0
-                
-                for event in events:
-                    if event["value"] == 1 and problem_time is None:  # PROBLEM
-                        problem_time = datetime.fromisoformat(event["timestamp"])
-                    elif event["value"] == 0 and problem_time is not None:  # OK
-                        resolved_time = datetime.fromisoformat(event["timestamp"])
-                        downtime = (resolved_time - problem_time).total_seconds()
-                        total_downtime += downtime
-                        problem_time = None
-                
-                # Se houver um problema sem resolução, contar até agora
-                if problem_time is not None:
-                    downtime = (datetime.now() - problem_time).total_seconds()
-                    total_downtime += downtime
-                
-                # Calcular disponibilidade
-                total_period = hours * 3600
-                availability_percent = 100 - (total_downtime / total_period * 100)
-                
-                data["availability_percent"] = round(availability_percent, 2)
-                data["total_downtime_seconds"] = total_downtime
-            else:
-                data["availability_percent"] = 100.0
-                data["total_downtime_seconds"] = 0
+            data["events"].sort(key=lambda e: e["timestamp"])
+            
+            total_downtime = downtime_seconds(host_intervals[host_id])
+            availability_percent = 100 - (total_downtime / total_period * 100)
+            
+            data["availability_percent"] = round(availability_percent, 2)
+            data["total_downtime_seconds"] = total_downtime
         
         # Transformar em lista para retorno
         return [{"host_id": host_id, "data": data} for host_id, data in host_availability.items()]
     
-    async def get_average_uptime(self) -> float:
+    async def get_average_uptime(self, availability: Optional[List[dict]] = None) -> float:
         """
         Calcula o uptime médio de todos os hosts.
+        
+        Aceita o resultado de get_availability_metrics já obtido, para evitar
+        buscá-lo novamente.
         """
-        availability = await self.get_availability_metrics(hours=24)
+        if availability is None:
+            availability = await self.get_availability_metrics(hours=24)
         
         if not availability:
             return 100.0  # Se não houver dados, considerar 100%
@@ -425,13 +391,23 @@ class ZabbixService:
         # Transformar em lista para retorno
         return list(hosts_with_alerts.values())
     
-    async def get_host_metrics(self, host_id: str, from_date: datetime, to_date: datetime) -> dict:
+    async def get_host_metrics(
+        self,
+        host_id: str,
+        from_date: datetime,
+        to_date: datetime,
+        max_points: Optional[int] = None,
+        agg: str = "all"
+    ) -> dict:
         """
         Obtém métricas detalhadas para um host específico em um período.
+        
+        Com `max_points`, as séries numéricas são agregadas em intervalos de tempo
+        (mínimo/média/máximo, conforme `agg`) para no máximo esse número de pontos.
         """
         # Obter itens para o host
         items = await self._api_call("item.get", {
-            "output": ["itemid", "name", "key_", "value_type", "units"],
+            "output": ["itemid", "hostid", "name", "key_", "value_type", "units"],
             "hostids": host_id,
             "sortfield": "name"
         })
@@ -445,64 +421,37 @@ class ZabbixService:
         disk_items = [item for item in items if "disk" in item["key_"].lower() or "vfs.fs" in item["key_"].lower()]
         network_items = [item for item in items if "net" in item["key_"].lower() or "network" in item["key_"].lower()]
         
-        # Obter histórico para cada categoria
+        # Obter o histórico de todos os itens categorizados de uma vez
         time_from = int(from_date.timestamp())
         time_till = int(to_date.timestamp())
         
-        async def get_history_for_items(items_list):
-            if not items_list:
-                return []
-            
-            item_ids = [item["itemid"] for item in items_list]
-            value_types = {item["itemid"]: item["value_type"] for item in items_list}
-            units = {item["itemid"]: item["units"] for item in items_list}
-            names = {item["itemid"]: item["name"] for item in items_list}
-            
-            results = []
-            
-            # Agrupar por tipo de valor para consultar o histórico correto
-            for value_type in set(value_types.values()):
-                type_item_ids = [itemid for itemid, vtype in value_types.items() if vtype == value_type]
-                
-                if not type_item_ids:
-                    continue
-                
-                history = await self._api_call("history.get", {
-                    "output": "extend",
-                    "itemids": type_item_ids,
-                    "time_from": time_from,
-                    "time_till": time_till,
-                    "sortfield": "clock",
-                    "sortorder": "ASC",
-                    "history": value_type
-                })
-                
-                # Agrupar por item
-                for entry in history:
-                    item_id = entry["itemid"]
-                    
-                    results.append({
-                        "name": names[item_id],
-                        "timestamp": datetime.fromtimestamp(int(entry["clock"])).isoformat(),
-                        "value": float(entry["value"]) if value_types[item_id] in [0, 3] else entry["value"],
-                        "units": units[item_id]
-                    })
-            
-            return results
+        categories = {
+            "cpu": cpu_items,
+            "memory": memory_items,
+            "disk": disk_items,
+            "network": network_items
+        }
+        
+        categorized = {item["itemid"]: item for group in categories.values() for item in group}
+        if not categorized:
+            return {name: [] for name in categories}
+        
+        series = await self._load_series_from_store(list(categorized.values()), time_from, time_till)
+        
+        numeric = {
+            item_id for item_id, item in categorized.items()
+            if int(item.get("value_type", 0)) in NUMERIC_VALUE_TYPES
+        }
+        width = bucket_width(time_from, time_till, max_points) if max_points else None
         
-        # Executar consultas em paralelo
-        cpu_history, memory_history, disk_history, network_history = await asyncio.gather(
-            get_history_for_items(cpu_items),
-            get_history_for_items(memory_items),
-            get_history_for_items(disk_items),
-            get_history_for_items(network_items)
-        )
+        def resolve(item_series: dict) -> dict:
+            if width is None or item_series["item_id"] not in numeric:
+                return item_series
+            return bucket_series(item_series, time_from, width, agg)
         
         return {
-            "cpu": cpu_history,
-            "memory": memory_history,
-            "disk": disk_history,
-            "network": network_history
+            name: [resolve(item_series) for item_series in series.series(item["itemid"] for item in group)]
+            for name, group in categories.items()
         }
     
     async def get_hosts_with_high_cpu(self, threshold: int = 80, period_minutes: int = 30) -> List[dict]:
@@ -511,7 +460,7 @@ class ZabbixService:
         """
         # Obter itens de CPU
         items = await self._api_call("item.get", {
-            "output": ["itemid", "hostid", "name", "key_"],
+            "output": ["itemid", "hostid", "name", "key_", "value_type"],
             "search": {
                 "key_": "system.cpu.util"
             },
@@ -522,49 +471,34 @@ class ZabbixService:
             return []
         
         # Obter valores históricos recentes para esses itens
-        item_ids = [item["itemid"] for item in items]
         time_from = int((datetime.now() - timedelta(minutes=period_minutes)).timestamp())
-        
-        history = await self._api_call("history.get", {
-            "output": "extend",
-            "itemids": item_ids,
-            "time_from": time_from,
-            "sortfield": "clock",
-            "sortorder": "ASC"
-        })
+        series = await self._load_series(items, time_from)
         
         # Calcular média de CPU por host
         host_cpu_avg = {}
-        item_to_host = {item["itemid"]: item["hostid"] for item in items}
         
-        for entry in history:
-            item_id = entry["itemid"]
-            host_id = item_to_host.get(item_id)
+        for host in series.by_host():
+            total = 0.0
+            count = 0
             
-            if not host_id:
-                continue
+            for item_series in host["items"]:
+                values = item_series["values"]
+                # Para cálculo correto, verificar se é CPU idle ou utilização direta
+                if "idle" in item_series["key"]:
+                    total += 100 * len(values) - sum(values)  # Converter idle para utilização
+                else:
+                    total += sum(values)
+                count += len(values)
             
-            if host_id not in host_cpu_avg:
-                host_cpu_avg[host_id] = {"values": [], "avg": 0}
-            
-            # Para cálculo correto, verificar se é CPU idle ou utilização direta
-            value = float(entry["value"])
-            if "idle" in next((item["key_"] for item in items if item["itemid"] == item_id), ""):
-                value = 100 - value  # Converter idle para utilização
-            
-            host_cpu_avg[host_id]["values"].append(value)
-        
-        # Calcular médias
-        for host_id, data in host_cpu_avg.items():
-            if data["values"]:
-                data["avg"] = sum(data["values"]) / len(data["values"])
+            if count:
+                host_cpu_avg[host["host_id"]] = total / count
         
         # Filtrar hosts acima do threshold
         high_cpu_hosts = {}
         
-        for host_id, data in host_cpu_avg.items():
-            if data["avg"] >= threshold:
-                high_cpu_hosts[host_id] = data["avg"]
+        for host_id, avg in host_cpu_avg.items():
+            if avg >= threshold:
+                high_cpu_hosts[host_id] = avg
         
         if not high_cpu_hosts:
             return []
@@ -586,11 +520,9 @@ class ZabbixService:
     
     async def close(self):
         """
-        Fecha a sessão HTTP quando o serviço não for mais necessário.
+        Mantido por compatibilidade: a sessão HTTP é compartilhada e fechada no lifespan.
         """
-        if self._session:
-            await self._session.close()
-            self._session = None
+        return None
 
 async def test_zabbix_connection(url: str, username: str, password: str, api_token: Optional[str] = None) -> Dict[str, Any]:
     """
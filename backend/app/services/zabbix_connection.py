@@ -0,0 +1,188 @@
+import os
+import json
+import asyncio
+import logging
+from typing import Optional, Tuple
+
+import aiohttp
+from sqlmodel import Session, select
+
+from app.services.database import engine
+from app.domain.models import Settings
+
+logger = logging.getLogger(__name__)
+
+# Conexões HTTP simultâneas com a API do Zabbix
+ZABBIX_POOL_SIZE = int(os.getenv("ZABBIX_POOL_SIZE", "20"))
+
+class ZabbixConnection:
+    """
+    Conexão com a API do Zabbix compartilhada pela aplicação.
+
+    Mantém o pool de conexões HTTP, as credenciais decodificadas e o token
+    de autenticação durante toda a vida do processo. As credenciais são lidas
+    do banco e o login é feito uma única vez; `invalidate()` descarta ambos
+    quando as configurações mudam.
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        # (credenciais, URL da API), substituídos juntos para nunca ficarem inconsistentes
+        self._credentials: Optional[Tuple[dict, str]] = None
+        self._auth_token: Optional[str] = None
+        self._lock = asyncio.Lock()
+
+    async def startup(self) -> None:
+        """
+        Cria o pool de conexões HTTP (chamado no início do lifespan).
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=ZABBIX_POOL_SIZE)
+            )
+
+    async def shutdown(self) -> None:
+        """
+        Fecha o pool de conexões HTTP (chamado no fim do lifespan).
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Descarta credenciais e token; a próxima chamada os carrega novamente.
+        """
+        self._credentials = None
+        self._auth_token = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            # Uso fora do lifespan (ex: scripts e testes)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=ZABBIX_POOL_SIZE)
+            )
+        return self._session
+
+    @property
+    def api_url(self) -> Optional[str]:
+        loaded = self._credentials
+        return loaded[1] if loaded is not None else None
+
+    def _load_credentials(self) -> dict:
+        with Session(engine) as session:
+            settings = session.exec(
+                select(Settings).where(Settings.key == "zabbix")
+            ).first()
+
+        if not settings:
+            raise ValueError("Credenciais do Zabbix não encontradas")
+
+        return json.loads(settings.value)
+
+    async def get_credentials(self) -> Tuple[dict, str]:
+        """
+        Recupera as credenciais do Zabbix e a URL da API (lidas do banco apenas uma vez).
+
+        Os dois são retornados juntos: quem chama continua usando o par
+        obtido mesmo que invalidate() seja chamado durante a requisição.
+        """
+        loaded = self._credentials
+        if loaded is not None:
+            return loaded
+
+        async with self._lock:
+            if self._credentials is None:
+                credentials = await asyncio.to_thread(self._load_credentials)
+                self._credentials = (credentials, f"{credentials['url']}/api_jsonrpc.php")
+            loaded = self._credentials
+
+        return loaded
+
+    async def get_auth_token(self) -> str:
+        """
+        Obtém o token de autenticação, fazendo login apenas quando necessário.
+        """
+        if self._auth_token is not None:
+            return self._auth_token
+
+        credentials, api_url = await self.get_credentials()
+
+        # Se um token de API já foi fornecido nas configurações, usar isso
+        if credentials.get("api_token"):
+            self._auth_token = credentials["api_token"]
+            return self._auth_token
+
+        # Chamadas concorrentes aguardam um único login
+        async with self._lock:
+            if self._auth_token is not None:
+                return self._auth_token
+
+            payload = {
+                "jsonrpc": "2.0",
+                "method": "user.login",
+                "params": {
+                    "user": credentials["username"],
+                    "password": credentials["password"]
+                },
+                "id": 1
+            }
+
+            try:
+                async with self.session.post(api_url, json=payload) as response:
+                    result = await response.json()
+                    if "error" in result:
+                        raise ValueError(f"Erro ao autenticar com Zabbix API: {result['error']['message']}")
+
+                    self._auth_token = result["result"]
+                    return self._auth_token
+
+            except Exception as e:
+                raise ValueError(f"Falha na comunicação com Zabbix API: {str(e)}")
+
+    async def call(self, method: str, params: dict = None, retry: bool = True) -> dict:
+        """
+        Faz uma chamada para a API Zabbix.
+
+        Se a sessão obtida por login expirar, o login é refeito uma vez.
+        """
+        # Cópia local: invalidate() pode limpar credenciais e URL durante a chamada
+        credentials, api_url = await self.get_credentials()
+        auth_token = await self.get_auth_token()
+
+        payload = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or {},
+            "auth": auth_token,
+            "id": 1
+        }
+
+        try:
+            async with self.session.post(api_url, json=payload) as response:
+                result = await response.json()
+        except Exception as e:
+            raise ValueError(f"Falha na comunicação com Zabbix API: {str(e)}")
+
+        if "error" in result:
+            error = result["error"]
+            expired = "re-login" in str(error.get("data", "")) or "re-login" in str(error.get("message", ""))
+            if retry and expired and not credentials.get("api_token"):
+                logger.info("Sessão do Zabbix expirada, refazendo login")
+                if self._auth_token == auth_token:
+                    self._auth_token = None
+                return await self.call(method, params, retry=False)
+            raise ValueError(f"Erro na API Zabbix: {error['message']}")
+
+        return result["result"]
+
+# Conexão global da aplicação (ciclo de vida controlado pelo lifespan do FastAPI)
+zabbix_connection = ZabbixConnection()
+
+def get_zabbix_connection() -> ZabbixConnection:
+    """
+    Dependency que fornece a conexão compartilhada com o Zabbix.
+    """
+    return zabbix_connection
@@ -0,0 +1,220 @@
+"""
+Gerador do corpus rotulado de consultas usado nos benchmarks do NLPProcessor.
+
+Cada linha do JSONL traz a consulta e os rótulos esperados: intenção, host,
+threshold, período (ex: 3h) e duração em minutos. A geração é determinística
+para uma mesma semente.
+
+Uso:
+    python -m zabbia.backend.benchmarks.corpus [--size N] [--seed S] [--output arquivo]
+"""
+import os
+import json
+import random
+import argparse
+from typing import Dict, List, Any, Optional
+
+from zabbia.backend.nlp_processor import QueryIntent
+
+DEFAULT_CORPUS_PATH = os.path.join(os.path.dirname(__file__), "data", "nlp_corpus.jsonl")
+DEFAULT_SIZE = 3000
+DEFAULT_SEED = 42
+
+HOSTS = [
+    "web01", "web02", "web-03", "db01", "db-master", "app-02", "app_backend",
+    "cache01", "lb01.example.com", "mail01", "srv-fin-01", "k8s-node-7",
+    "proxy02", "monitor01", "erp.prod", "vpn-gw", "storage01", "dc01"
+]
+
+# Formas de mencionar o host e de indicar período/duração
+HOST_CLAUSES = ["no host {host}", "do host {host}", "do servidor {host}", "na maquina {host}", "host: {host}"]
+PERIOD_UNITS = [("minutos", "m"), ("horas", "h"), ("dias", "d")]
+DURATION_UNITS = [("minutos", 1), ("horas", 60), ("dias", 1440)]
+
+# Modelos por intenção: {host}, {threshold} e {period} são opcionais
+TEMPLATES: Dict[str, List[str]] = {
+    QueryIntent.HIGH_CPU: [
+        "Quais hosts estão com CPU alta{period}{host}?",
+        "servidores com cpu acima de {threshold}%{period}{host}",
+        "Mostre hosts com processador elevado{period}{host}",
+        "hosts com CPU maior que {threshold}%{period}{host}",
+        "quais hosts estão com cpu acima{period}{host}",
+        "listar servidores com uso de cpu acima de {threshold}%{host}{period}",
+    ],
+    QueryIntent.MEMORY_USAGE: [
+        "Servidores com memória acima de {threshold}%{period}{host}",
+        "hosts com ram elevada{period}{host}",
+        "uso de memória{host}{period}",
+        "quais hosts estão com memória alta{period}{host}?",
+        "memória maior que {threshold}%{host}{period}",
+        "hosts com memoria acima de {threshold}%{period}{host}",
+    ],
+    QueryIntent.DISK_USAGE: [
+        "hosts com disco acima de {threshold}%{host}",
+        "uso de disco{host}{period}",
+        "servidores com armazenamento elevado{host}",
+        "Quais servidores estão com filesystem acima de {threshold}%{host}?",
+        "disco maior que {threshold}%{host}",
+    ],
+    QueryIntent.HOST_STATUS: [
+        "Qual o status dos hosts?",
+        "status do servidor {name}",
+        "Mostre o status dos servidores",
+        "quais hosts estão offline?",
+        "hosts e seus estados",
+        "qual o estado dos servidores{host}?",
+    ],
+    QueryIntent.HOST_UPTIME: [
+        "uptime{host}",
+        "Qual o uptime dos hosts?",
+        "uptime do servidor {name}",
+        "há quanto tempo os hosts estão online?",
+        "desde quando os servidores estão ativos?",
+        "servidores com maior uptime",
+    ],
+    QueryIntent.UNAVAILABLE_SERVICES: [
+        "Quais serviços estão indisponíveis?",
+        "serviços fora do ar{host}",
+        "aplicações offline{period}",
+        "quais aplicações estão down?",
+        "serviços indisponíveis{host}{period}",
+    ],
+    QueryIntent.ALERT_SUMMARY: [
+        "Resumo de alertas{period}",
+        "sumário de problemas{host}{period}",
+        "alertas críticos{period}",
+        "problemas graves{host}{period}",
+        "me dê um resumo dos alertas{period}",
+    ],
+    QueryIntent.GRAPH_REQUEST: [
+        "Gerar gráfico de cpu{host}{period}",
+        "gráfico de memória{host}{period}",
+        "mostrar gráfico de rede{host}{period}",
+        "criar chart de disco{host}{period}",
+        "visualizar gráfico de cpu{host}{period}",
+    ],
+    QueryIntent.HOST_MAINTENANCE: [
+        "Colocar host {name} em manutenção{duration}",
+        "colocar o servidor {name} em manutenção{duration}",
+        "por host {name} em manutenção{duration}",
+        "botar servidor {name} em manutenção{duration}",
+        "agendar manutenção do host {name}{duration}",
+    ],
+    QueryIntent.GENERAL_QUERY: [
+        "Quantos hosts existem no ambiente?",
+        "olá, tudo bem?",
+        "liste os grupos de hosts",
+        "quais templates estão em uso?",
+        "qual a versão do zabbix?",
+        "mostre os itens do host {name}",
+    ],
+}
+
+def _period(rng: random.Random) -> Dict[str, Any]:
+    value = rng.choice([5, 15, 30, 1, 2, 3, 6, 12, 24, 48, 7])
+    word, unit = rng.choice(PERIOD_UNITS)
+    return {"text": f" nas últimas {value} {word}", "label": f"{value}{unit}"}
+
+def _duration(rng: random.Random) -> Dict[str, Any]:
+    value = rng.choice([1, 2, 4, 8, 30, 45])
+    word, factor = rng.choice(DURATION_UNITS)
+    return {"text": f" por {value} {word}", "label": value * factor}
+
+def _variant(rng: random.Random, text: str) -> str:
+    """Aplica variações de caixa e pontuação sem alterar o significado"""
+    choice = rng.random()
+    if choice < 0.15:
+        text = text.upper()
+    elif choice < 0.4:
+        text = text[:1].upper() + text[1:]
+    elif choice < 0.6:
+        text = text.lower()
+    if rng.random() < 0.2 and not text.endswith("?"):
+        text += "?"
+    return text
+
+def generate_example(rng: random.Random, intent: str) -> Dict[str, Any]:
+    """Gera uma consulta rotulada para a intenção informada"""
+    template = rng.choice(TEMPLATES[intent])
+    name = rng.choice(HOSTS)
+
+    host: Optional[str] = None
+    host_text = ""
+    if "{name}" in template:
+        host = name
+    elif "{host}" in template and rng.random() < 0.5:
+        host = name
+        host_text = " " + rng.choice(HOST_CLAUSES).format(host=name)
+
+    period_label = "24h"
+    period_text = ""
+    if "{period}" in template and rng.random() < 0.5:
+        period = _period(rng)
+        period_label, period_text = period["label"], period["text"]
+
+    duration: Optional[int] = None
+    duration_text = ""
+    if "{duration}" in template and rng.random() < 0.7:
+        picked = _duration(rng)
+        duration, duration_text = picked["label"], picked["text"]
+
+    threshold: Optional[int] = None
+    if "{threshold}" in template:
+        threshold = rng.choice([50, 70, 75, 80, 85, 90, 95, 99])
+
+    query = template.format(
+        host=host_text,
+        name=name,
+        period=period_text,
+        duration=duration_text,
+        threshold=threshold
+    )
+
+    return {
+        "query": _variant(rng, query),
+        "intent": intent,
+        "host": host.lower() if host else None,
+        "threshold": threshold,
+        "period": period_label,
+        "duration_minutes": duration
+    }
+
+def generate_corpus(size: int = DEFAULT_SIZE, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """Gera o corpus com as intenções distribuídas igualmente
+
+    Args:
+        size: Quantidade de consultas
+        seed: Semente do gerador aleatório
+
+    Returns:
+        Lista de consultas rotuladas
+    """
+    rng = random.Random(seed)
+    intents = list(TEMPLATES)
+    return [generate_example(rng, intents[i % len(intents)]) for i in range(size)]
+
+def load_corpus(path: str = DEFAULT_CORPUS_PATH) -> List[Dict[str, Any]]:
+    """Carrega o corpus de um arquivo JSONL"""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def write_corpus(corpus: List[Dict[str, Any]], path: str = DEFAULT_CORPUS_PATH) -> None:
+    """Grava o corpus em um arquivo JSONL"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for example in corpus:
+            f.write(json.dumps(example, ensure_ascii=False) + "\n")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gera o corpus rotulado do NLPProcessor")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", default=DEFAULT_CORPUS_PATH)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.size, args.seed)
+    write_corpus(corpus, args.output)
+    print(f"{len(corpus)} consultas gravadas em {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark do tempo de importação (cold start) do backend.
+
+Importa cada alvo em um interpretador novo com `python -X importtime`,
+repete algumas vezes e usa a mediana. Mostra os pacotes mais caros e as
+bibliotecas pesadas (matplotlib, pandas, NumPy, driver MySQL, Redis)
+carregadas já na importação. Termina com código 1 quando um alvo passa do
+orçamento, carrega uma biblioteca pesada ou não pode ser importado.
+
+Alvos padrão: `main` (main.py da raiz, início do servidor) e
+`zabbia.backend.api` (inicialização de cada worker).
+
+Uso:
+    python -m zabbia.backend.benchmarks.import_time [--runs 5] [--top 10]
+        [--budget main=800] [--budget zabbia.backend.api=1500] [alvo ...]
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Any, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Orçamento de importação de cada alvo em milissegundos
+DEFAULT_BUDGETS_MS = {
+    "main": 1000,
+    "zabbia.backend.api": 1500,
+}
+
+# Bibliotecas que devem ser carregadas apenas no primeiro uso
+HEAVY_MODULES = ("matplotlib", "pandas", "numpy", "mysql.connector", "redis")
+
+PROBE = "import sys, json, {module}; print(json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)))"
+
+def parse_importtime(stderr: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Interpreta a saída de `-X importtime`
+
+    Args:
+        stderr: Saída de erro do interpretador
+
+    Returns:
+        Tupla (tempo acumulado por módulo, tempo próprio somado por pacote), em microssegundos
+    """
+    cumulative: Dict[str, int] = {}
+    by_package: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        cumulative[name] = int(cumulative_us)
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + int(self_us)
+    return cumulative, by_package
+
+def measure(module: str, runs: int) -> Dict[str, Any]:
+    """Importa o módulo `runs` vezes em processos novos
+
+    Returns:
+        Dicionário com import_ms (mediana), pacotes mais caros, bibliotecas
+        pesadas carregadas e erro (se a importação falhou)
+    """
+    totals: List[float] = []
+    packages: Dict[str, List[int]] = {}
+    heavy: List[str] = []
+
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True,
+            text=True,
+            cwd=REPO_ROOT
+        )
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "erro desconhecido"
+            return {"module": module, "error": error}
+
+        cumulative, by_package = parse_importtime(proc.stderr)
+        totals.append(cumulative.get(module, 0) / 1000)
+        for package, self_us in by_package.items():
+            packages.setdefault(package, []).append(self_us)
+        heavy = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    top = sorted(
+        ((package, statistics.median(values) / 1000) for package, values in packages.items()),
+        key=lambda item: item[1],
+        reverse=True
+    )
+    return {
+        "module": module,
+        "import_ms": round(statistics.median(totals), 1),
+        "packages": [(package, round(ms, 1)) for package, ms in top],
+        "heavy": heavy,
+        "error": None
+    }
+
+def check(result: Dict[str, Any], budget_ms: Optional[float]) -> List[str]:
+    """Lista as violações do alvo (orçamento, bibliotecas pesadas ou erro)"""
+    if result["error"]:
+        return [f"{result['module']}: falha na importação ({result['error']})"]
+
+    failures = []
+    if budget_ms is not None and result["import_ms"] > budget_ms:
+        failures.append(f"{result['module']}: {result['import_ms']} ms > orçamento de {budget_ms} ms")
+    if result["heavy"]:
+        failures.append(f"{result['module']}: carrega na importação {', '.join(result['heavy'])}")
+    return failures
+
+def parse_budgets(values: List[str]) -> Dict[str, float]:
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for value in values:
+        module, _, ms = value.partition("=")
+        budgets[module] = float(ms)
+    return budgets
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Tempo de importação e orçamento de cold start do backend")
+    parser.add_argument("targets", nargs="*", help="Módulos a medir (padrão: alvos com orçamento)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Quantidade de pacotes mais caros exibidos")
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULO=MS",
+                        help="Orçamento de importação de um alvo em milissegundos")
+    args = parser.parse_args()
+
+    budgets = parse_budgets(args.budget)
+    targets = args.targets or list(budgets)
+
+    failures = []
+    for module in targets:
+        result = measure(module, args.runs)
+        budget = budgets.get(module)
+
+        if result["error"]:
+            print(f"{module}: {result['error']}")
+        else:
+            limit = f" (orçamento {budget:.0f} ms)" if budget is not None else ""
+            print(f"{module}: {result['import_ms']} ms{limit}")
+            for package, ms in result["packages"][:args.top]:
+                print(f"  {package:30s} {ms:8.1f} ms")
+            if result["heavy"]:
+                print(f"  carregados na importação: {', '.join(result['heavy'])}")
+
+        failures.extend(check(result, budget))
+
+    if failures:
+        print("Orçamento de inicialização excedido:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+
+    print("Dentro do orçamento de inicialização")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
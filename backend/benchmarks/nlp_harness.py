@@ -0,0 +1,293 @@
+"""
+Harness de desempenho e acurácia do NLPProcessor sobre o corpus rotulado.
+
+Mede consultas/s de detect_intent e de parse (sem e com cache) e do fluxo
+anterior de /query (detect_intent, extract_host e extract_time_range
+repetidos pela rota e pelo gerador, com um re.search por padrão), latências
+p50/p99 de parse e a acurácia de intenção, host, threshold, período e
+duração.
+
+Para comparar vazões entre máquinas, cada vazão é dividida pela de um laço
+de calibração fixo executado na mesma máquina. Termina com código 1 quando
+alguma acurácia cai, quando o matcher combinado diverge do fluxo anterior,
+ou quando uma vazão normalizada ou razão de vazões (ganho do cache, parse
+sobre o fluxo anterior) cai além da tolerância em relação ao baseline. Com
+--absolute, a vazão bruta também é comparada (apenas na mesma máquina do
+baseline).
+
+Uso:
+    python -m zabbia.backend.benchmarks.nlp_harness [--tolerance 0.25] [--absolute] [--update-baseline]
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from typing import Dict, List, Any, Callable
+
+from zabbia.backend.nlp_processor import NLPProcessor, QueryIntent, TimeRange
+from zabbia.backend.benchmarks.corpus import (
+    DEFAULT_CORPUS_PATH, generate_corpus, load_corpus, write_corpus
+)
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), "data", "nlp_baseline.json")
+
+# Vazões comparadas com o baseline
+THROUGHPUTS = ("detect_intent_qps", "parse_qps", "parse_cached_qps", "legacy_qps")
+
+# Razões de vazão comparadas com o baseline (independentes da máquina):
+# nome -> (numerador, denominador)
+THROUGHPUT_RATIOS = {
+    "cache_speedup": ("parse_cached_qps", "parse_qps"),
+    "parse_vs_legacy": ("parse_qps", "legacy_qps"),
+}
+
+# Laço de calibração: regex e operações de string sobre textos fixos, o mesmo
+# tipo de trabalho do parse, sem depender do código medido
+CALIBRATION_PATTERNS = [
+    re.compile(pattern) for pattern in (
+        r"\b(cpu|processador|processamento)\b",
+        r"(\d+(?:\.\d+)?)\s*%",
+        r"\b(?:últimas?|last)\s+(\d+)\s*(horas?|dias?|minutos?)\b",
+        r"\b(?:host|servidor)\s+([\w.-]+)",
+    )
+]
+CALIBRATION_TEXTS = [
+    "Quais hosts estão com CPU alta nas últimas 3 horas?",
+    "Servidores com memória acima de 85% nas últimas 12 horas",
+    "Gerar gráfico de cpu do host web01 nas últimas 6 horas",
+    "Colocar host db02 em manutenção por 2 horas",
+]
+CALIBRATION_REPEAT = 2500
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentil por posição mais próxima de uma lista já ordenada"""
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+def throughput(func: Callable[[str], Any], queries: List[str], rounds: int) -> float:
+    """Executa func sobre todas as consultas `rounds` vezes e retorna as consultas
+    por segundo da rodada mais rápida (menos sensível a interrupções da máquina)"""
+    best = 0.0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for query in queries:
+            func(query)
+        best = max(best, len(queries) / (time.perf_counter() - started))
+    return best
+
+def calibration_throughput(rounds: int = 5) -> float:
+    """Vazão do laço de calibração em operações/s (melhor de `rounds` rodadas)"""
+    def work(text: str) -> None:
+        lowered = text.lower()
+        for pattern in CALIBRATION_PATTERNS:
+            pattern.search(lowered)
+        lowered.split()
+
+    return throughput(work, CALIBRATION_TEXTS * CALIBRATION_REPEAT, rounds)
+
+def legacy_detect_intent(processor: NLPProcessor, query: str) -> str:
+    """Detecção de intenção como era feita antes (um re.search por padrão)"""
+    normalized_query = query.lower()
+    for intent, patterns in processor.intent_patterns.items():
+        for pattern in patterns:
+            if re.search(pattern, normalized_query):
+                return intent
+    return QueryIntent.GENERAL_QUERY
+
+def legacy_pipeline(processor: NLPProcessor, query: str) -> None:
+    """Fluxo anterior da rota /query: análise repetida na rota e no gerador"""
+    intent = legacy_detect_intent(processor, query)
+    re.search(processor.host_pattern, query.lower())
+    re.search(processor.period_pattern, query.lower())
+    TimeRange.from_period("24h")
+
+    # generate_sql/generate_api_call repetiam toda a análise
+    legacy_detect_intent(processor, query)
+    re.search(processor.host_pattern, query.lower())
+    re.search(processor.period_pattern, query.lower())
+    TimeRange.from_period("24h")
+    if intent in (QueryIntent.HIGH_CPU, QueryIntent.MEMORY_USAGE):
+        re.search(processor.threshold_pattern, query.lower())
+    if intent == QueryIntent.HOST_MAINTENANCE:
+        re.search(processor.duration_pattern, query.lower())
+
+def legacy_mismatches(processor: NLPProcessor, queries: List[str]) -> int:
+    """Consultas em que o matcher combinado escolhe intenção diferente do fluxo anterior"""
+    return sum(processor.parse(query).intent != legacy_detect_intent(processor, query) for query in queries)
+
+def parse_latencies(processor: NLPProcessor, queries: List[str]) -> List[float]:
+    """Latência de parse de cada consulta em microssegundos (ordenadas)"""
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        processor.parse(query)
+        latencies.append((time.perf_counter() - started) * 1e6)
+    latencies.sort()
+    return latencies
+
+def accuracy(processor: NLPProcessor, corpus: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Fração de acertos de cada rótulo do corpus"""
+    hits = {"intent": 0, "detect_intent": 0, "host": 0, "threshold": 0, "period": 0, "duration_minutes": 0}
+    for example in corpus:
+        parsed = processor.parse(example["query"])
+        hits["intent"] += parsed.intent == example["intent"]
+        hits["detect_intent"] += processor.detect_intent(example["query"]) == example["intent"]
+        hits["host"] += parsed.host == example["host"]
+        hits["threshold"] += parsed.threshold == example["threshold"]
+        hits["period"] += parsed.time_range.time_period == example["period"]
+        hits["duration_minutes"] += parsed.duration_minutes == example["duration_minutes"]
+    return {name: round(count / len(corpus), 4) for name, count in hits.items()}
+
+def intent_confusion(processor: NLPProcessor, corpus: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """Intenções detectadas incorretamente, agrupadas pela intenção esperada"""
+    confusion: Dict[str, Dict[str, int]] = {}
+    for example in corpus:
+        detected = processor.detect_intent(example["query"])
+        if detected != example["intent"]:
+            row = confusion.setdefault(example["intent"], {})
+            row[detected] = row.get(detected, 0) + 1
+    return confusion
+
+def run(corpus: List[Dict[str, Any]], rounds: int) -> Dict[str, Any]:
+    """Executa todas as medições sobre o corpus"""
+    queries = [example["query"] for example in corpus]
+    uncached = NLPProcessor(cache_size=0)
+    cached = NLPProcessor(cache_size=len(queries))
+
+    # Aquecimento (compilação de regex, caches de CPU)
+    throughput(uncached.parse, queries[:200], 1)
+
+    latencies = parse_latencies(uncached, queries)
+    calibration = calibration_throughput()
+    result = {
+        "queries": len(queries),
+        "rounds": rounds,
+        "calibration_ops": round(calibration),
+        "detect_intent_qps": round(throughput(uncached.detect_intent, queries, rounds)),
+        "parse_qps": round(throughput(uncached.parse, queries, rounds)),
+        "parse_cached_qps": round(throughput(cached.parse, queries, rounds)),
+        "legacy_qps": round(throughput(lambda query: legacy_pipeline(uncached, query), queries, rounds)),
+        "parse_p50_us": round(percentile(latencies, 0.50), 2),
+        "parse_p99_us": round(percentile(latencies, 0.99), 2),
+        "legacy_mismatches": legacy_mismatches(uncached, queries),
+        "accuracy": accuracy(uncached, corpus),
+        "intent_errors": intent_confusion(uncached, corpus)
+    }
+    result["normalized"] = normalized_throughputs(result)
+    for name in THROUGHPUT_RATIOS:
+        result[name] = throughput_ratio(result, name)
+    return result
+
+def normalized_throughputs(result: Dict[str, Any]) -> Dict[str, float]:
+    """Vazões divididas pela vazão do laço de calibração da mesma execução"""
+    calibration = result.get("calibration_ops")
+    if not calibration:
+        return {}
+    return {name: round(result[name] / calibration, 4) for name in THROUGHPUTS if result.get(name)}
+
+def throughput_ratio(result: Dict[str, Any], name: str) -> float:
+    """Calcula uma razão de THROUGHPUT_RATIOS a partir das vazões medidas"""
+    numerator, denominator = THROUGHPUT_RATIOS[name]
+    if not result.get(numerator) or not result.get(denominator):
+        return 0.0
+    return round(result[numerator] / result[denominator], 2)
+
+def check_regressions(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+                      absolute: bool = False) -> List[str]:
+    """Lista as quedas de acurácia e de vazão em relação ao baseline
+
+    As vazões são comparadas normalizadas pelo laço de calibração, e a
+    vazão bruta apenas com `absolute` (um baseline gravado em outra máquina
+    reprovaria qualquer execução mais lenta sem mudança de código).
+    """
+    failures = []
+    if result.get("legacy_mismatches"):
+        failures.append(f"legacy_mismatches: {result['legacy_mismatches']} consultas com intenção diferente do fluxo anterior")
+
+    measured_normalized = result.get("normalized") or normalized_throughputs(result)
+    for name, expected in (baseline.get("normalized") or normalized_throughputs(baseline)).items():
+        measured = measured_normalized.get(name)
+        if measured is not None and measured < expected * (1 - tolerance):
+            failures.append(f"normalized.{name}: {measured} < {expected} (-{tolerance:.0%})")
+
+    if absolute:
+        for name in THROUGHPUTS:
+            expected, measured = baseline.get(name), result.get(name)
+            if expected and measured is not None and measured < expected * (1 - tolerance):
+                failures.append(f"{name}: {measured} < {expected} (-{tolerance:.0%})")
+
+    for name in THROUGHPUT_RATIOS:
+        expected = baseline.get(name) or throughput_ratio(baseline, name)
+        measured = throughput_ratio(result, name)
+        if expected and measured < expected * (1 - tolerance):
+            failures.append(f"{name}: {measured}x < {expected}x (-{tolerance:.0%})")
+
+    for name, expected in baseline.get("accuracy", {}).items():
+        measured = result["accuracy"].get(name)
+        if measured is not None and measured < expected:
+            failures.append(f"accuracy.{name}: {measured} < {expected}")
+    return failures
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de vazão e acurácia do NLPProcessor")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_PATH)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=float(os.getenv("NLP_BENCH_TOLERANCE", "0.25")),
+                        help="Queda máxima aceita nas vazões normalizadas e razões em relação ao baseline (fração)")
+    parser.add_argument("--absolute", action="store_true",
+                        help="Compara também a vazão bruta (apenas na máquina em que o baseline foi gravado)")
+    parser.add_argument("--update-baseline", action="store_true", help="Grava o resultado como novo baseline")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.corpus):
+        write_corpus(generate_corpus(), args.corpus)
+    corpus = load_corpus(args.corpus)
+
+    result = run(corpus, args.rounds)
+
+    normalized = result["normalized"]
+    print(f"Consultas: {result['queries']} x {result['rounds']} rodadas")
+    print(f"Calibração:         {result['calibration_ops']:10d} operações/s")
+    print(f"detect_intent:      {result['detect_intent_qps']:10d} consultas/s ({normalized['detect_intent_qps']:.4f} normalizado)")
+    print(f"parse:              {result['parse_qps']:10d} consultas/s ({normalized['parse_qps']:.4f} normalizado)")
+    print(f"parse (com cache):  {result['parse_cached_qps']:10d} consultas/s ({normalized['parse_cached_qps']:.4f} normalizado)")
+    print(f"Fluxo anterior:     {result['legacy_qps']:10d} consultas/s ({normalized['legacy_qps']:.4f} normalizado)")
+    print(f"Ganho do cache:     {result['cache_speedup']:10.2f}x")
+    print(f"parse/anterior:     {result['parse_vs_legacy']:10.2f}x")
+    print(f"Divergências de intenção com o fluxo anterior: {result['legacy_mismatches']}")
+    print(f"Latência de parse:  p50 {result['parse_p50_us']} us, p99 {result['parse_p99_us']} us")
+    print("Acurácia: " + ", ".join(f"{name} {value:.2%}" for name, value in result["accuracy"].items()))
+    for expected, detected in result["intent_errors"].items():
+        print(f"  {expected} detectada como {detected}")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({key: value for key, value in result.items() if key != "intent_errors"}, f, indent=2)
+        print(f"Baseline gravado em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Nenhum baseline encontrado; use --update-baseline para criá-lo")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    failures = check_regressions(result, baseline, args.tolerance, args.absolute)
+    if failures:
+        print("Regressão detectada:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+
+    print(f"Sem regressão em relação ao baseline (tolerância {args.tolerance:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
+
+from zabbia.backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tipos de conteúdo por formato (json: apenas os dados das séries)
+MEDIA_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "json": "application/json",
+}
+
+@dataclass(frozen=True)
+class CachedChart:
+    """Imagem renderizada e o seu ETag (hash do conteúdo)"""
+    data: bytes
+    media_type: str
+    etag: str
+
+    @classmethod
+    def from_bytes(cls, data: bytes, media_type: str) -> 'CachedChart':
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        return cls(data, media_type, f'"{digest}"')
+
+def snap_window(time_from: int, time_till: int, bucket: int) -> Tuple[int, int]:
+    """Alinha uma janela de tempo ao intervalo do cache
+
+    Janelas relativas ("últimas 24h") pedidas dentro do mesmo intervalo
+    resultam na mesma janela e, portanto, na mesma chave.
+
+    Args:
+        time_from: Timestamp inicial
+        time_till: Timestamp final
+        bucket: Tamanho do intervalo em segundos
+
+    Returns:
+        Tupla (time_from, time_till) alinhada
+    """
+    if bucket <= 1:
+        return time_from, time_till
+    length = time_till - time_from
+    time_till = time_till // bucket * bucket
+    return time_till - length, time_till
+
+def chart_key(**parts: Any) -> str:
+    """Chave do gráfico: hash das entradas que determinam a imagem
+
+    Args:
+        parts: Tipo, IDs dos itens, janela alinhada, tamanho, estilo e formato
+
+    Returns:
+        Hash hexadecimal das entradas
+    """
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Verifica se o cabeçalho If-None-Match contém o ETag informado"""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+class ChartCache:
+    """Cache de gráficos renderizados, endereçado pelo conteúdo
+
+    As imagens ficam em memória sob um limite total de bytes, com descarte
+    da menos usada recentemente (LRU), e, se configurado, também no Redis,
+    compartilhadas entre processos. No Redis as entradas expiram após `ttl`
+    segundos; o descarte por memória segue a política maxmemory do servidor.
+    Renderizações simultâneas da mesma chave são feitas uma única vez.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = settings.chart_cache_max_bytes,
+        ttl: int = settings.chart_cache_ttl,
+        redis_url: Optional[str] = settings.redis_url
+    ):
+        """Inicializa o cache
+
+        Args:
+            max_bytes: Limite de bytes das imagens em memória (0 desativa o cache)
+            ttl: Tempo de vida das entradas no Redis em segundos
+            redis_url: URL do Redis (opcional)
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.redis_url = redis_url
+        self._entries: "OrderedDict[str, CachedChart]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._redis = None
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def redis_key(key: str) -> str:
+        return f"zabbia:chart:{key}"
+
+    async def start(self) -> None:
+        """Conecta ao Redis, se configurado (chamado na inicialização da API)"""
+        if self.redis_url and self._redis is None:
+            # Importado apenas quando configurado: o Redis é opcional
+            try:
+                import redis.asyncio as aioredis
+            except ImportError:
+                logger.warning("REDIS_URL definido, mas o pacote redis não está instalado")
+            else:
+                self._redis = aioredis.from_url(self.redis_url)
+
+    async def stop(self) -> None:
+        """Fecha a conexão com o Redis"""
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    def _get_local(self, key: str) -> Optional[CachedChart]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put_local(self, key: str, entry: CachedChart) -> None:
+        size = len(entry.data)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.data)
+            self._entries[key] = entry
+            self._size += size
+
+            # Descarta as menos usadas até caber no limite
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.data)
+
+    async def _get_redis(self, key: str) -> Optional[CachedChart]:
+        if self._redis is None:
+            return None
+        try:
+            stored = await self._redis.hgetall(self.redis_key(key))
+        except Exception as e:
+            logger.warning(f"Erro ao ler gráfico do Redis: {e}")
+            return None
+        if not stored:
+            return None
+        return CachedChart(stored[b"data"], stored[b"media_type"].decode(), stored[b"etag"].decode())
+
+    async def _put_redis(self, key: str, entry: CachedChart) -> None:
+        if self._redis is None:
+            return
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.hset(self.redis_key(key), mapping={
+                    "data": entry.data,
+                    "media_type": entry.media_type,
+                    "etag": entry.etag
+                })
+                pipe.expire(self.redis_key(key), self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Erro ao gravar gráfico no Redis: {e}")
+
+    async def get(self, key: str) -> Optional[CachedChart]:
+        """Busca um gráfico em memória e, em seguida, no Redis
+
+        Args:
+            key: Chave gerada por chart_key
+
+        Returns:
+            Gráfico armazenado ou None
+        """
+        entry = self._get_local(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        entry = await self._get_redis(key)
+        if entry is not None:
+            self.redis_hits += 1
+            self._put_local(key, entry)
+        return entry
+
+    async def put(self, key: str, entry: CachedChart) -> None:
+        """Armazena um gráfico em memória e no Redis"""
+        self._put_local(key, entry)
+        await self._put_redis(key, entry)
+
+    async def get_or_render(
+        self,
+        key: str,
+        render: Callable[[], Awaitable[Optional[bytes]]],
+        media_type: str = MEDIA_TYPES["png"]
+    ) -> Optional[CachedChart]:
+        """Retorna o gráfico da chave, renderizando-o apenas se necessário
+
+        Args:
+            key: Chave gerada por chart_key
+            render: Coroutine que busca os dados e renderiza a imagem
+                    (None quando não há dados; o resultado não é armazenado)
+            media_type: Tipo de conteúdo da imagem
+
+        Returns:
+            Gráfico renderizado ou None
+        """
+        if self.max_bytes <= 0:
+            data = await render()
+            return CachedChart.from_bytes(data, media_type) if data is not None else None
+
+        entry = await self.get(key)
+        if entry is not None:
+            return entry
+
+        # Outra requisição já está renderizando a mesma chave
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            self.misses += 1
+            data = await render()
+            entry = CachedChart.from_bytes(data, media_type) if data is not None else None
+            if entry is not None:
+                await self.put(key, entry)
+            future.set_result(entry)
+            return entry
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Evita o aviso de exceção não lida quando ninguém aguardava
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+
+    def clear(self) -> None:
+        """Esvazia o cache em memória"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna ocupação e acertos do cache"""
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+            "redis": self._redis is not None
+        }
+
+# Cache global de gráficos renderizados
+chart_cache = ChartCache()
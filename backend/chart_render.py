@@ -0,0 +1,316 @@
+import os
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from io import BytesIO
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
+
+from zabbia.backend.config import settings
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+logger = logging.getLogger(__name__)
+
+# Estilo padrão dos gráficos, aplicado uma vez por processo
+CHART_STYLE = "ggplot"
+
+_matplotlib_ready = False
+
+def _setup_matplotlib() -> None:
+    """Importa e configura o matplotlib na primeira renderização do processo
+
+    A importação é adiada para que o servidor (que apenas envia os gráficos
+    ao pool) não pague o custo do matplotlib na inicialização.
+    """
+    global _matplotlib_ready
+    if _matplotlib_ready:
+        return
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.style
+    matplotlib.style.use(CHART_STYLE)
+    _matplotlib_ready = True
+
+def _new_figure(width: float, height: float) -> 'Figure':
+    """Cria uma figura independente (sem o estado global do pyplot)"""
+    _setup_matplotlib()
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=(width, height))
+    FigureCanvasAgg(figure)
+    return figure
+
+def _to_bytes(figure: 'Figure', image_format: str, tight: bool = True) -> bytes:
+    buf = BytesIO()
+    figure.savefig(buf, format=image_format, bbox_inches="tight" if tight else None)
+    return buf.getvalue()
+
+def _format_time_axis(figure: 'Figure', axes) -> None:
+    import matplotlib.dates as mdates
+
+    axes.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d %H:%M'))
+    figure.autofmt_xdate()
+
+def _to_datetimes(timestamps: List[int]) -> List[datetime]:
+    return [datetime.fromtimestamp(timestamp) for timestamp in timestamps]
+
+def render_time_series(spec: Dict[str, Any]) -> bytes:
+    """Renderiza um gráfico de série temporal
+
+    Args:
+        spec: timestamps (epoch), values, title, ylabel, width, height, color,
+              show_markers e format
+
+    Returns:
+        Imagem codificada (PNG por padrão)
+    """
+    figure = _new_figure(spec.get("width", 10), spec.get("height", 6))
+    axes = figure.add_subplot()
+
+    axes.plot(
+        _to_datetimes(spec["timestamps"]),
+        spec["values"],
+        marker='o' if spec.get("show_markers") else None,
+        linestyle='-',
+        color=spec.get("color", '#1f77b4')
+    )
+
+    axes.set_title(spec.get("title", ""))
+    axes.set_xlabel('Tempo')
+    axes.set_ylabel(spec.get("ylabel") or 'Valor')
+    axes.grid(True)
+    _format_time_axis(figure, axes)
+
+    return _to_bytes(figure, spec.get("format", "png"))
+
+def render_comparison(spec: Dict[str, Any]) -> bytes:
+    """Renderiza várias séries temporais no mesmo gráfico
+
+    Args:
+        spec: series (lista de {label, timestamps, values}), title, width,
+              height e format
+
+    Returns:
+        Imagem codificada (PNG por padrão)
+    """
+    figure = _new_figure(spec.get("width", 12), spec.get("height", 8))
+    axes = figure.add_subplot()
+
+    from matplotlib import colormaps
+
+    # Cores para diferenciação das linhas
+    colors = colormaps["tab10"].colors
+    for idx, series in enumerate(spec["series"]):
+        axes.plot(
+            _to_datetimes(series["timestamps"]),
+            series["values"],
+            linestyle='-',
+            color=colors[idx % len(colors)],
+            label=series["label"]
+        )
+
+    axes.set_title(spec.get("title", ""))
+    axes.set_xlabel('Tempo')
+    axes.set_ylabel('Valor')
+    axes.grid(True)
+    axes.legend(loc='best')
+    _format_time_axis(figure, axes)
+
+    return _to_bytes(figure, spec.get("format", "png"))
+
+def render_pie(spec: Dict[str, Any]) -> bytes:
+    """Renderiza um gráfico de pizza
+
+    Args:
+        spec: labels, values, explode, title, width, height e format
+
+    Returns:
+        Imagem codificada (PNG por padrão)
+    """
+    figure = _new_figure(spec.get("width", 8), spec.get("height", 8))
+    axes = figure.add_subplot()
+
+    axes.pie(
+        spec["values"],
+        labels=spec["labels"],
+        explode=spec.get("explode"),
+        autopct='%1.1f%%',
+        shadow=True,
+        startangle=90
+    )
+    axes.axis('equal')  # Iguala a proporção para um círculo perfeito
+    axes.set_title(spec.get("title", ""))
+
+    return _to_bytes(figure, spec.get("format", "png"))
+
+def render_bar(spec: Dict[str, Any]) -> bytes:
+    """Renderiza um gráfico de barras
+
+    Args:
+        spec: labels, values, title, xlabel, ylabel, width, height, color,
+              horizontal e format
+
+    Returns:
+        Imagem codificada (PNG por padrão)
+    """
+    figure = _new_figure(spec.get("width", 10), spec.get("height", 6))
+    axes = figure.add_subplot()
+    color = spec.get("color", '#1f77b4')
+
+    if spec.get("horizontal"):
+        axes.barh(spec["labels"], spec["values"], color=color)
+        axes.set_xlabel(spec.get("ylabel", ""))  # Invertidos para barras horizontais
+        axes.set_ylabel(spec.get("xlabel", ""))
+    else:
+        axes.bar(spec["labels"], spec["values"], color=color)
+        axes.set_xlabel(spec.get("xlabel", ""))
+        axes.set_ylabel(spec.get("ylabel", ""))
+        axes.tick_params(axis='x', labelrotation=45)
+        for label in axes.get_xticklabels():
+            label.set_horizontalalignment('right')
+
+    axes.set_title(spec.get("title", ""))
+    figure.tight_layout()
+
+    return _to_bytes(figure, spec.get("format", "png"))
+
+RENDERERS = {
+    "time_series": render_time_series,
+    "comparison": render_comparison,
+    "pie": render_pie,
+    "bar": render_bar,
+}
+
+def render_chart(spec: Dict[str, Any]) -> bytes:
+    """Renderiza o gráfico descrito em spec['kind']
+
+    A especificação contém apenas dados simples (listas, números e textos)
+    para poder ser enviada a outro processo.
+
+    Args:
+        spec: Especificação do gráfico
+
+    Returns:
+        Imagem codificada
+    """
+    renderer = RENDERERS.get(spec.get("kind"))
+    if renderer is None:
+        raise ValueError(f"Tipo de gráfico desconhecido: {spec.get('kind')}")
+
+    return renderer(spec)
+
+def _init_worker() -> None:
+    """Inicializa um processo de renderização (fontes e caches do matplotlib)"""
+    render_chart({"kind": "time_series", "timestamps": [0, 60], "values": [0.0, 1.0], "width": 2, "height": 1})
+
+def _warmup() -> int:
+    return os.getpid()
+
+class ChartRenderer:
+    """Renderização de gráficos em um pool de processos
+
+    Cada gráfico é renderizado com a API orientada a objetos (Figure + Agg)
+    em um processo separado, fora do event loop e sem o estado global do
+    pyplot; vários gráficos são renderizados em paralelo nos núcleos
+    disponíveis. Sem pool iniciado, a renderização ocorre em uma thread; se
+    um processo morrer, o pool é recriado.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """Inicializa o renderizador
+
+        Args:
+            max_workers: Quantidade de processos (padrão: núcleos disponíveis, até 4)
+        """
+        self.max_workers = max_workers or min(os.cpu_count() or 1, 4)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None
+
+    async def start(self) -> None:
+        """Cria o pool e inicia o aquecimento dos processos em segundo plano
+
+        A inicialização da API não espera o aquecimento; gráficos pedidos
+        antes do fim aguardam na fila do pool.
+        """
+        if self._pool is not None:
+            return
+
+        self._pool = self._new_pool()
+        self._warmup_task = asyncio.get_running_loop().create_task(self._warm_up(self._pool))
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # spawn: os processos não herdam threads nem locks do servidor
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+
+    def _replace_broken_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Substitui um pool quebrado (processo encerrado por OOM, segfault etc.)
+
+        Várias renderizações podem falhar com o mesmo pool; apenas a primeira
+        cria o substituto.
+        """
+        if self._pool is not broken:
+            return
+        logger.error("Processo de renderização de gráficos encerrado inesperadamente; recriando o pool")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._pool = self._new_pool()
+
+    async def _warm_up(self, pool: ProcessPoolExecutor) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            pids = await asyncio.gather(*(
+                loop.run_in_executor(pool, _warmup) for _ in range(self.max_workers)
+            ))
+            logger.info(f"Pool de renderização de gráficos iniciado com {len(set(pids))} processos")
+        except Exception as e:
+            logger.error(f"Erro ao iniciar o pool de renderização de gráficos: {e}")
+
+    async def stop(self) -> None:
+        """Encerra o pool de processos"""
+        if self._pool is None:
+            return
+        pool, self._pool = self._pool, None
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+            self._warmup_task = None
+        await asyncio.to_thread(pool.shutdown, True, cancel_futures=True)
+
+    async def render(self, spec: Dict[str, Any]) -> bytes:
+        """Renderiza um gráfico sem bloquear o event loop
+
+        Args:
+            spec: Especificação do gráfico (ver render_chart)
+
+        Returns:
+            Imagem codificada
+        """
+        loop = asyncio.get_running_loop()
+        # Uma nova tentativa com pool recriado; se falhar de novo, renderiza em uma thread
+        for _ in range(2):
+            pool = self._pool
+            if pool is None:
+                break
+            try:
+                return await loop.run_in_executor(pool, render_chart, spec)
+            except BrokenProcessPool:
+                self._replace_broken_pool(pool)
+        return await asyncio.to_thread(render_chart, spec)
+
+    async def render_many(self, specs: List[Dict[str, Any]]) -> List[bytes]:
+        """Renderiza vários gráficos em paralelo, na ordem recebida"""
+        return list(await asyncio.gather(*(self.render(spec) for spec in specs)))
+
+# Renderizador global (pool iniciado na inicialização da API)
+chart_renderer = ChartRenderer(settings.chart_render_workers)
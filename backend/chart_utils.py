@@ -1,27 +1,72 @@
+import json
 import logging
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import numpy as np
+import asyncio
 import base64
-import io
+from time import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Optional, Tuple, Union, Callable
+
+import numpy as np
 
+from zabbia.backend.config import settings
 from zabbia.backend.db_utils import db_client
+from zabbia.backend.services.catalog import host_catalog
+from zabbia.backend.chart_render import chart_renderer, render_chart, CHART_STYLE
+from zabbia.backend.chart_cache import chart_cache, chart_key, snap_window, CachedChart, MEDIA_TYPES
+from zabbia.backend.utils.downsampling import lttb, DEFAULT_MAX_POINTS
 
 logger = logging.getLogger(__name__)
 
+# Períodos aceitos nos gráficos de uso de recursos, em segundos
+TIME_PERIODS = {
+    '1h': 3600,
+    '6h': 21600,
+    '24h': 86400,
+    '7d': 604800,
+    '30d': 2592000
+}
+
+# Padrão de chave do item e título de cada tipo de recurso
+RESOURCE_ITEMS = {
+    'cpu': ('system.cpu.util', "Uso de CPU"),
+    'memory': ('vm.memory.util', "Uso de Memória"),
+    'disk': ('vfs.fs.size[/,pused]', "Uso de Disco (/)"),  # Ajustar conforme necessário
+}
+
 class ZabbixChartGenerator:
     """Gerador de gráficos para dados do Zabbix
     
     Esta classe permite gerar gráficos a partir dos dados obtidos do Zabbix,
     utilizando matplotlib para visualização de métricas de monitoramento.
+    
+    Cada gráfico é montado em duas etapas: a busca dos dados produz uma
+    especificação (apenas dados simples) e a renderização é feita por
+    chart_render. Os métodos generate_* renderizam no próprio processo; os
+    métodos *_async renderizam no pool de processos sem bloquear o event loop.
+    
+    render/render_async retornam os bytes da imagem (PNG ou SVG) e chart_data
+    apenas os dados das séries; o retorno em base64 dos métodos generate_* é
+    mantido por compatibilidade.
     """
     
-    def __init__(self):
-        """Inicializa o gerador de gráficos"""
-        # Configurações padrão de estilo para os gráficos
-        plt.style.use('ggplot')
+    @staticmethod
+    def _get_item_info(item_id: int) -> List[Dict[str, Any]]:
+        """Obtém nome e unidade de um item, pelo catálogo ou pelo banco
+        
+        Args:
+            item_id: ID do item do Zabbix
+            
+        Returns:
+            Lista com um dicionário {name, units} ou vazia se não encontrado
+        """
+        item = host_catalog.item(item_id)
+        if item:
+            return [{'name': item['name'], 'units': item['units']}]
+        
+        return db_client.execute_query(
+            "SELECT name, units FROM items WHERE itemid = %s",
+            (item_id,)
+        )
         
     @staticmethod
     def convert_timestamp_to_datetime(timestamp: int) -> datetime:
@@ -97,11 +142,33 @@ class ZabbixChartGenerator:
         Returns:
             String base64 da imagem do gráfico
         """
-        # Busca os dados do item para obter o nome e unidade
-        item_info = db_client.execute_query(
-            "SELECT name, units FROM items WHERE itemid = %s",
-            (item_id,)
+        spec = self.time_series_spec(
+            item_id, title, time_from, time_till, width, height, color, show_markers, limit
         )
+        return self._render_base64(spec)
+    
+    def time_series_spec(
+        self,
+        item_id: int,
+        title: Optional[str] = None,
+        time_from: Optional[int] = None,
+        time_till: Optional[int] = None,
+        width: int = 10,
+        height: int = 6,
+        color: str = '#1f77b4',
+        show_markers: bool = False,
+        limit: int = 1000
+    ) -> Optional[Dict[str, Any]]:
+        """Busca os dados e monta a especificação de um gráfico de série temporal
+        
+        Args:
+            Os mesmos de generate_time_series_chart
+            
+        Returns:
+            Especificação para chart_render ou None se não houver dados
+        """
+        # Busca os dados do item para obter o nome e unidade
+        item_info = self._get_item_info(item_id)
         
         if not item_info:
             logger.error(f"Item não encontrado: {item_id}")
@@ -122,40 +189,21 @@ class ZabbixChartGenerator:
             logger.error(f"Nenhum dado histórico encontrado para o item: {item_id}")
             return None
             
-        # Processa os dados para o gráfico
-        timestamps = [self.convert_timestamp_to_datetime(point['clock']) for point in history_data]
-        values = [float(point['value']) for point in history_data]
-        
-        # Inverte as listas para ordem cronológica
-        timestamps.reverse()
-        values.reverse()
-        
-        # Configuração do gráfico
-        plt.figure(figsize=(width, height))
-        
-        if show_markers:
-            plt.plot(timestamps, values, marker='o', linestyle='-', color=color)
-        else:
-            plt.plot(timestamps, values, linestyle='-', color=color)
-            
-        # Formatação do gráfico
-        plt.title(title if title else item_name)
-        plt.xlabel('Tempo')
-        plt.ylabel(item_units if item_units else 'Valor')
-        plt.grid(True)
-        
-        # Formatação do eixo X para datas
-        plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d %H:%M'))
-        plt.gcf().autofmt_xdate()
-        
-        # Converte o gráfico para base64
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        plt.close()
-        
-        # Retorna a string base64
-        return base64.b64encode(buf.getvalue()).decode('utf-8')
+        # Processa os dados para o gráfico (histórico vem do mais recente ao mais antigo)
+        timestamps = [int(point['clock']) for point in reversed(history_data)]
+        values = [float(point['value']) for point in reversed(history_data)]
+        
+        return {
+            "kind": "time_series",
+            "timestamps": timestamps,
+            "values": values,
+            "title": title if title else item_name,
+            "ylabel": item_units if item_units else 'Valor',
+            "width": width,
+            "height": height,
+            "color": color,
+            "show_markers": show_markers
+        }
     
     def generate_comparison_chart(
         self,
@@ -181,71 +229,68 @@ class ZabbixChartGenerator:
         Returns:
             String base64 da imagem do gráfico
         """
+        spec = self.comparison_spec(item_ids, title, time_from, time_till, width, height, limit)
+        return self._render_base64(spec)
+    
+    def comparison_spec(
+        self,
+        item_ids: List[int],
+        title: str = "Comparação de Itens",
+        time_from: Optional[int] = None,
+        time_till: Optional[int] = None,
+        width: int = 12,
+        height: int = 8,
+        limit: int = 500
+    ) -> Optional[Dict[str, Any]]:
+        """Busca os dados e monta a especificação de um gráfico comparativo
+        
+        Args:
+            Os mesmos de generate_comparison_chart
+            
+        Returns:
+            Especificação para chart_render ou None se não houver itens
+        """
         if not item_ids:
             logger.error("Nenhum item especificado para comparação")
             return None
-            
-        plt.figure(figsize=(width, height))
         
-        # Cores para diferenciação das linhas
-        colors = plt.cm.tab10.colors
+        # Metadados de todos os itens em uma consulta e histórico em uma por tipo de valor
+        items_info = db_client.get_items_info(item_ids)
+        history_by_item = db_client.get_items_history(
+            {item_id: info['value_type'] for item_id, info in items_info.items()},
+            time_from=time_from,
+            time_till=time_till,
+            limit=limit
+        )
         
-        for idx, item_id in enumerate(item_ids):
-            # Busca os dados do item
-            item_info = db_client.execute_query(
-                "SELECT name, units FROM items WHERE itemid = %s",
-                (item_id,)
-            )
+        series = []
+        for item_id in item_ids:
+            item_info = items_info.get(str(item_id))
             
             if not item_info:
                 logger.warning(f"Item não encontrado: {item_id}")
                 continue
                 
-            item_name = item_info[0]['name']
-            
-            # Busca o histórico do item
-            history_data = db_client.get_item_history(
-                item_id=item_id,
-                time_from=time_from,
-                time_till=time_till,
-                limit=limit
-            )
+            history_data = history_by_item.get(str(item_id))
             
             if not history_data:
                 logger.warning(f"Nenhum dado histórico encontrado para o item: {item_id}")
                 continue
                 
-            # Processa os dados para o gráfico
-            timestamps = [self.convert_timestamp_to_datetime(point['clock']) for point in history_data]
-            values = [float(point['value']) for point in history_data]
-            
-            # Inverte as listas para ordem cronológica
-            timestamps.reverse()
-            values.reverse()
-            
-            # Adiciona a linha ao gráfico
-            color = colors[idx % len(colors)]
-            plt.plot(timestamps, values, linestyle='-', color=color, label=item_name)
-            
-        # Formatação do gráfico
-        plt.title(title)
-        plt.xlabel('Tempo')
-        plt.ylabel('Valor')
-        plt.grid(True)
-        plt.legend(loc='best')
-        
-        # Formatação do eixo X para datas
-        plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d %H:%M'))
-        plt.gcf().autofmt_xdate()
-        
-        # Converte o gráfico para base64
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        plt.close()
-        
-        # Retorna a string base64
-        return base64.b64encode(buf.getvalue()).decode('utf-8')
+            # Processa os dados para o gráfico em ordem cronológica
+            series.append({
+                "label": item_info['name'],
+                "timestamps": [int(point['clock']) for point in reversed(history_data)],
+                "values": [float(point['value']) for point in reversed(history_data)]
+            })
+        
+        return {
+            "kind": "comparison",
+            "series": series,
+            "title": title,
+            "width": width,
+            "height": height
+        }
     
     def generate_pie_chart(
         self,
@@ -285,27 +330,15 @@ class ZabbixChartGenerator:
             largest_idx = values.index(max(values))
             explode = [0.1 if i == largest_idx else 0 for i in range(len(values))]
         
-        # Configuração do gráfico
-        plt.figure(figsize=(width, height))
-        plt.pie(
-            values, 
-            labels=labels, 
-            explode=explode,
-            autopct='%1.1f%%',
-            shadow=True, 
-            startangle=90
-        )
-        plt.axis('equal')  # Iguala a proporção para um círculo perfeito
-        plt.title(title)
-        
-        # Converte o gráfico para base64
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        plt.close()
-        
-        # Retorna a string base64
-        return base64.b64encode(buf.getvalue()).decode('utf-8')
+        return self._render_base64({
+            "kind": "pie",
+            "labels": labels,
+            "values": values,
+            "explode": explode,
+            "title": title,
+            "width": width,
+            "height": height
+        })
     
     def generate_bar_chart(
         self,
@@ -353,30 +386,18 @@ class ZabbixChartGenerator:
         labels = [item[0] for item in chart_data]
         values = [item[1] for item in chart_data]
         
-        # Configuração do gráfico
-        plt.figure(figsize=(width, height))
-        
-        if horizontal:
-            plt.barh(labels, values, color=color)
-            plt.xlabel(ylabel)  # Invertidos para barras horizontais
-            plt.ylabel(xlabel)
-        else:
-            plt.bar(labels, values, color=color)
-            plt.xlabel(xlabel)
-            plt.ylabel(ylabel)
-            plt.xticks(rotation=45, ha='right')
-            
-        plt.title(title)
-        plt.tight_layout()
-        
-        # Converte o gráfico para base64
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        plt.close()
-        
-        # Retorna a string base64
-        return base64.b64encode(buf.getvalue()).decode('utf-8')
+        return self._render_base64({
+            "kind": "bar",
+            "labels": labels,
+            "values": values,
+            "title": title,
+            "xlabel": xlabel,
+            "ylabel": ylabel,
+            "width": width,
+            "height": height,
+            "color": color,
+            "horizontal": horizontal
+        })
     
     def generate_resource_usage_chart(
         self,
@@ -400,26 +421,84 @@ class ZabbixChartGenerator:
         Returns:
             String base64 da imagem do gráfico
         """
-        if not host_id and not host_name:
-            logger.error("É necessário fornecer host_id ou host_name")
+        return self._render_base64(self.resource_usage_spec(
+            host_id=host_id,
+            host_name=host_name,
+            resource_type=resource_type,
+            time_period=time_period,
+            width=width,
+            height=height
+        ))
+    
+    def resource_usage_spec(
+        self,
+        host_id: Optional[int] = None,
+        host_name: Optional[str] = None,
+        resource_type: str = 'cpu',  # 'cpu', 'memory', 'disk'
+        time_period: str = '24h',    # '1h', '6h', '24h', '7d', '30d'
+        width: int = 10,
+        height: int = 6,
+        time_till: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Localiza o item do recurso e monta a especificação do gráfico
+        
+        Args:
+            Os mesmos de generate_resource_usage_chart
+            time_till: Fim da janela (padrão: agora, sem limite superior)
+            
+        Returns:
+            Especificação para chart_render ou None se o item não for encontrado
+        """
+        if time_period not in TIME_PERIODS:
+            logger.error(f"Período de tempo inválido: {time_period}")
             return None
             
-        # Converte o período de tempo para segundos a partir de agora
-        time_mapping = {
-            '1h': 3600,
-            '6h': 21600,
-            '24h': 86400,
-            '7d': 604800,
-            '30d': 2592000
-        }
+        item = self.resource_item(host_id, host_name, resource_type)
+        if not item:
+            return None
         
-        if time_period not in time_mapping:
-            logger.error(f"Período de tempo inválido: {time_period}")
+        # Converte o período de tempo para segundos a partir do fim da janela
+        end = time_till if time_till is not None else int(datetime.now().timestamp())
+        time_from = end - TIME_PERIODS[time_period]
+        
+        # Monta o gráfico de série temporal para o item
+        return self.time_series_spec(
+            item_id=item['itemid'],
+            title=f"{RESOURCE_ITEMS[resource_type][1]} - {time_period} - {item['name']}",
+            time_from=time_from,
+            time_till=time_till,
+            width=width,
+            height=height
+        )
+    
+    def resource_item(
+        self,
+        host_id: Optional[int] = None,
+        host_name: Optional[str] = None,
+        resource_type: str = 'cpu'
+    ) -> Optional[Dict[str, Any]]:
+        """Localiza o item de um recurso do host (catálogo primeiro, banco como alternativa)
+        
+        Args:
+            host_id: ID do host (opcional se host_name for fornecido)
+            host_name: Nome do host (opcional se host_id for fornecido)
+            resource_type: Tipo de recurso ('cpu', 'memory', 'disk')
+            
+        Returns:
+            Dicionário com itemid e name ou None se não encontrado
+        """
+        if not host_id and not host_name:
+            logger.error("É necessário fornecer host_id ou host_name")
             return None
             
-        time_from = int(datetime.now().timestamp()) - time_mapping[time_period]
+        if resource_type not in RESOURCE_ITEMS:
+            logger.error(f"Tipo de recurso inválido: {resource_type}")
+            return None
         
         # Obtém o host_id se apenas o nome foi fornecido
+        if not host_id and host_name and host_catalog.host_by_name(host_name):
+            host_id = host_catalog.host_by_name(host_name)['hostid']
+            
         if not host_id and host_name:
             host_info = db_client.execute_query(
                 "SELECT hostid FROM hosts WHERE name LIKE %s AND status = 0",
@@ -432,45 +511,281 @@ class ZabbixChartGenerator:
                 
             host_id = host_info[0]['hostid']
         
-        # Determina o padrão de chave e título com base no tipo de recurso
-        key_pattern = None
-        title = None
-        
-        if resource_type == 'cpu':
-            key_pattern = 'system.cpu.util'
-            title = f"Uso de CPU - {time_period}"
-        elif resource_type == 'memory':
-            key_pattern = 'vm.memory.util'
-            title = f"Uso de Memória - {time_period}"
-        elif resource_type == 'disk':
-            key_pattern = 'vfs.fs.size[/,pused]'  # Ajustar conforme necessário
-            title = f"Uso de Disco (/) - {time_period}"
-        else:
-            logger.error(f"Tipo de recurso inválido: {resource_type}")
-            return None
+        key_pattern = RESOURCE_ITEMS[resource_type][0]
+        items = [
+            item for item in host_catalog.items_by_key(key_pattern, host_id)
+            if item['status'] == 0
+        ]
         
-        # Busca o item correspondente
-        items = db_client.execute_query(
-            "SELECT itemid, name FROM items WHERE hostid = %s AND key_ LIKE %s AND status = 0",
-            (host_id, f"%{key_pattern}%")
-        )
+        if not items:
+            items = db_client.execute_query(
+                "SELECT itemid, name FROM items WHERE hostid = %s AND key_ LIKE %s AND status = 0",
+                (host_id, f"%{key_pattern}%")
+            )
         
         if not items:
             logger.error(f"Item não encontrado para o host {host_id} com padrão {key_pattern}")
             return None
             
         # Usa o primeiro item encontrado
-        item_id = items[0]['itemid']
-        item_name = items[0]['name']
+        return {'itemid': items[0]['itemid'], 'name': items[0]['name']}
+    
+    @staticmethod
+    def render(spec: Optional[Dict[str, Any]], image_format: str = 'png') -> Optional[bytes]:
+        """Renderiza a especificação no próprio processo
         
-        # Gera o gráfico de série temporal para o item
-        return self.generate_time_series_chart(
-            item_id=item_id,
-            title=f"{title} - {item_name}",
-            time_from=time_from,
-            width=width,
-            height=height
+        Args:
+            spec: Especificação do gráfico (ex: time_series_spec)
+            image_format: Formato da imagem ('png' ou 'svg')
+            
+        Returns:
+            Bytes da imagem ou None se não houver especificação
+        """
+        if spec is None:
+            return None
+        return render_chart({**spec, "format": image_format})
+    
+    @staticmethod
+    async def render_async(spec: Optional[Dict[str, Any]], image_format: str = 'png') -> Optional[bytes]:
+        """Renderiza a especificação no pool de processos (ver render)"""
+        if spec is None:
+            return None
+        return await chart_renderer.render({**spec, "format": image_format})
+    
+    @staticmethod
+    def chart_data(spec: Dict[str, Any], max_points: int = DEFAULT_MAX_POINTS) -> Dict[str, Any]:
+        """Dados da especificação para o navegador desenhar o gráfico
+        
+        As séries temporais são reduzidas com LTTB para no máximo `max_points`
+        pontos e os timestamps convertidos para milissegundos.
+        
+        Args:
+            spec: Especificação do gráfico
+            max_points: Quantidade máxima de pontos por série (0 desativa a redução)
+            
+        Returns:
+            Dicionário com tipo, título e séries (ou rótulos e valores)
+        """
+        if spec["kind"] not in ("time_series", "comparison"):
+            return {key: spec.get(key) for key in ("kind", "title", "labels", "values")}
+        
+        if spec["kind"] == "time_series":
+            source = [{"label": spec["title"], "timestamps": spec["timestamps"], "values": spec["values"]}]
+        else:
+            source = spec["series"]
+        
+        series = []
+        for entry in source:
+            clocks = np.asarray(entry["timestamps"], dtype=np.int64)
+            values = np.asarray(entry["values"], dtype=np.float64)
+            original_points = len(values)
+            
+            if max_points and original_points > max_points:
+                clocks, values = lttb(clocks, values, max_points)
+            
+            series.append({
+                "label": entry["label"],
+                "timestamps": (clocks * 1000).tolist(),  # Milissegundos para JS
+                "values": values.tolist(),
+                "original_points": original_points
+            })
+        
+        return {
+            "kind": spec["kind"],
+            "title": spec.get("title"),
+            "ylabel": spec.get("ylabel"),
+            "series": series
+        }
+    
+    # Codificação em base64: mantida apenas por compatibilidade com os clientes
+    # que recebem a imagem dentro do JSON (prefira render/render_async ou as rotas /charts)
+    
+    @staticmethod
+    def _render_base64(spec: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Renderiza a especificação no próprio processo e codifica em base64"""
+        if spec is None:
+            return None
+        return base64.b64encode(render_chart(spec)).decode('utf-8')
+    
+    @staticmethod
+    async def _render_base64_async(spec: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Renderiza a especificação no pool de processos e codifica em base64"""
+        if spec is None:
+            return None
+        return base64.b64encode(await chart_renderer.render(spec)).decode('utf-8')
+    
+    # Versões assíncronas: dados buscados em uma thread, renderização no pool
+    
+    async def generate_time_series_chart_async(self, item_id: int, **kwargs: Any) -> Optional[str]:
+        """Versão assíncrona de generate_time_series_chart"""
+        spec = await asyncio.to_thread(self.time_series_spec, item_id, **kwargs)
+        return await self._render_base64_async(spec)
+    
+    async def generate_comparison_chart_async(self, item_ids: List[int], **kwargs: Any) -> Optional[str]:
+        """Versão assíncrona de generate_comparison_chart"""
+        spec = await asyncio.to_thread(self.comparison_spec, item_ids, **kwargs)
+        return await self._render_base64_async(spec)
+    
+    async def generate_resource_usage_chart_async(self, **kwargs: Any) -> Optional[str]:
+        """Versão assíncrona de generate_resource_usage_chart"""
+        spec = await asyncio.to_thread(self.resource_usage_spec, **kwargs)
+        return await self._render_base64_async(spec)
+    
+    async def render_many_async(self, specs: List[Optional[Dict[str, Any]]]) -> List[Optional[str]]:
+        """Renderiza várias especificações em paralelo nos processos do pool
+        
+        Args:
+            specs: Especificações (None é mantido como None na saída)
+            
+        Returns:
+            Imagens em base64, na mesma ordem
+        """
+        return list(await asyncio.gather(*(self._render_base64_async(spec) for spec in specs)))
+    
+    # Gráficos renderizados com cache endereçado pelo conteúdo
+    
+    async def _cached_render(
+        self,
+        key_parts: Dict[str, Any],
+        build_spec: Callable[[], Optional[Dict[str, Any]]],
+        image_format: str,
+        max_points: Optional[int] = None
+    ) -> Optional[CachedChart]:
+        """Busca o gráfico no cache ou monta a especificação e o renderiza
+        
+        No formato 'json' não há renderização: são armazenados os dados das
+        séries (ver chart_data).
+        """
+        if max_points is None:
+            max_points = DEFAULT_MAX_POINTS
+        if image_format == 'json':
+            key = chart_key(format=image_format, max_points=max_points, **key_parts)
+        else:
+            key = chart_key(style=CHART_STYLE, format=image_format, **key_parts)
+        
+        async def render() -> Optional[bytes]:
+            spec = await asyncio.to_thread(build_spec)
+            if spec is None:
+                return None
+            if image_format == 'json':
+                return json.dumps(self.chart_data(spec, max_points)).encode('utf-8')
+            return await self.render_async(spec, image_format)
+        
+        return await chart_cache.get_or_render(key, render, MEDIA_TYPES[image_format])
+    
+    async def resource_usage_chart_cached(
+        self,
+        host_id: Optional[int] = None,
+        host_name: Optional[str] = None,
+        resource_type: str = 'cpu',
+        time_period: str = '24h',
+        width: int = 10,
+        height: int = 6,
+        image_format: str = 'png',
+        max_points: Optional[int] = None
+    ) -> Optional[CachedChart]:
+        """Gráfico de uso de recursos servido pelo cache
+        
+        A janela termina no início do intervalo atual do cache
+        (CHART_CACHE_BUCKET), de modo que visualizações repetidas dentro do
+        intervalo não consultam o banco nem renderizam novamente.
+        
+        Args:
+            Os mesmos de generate_resource_usage_chart
+            image_format: Formato da resposta ('png', 'svg' ou 'json')
+            max_points: Pontos por série no formato 'json' (padrão: DEFAULT_MAX_POINTS)
+            
+        Returns:
+            Gráfico com bytes, tipo de conteúdo e ETag, ou None se não houver dados
+        """
+        if time_period not in TIME_PERIODS:
+            logger.error(f"Período de tempo inválido: {time_period}")
+            return None
+        
+        item = await asyncio.to_thread(self.resource_item, host_id, host_name, resource_type)
+        if not item:
+            return None
+        
+        _, time_till = snap_window(0, int(time()), settings.chart_cache_bucket)
+        key_parts = {
+            "kind": "resource_usage",
+            "title": RESOURCE_ITEMS[resource_type][1],
+            "item_ids": [str(item['itemid'])],
+            "time_period": time_period,
+            "time_till": time_till,
+            "width": width,
+            "height": height
+        }
+        
+        return await self._cached_render(
+            key_parts,
+            lambda: self.resource_usage_spec(
+                host_id=host_id,
+                host_name=host_name,
+                resource_type=resource_type,
+                time_period=time_period,
+                width=width,
+                height=height,
+                time_till=time_till
+            ),
+            image_format,
+            max_points
         )
+    
+    async def items_chart_cached(
+        self,
+        item_ids: List[int],
+        time_from: Optional[int] = None,
+        time_till: Optional[int] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        image_format: str = 'png',
+        max_points: Optional[int] = None
+    ) -> Optional[CachedChart]:
+        """Gráfico de um item (série temporal) ou de vários (comparação) servido pelo cache
+        
+        Args:
+            item_ids: IDs dos itens do Zabbix
+            time_from: Timestamp inicial (padrão: 24h antes do fim)
+            time_till: Timestamp final (padrão: agora)
+            width: Largura do gráfico em polegadas
+            height: Altura do gráfico em polegadas
+            image_format: Formato da resposta ('png', 'svg' ou 'json')
+            max_points: Pontos por série no formato 'json' (padrão: DEFAULT_MAX_POINTS)
+            
+        Returns:
+            Gráfico com bytes, tipo de conteúdo e ETag, ou None se não houver dados
+        """
+        if not item_ids:
+            logger.error("Nenhum item especificado para o gráfico")
+            return None
+        
+        time_till = time_till if time_till is not None else int(time())
+        time_from = time_from if time_from is not None else time_till - TIME_PERIODS['24h']
+        time_from, time_till = snap_window(time_from, time_till, settings.chart_cache_bucket)
+        
+        comparison = len(item_ids) > 1
+        width = width or (12 if comparison else 10)
+        height = height or (8 if comparison else 6)
+        key_parts = {
+            "kind": "comparison" if comparison else "time_series",
+            "item_ids": [str(item_id) for item_id in item_ids],
+            "time_from": time_from,
+            "time_till": time_till,
+            "width": width,
+            "height": height
+        }
+        
+        if comparison:
+            build_spec = lambda: self.comparison_spec(
+                item_ids, time_from=time_from, time_till=time_till, width=width, height=height
+            )
+        else:
+            build_spec = lambda: self.time_series_spec(
+                item_ids[0], time_from=time_from, time_till=time_till, width=width, height=height
+            )
+        
+        return await self._cached_render(key_parts, build_spec, image_format, max_points)
 
 # Instância global do gerador de gráficos
 chart_generator = ZabbixChartGenerator() 
\ No newline at end of file
@@ -162,11 +162,32 @@ class Settings(BaseSettings):
     db_user: str = os.getenv("DB_USER", "zabbix")
     db_password: str = os.getenv("DB_PASSWORD", "zabbix")
     db_name: str = os.getenv("DB_NAME", "zabbix")
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    
+    # Limite de linhas das consultas SQL geradas a partir de linguagem natural
+    query_row_limit: int = int(os.getenv("QUERY_ROW_LIMIT", "1000"))
     
     # Configurações de cache
     use_cache: bool = os.getenv("USE_CACHE", "True").lower() == "true"
     cache_ttl: int = int(os.getenv("CACHE_TTL", "300"))  # 5 minutos
     
+    # Configurações do catálogo de hosts/itens
+    catalog_refresh_interval: int = int(os.getenv("CATALOG_REFRESH_INTERVAL", "300"))  # 5 minutos
+    catalog_full_refresh_interval: int = int(os.getenv("CATALOG_FULL_REFRESH_INTERVAL", "3600"))  # 1 hora
+    
+    # Configurações do snapshot do dashboard
+    redis_url: Optional[str] = os.getenv("REDIS_URL")
+    dashboard_snapshot_interval: int = int(os.getenv("DASHBOARD_SNAPSHOT_INTERVAL", "60"))  # 1 minuto
+    dashboard_min_force_interval: int = int(os.getenv("DASHBOARD_MIN_FORCE_INTERVAL", "10"))
+    
+    # Processos de renderização de gráficos (0 = núcleos disponíveis, até 4)
+    chart_render_workers: int = int(os.getenv("CHART_RENDER_WORKERS", "0"))
+    
+    # Cache de gráficos renderizados
+    chart_cache_max_bytes: int = int(os.getenv("CHART_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64 MB
+    chart_cache_ttl: int = int(os.getenv("CHART_CACHE_TTL", "300"))  # 5 minutos (Redis)
+    chart_cache_bucket: int = int(os.getenv("CHART_CACHE_BUCKET", "60"))  # Alinhamento das janelas de tempo
+    
     # Configurações de log
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     
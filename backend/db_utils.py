@@ -1,12 +1,22 @@
 import logging
-import mysql.connector
+import threading
 from typing import List, Dict, Any, Optional, Union, Tuple
 from contextlib import contextmanager
 
 from zabbia.backend.config import settings
+from zabbia.backend.services.catalog import host_catalog
 
 logger = logging.getLogger(__name__)
 
+# Tabela de histórico de cada tipo de valor de item
+HISTORY_TABLES = {
+    0: "history",         # float
+    1: "history_str",     # string
+    2: "history_log",     # log
+    3: "history_uint",    # unsigned integer
+    4: "history_text"     # text
+}
+
 class ZabbixDBClient:
     """Cliente para interação direta com o banco de dados do Zabbix
     
@@ -16,11 +26,12 @@ class ZabbixDBClient:
     
     def __init__(
         self,
-        host: str = settings.zabbix_db_host,
-        port: int = settings.zabbix_db_port,
-        user: str = settings.zabbix_db_user,
-        password: str = settings.zabbix_db_password,
-        database: str = settings.zabbix_db_name,
+        host: str = settings.db_host,
+        port: int = settings.db_port,
+        user: str = settings.db_user,
+        password: str = settings.db_password,
+        database: str = settings.db_name,
+        pool_size: int = settings.db_pool_size,
     ):
         """Inicializa o cliente de banco de dados
         
@@ -30,29 +41,53 @@ class ZabbixDBClient:
             user: Usuário do banco de dados
             password: Senha do banco de dados
             database: Nome do banco de dados
+            pool_size: Quantidade de conexões mantidas abertas no pool
         """
         self.host = host
         self.port = port
         self.user = user
         self.password = password
         self.database = database
+        self.pool_size = pool_size
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # O pool do mysql.connector não espera por conexões livres; o semáforo sim
+        self._pool_slots = threading.BoundedSemaphore(pool_size)
+
+    def _get_pool(self) -> 'mysql.connector.pooling.MySQLConnectionPool':
+        """Cria o pool de conexões na primeira utilização
+        
+        O driver também é importado aqui, e não na importação do módulo.
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                import mysql.connector.pooling
+                
+                self._pool = mysql.connector.pooling.MySQLConnectionPool(
+                    pool_name="zabbia",
+                    pool_size=self.pool_size,
+                    pool_reset_session=True,
+                    host=self.host,
+                    port=self.port,
+                    user=self.user,
+                    password=self.password,
+                    database=self.database
+                )
+            return self._pool
 
     @contextmanager
     def get_connection(self):
         """Gerenciador de contexto para conexão com o banco de dados
         
+        A conexão é obtida do pool e devolvida a ele ao final (close).
+        
         Yields:
             Conexão com o banco de dados do Zabbix
         """
         conn = None
+        self._pool_slots.acquire()
         try:
-            conn = mysql.connector.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                password=self.password,
-                database=self.database
-            )
+            conn = self._get_pool().get_connection()
             yield conn
         except Exception as e:
             logger.error(f"Erro ao conectar ao banco de dados: {e}")
@@ -60,6 +95,7 @@ class ZabbixDBClient:
         finally:
             if conn is not None:
                 conn.close()
+            self._pool_slots.release()
                 
     def execute_query(
         self, 
@@ -419,29 +455,24 @@ class ZabbixDBClient:
         """
         params = [item_id]
         
-        # Busca o tipo de valor do item
-        value_type_query = "SELECT value_type FROM items WHERE itemid = %s"
-        value_type_result = self.execute_query(value_type_query, (item_id,))
+        # Busca o tipo de valor do item (catálogo primeiro, banco como alternativa)
+        value_type = host_catalog.value_type(item_id)
         
-        if not value_type_result:
-            return []
+        if value_type is None:
+            value_type_query = "SELECT value_type FROM items WHERE itemid = %s"
+            value_type_result = self.execute_query(value_type_query, (item_id,))
             
-        value_type = value_type_result[0]['value_type']
+            if not value_type_result:
+                return []
+                
+            value_type = value_type_result[0]['value_type']
         
         # Seleciona a tabela correta com base no tipo de valor
-        history_tables = {
-            0: "history",         # float
-            1: "history_str",     # string
-            2: "history_log",     # log
-            3: "history_uint",    # unsigned integer
-            4: "history_text"     # text
-        }
-        
-        if value_type not in history_tables:
+        if value_type not in HISTORY_TABLES:
             logger.error(f"Tipo de valor desconhecido: {value_type}")
             return []
             
-        table_name = history_tables[value_type]
+        table_name = HISTORY_TABLES[value_type]
         
         query = f"""
         SELECT 
@@ -471,5 +502,105 @@ class ZabbixDBClient:
         
         return self.execute_query(query, params)
 
+    def get_items_info(self, item_ids: List[int]) -> Dict[str, Dict[str, Any]]:
+        """Obtém nome, unidade e tipo de valor de vários itens
+        
+        Os itens conhecidos pelo catálogo não são consultados; os demais são
+        buscados em uma única consulta.
+        
+        Args:
+            item_ids: IDs dos itens
+            
+        Returns:
+            Dicionário {itemid: {name, units, value_type}} apenas com os itens encontrados
+        """
+        result = {}
+        unknown = []
+        for item_id in item_ids:
+            item = host_catalog.item(item_id)
+            if item:
+                result[str(item_id)] = {
+                    'name': item['name'],
+                    'units': item['units'],
+                    'value_type': item['value_type']
+                }
+            else:
+                unknown.append(item_id)
+        
+        if unknown:
+            placeholders = ", ".join(["%s"] * len(unknown))
+            rows = self.execute_query(
+                f"SELECT itemid, name, units, value_type FROM items WHERE itemid IN ({placeholders})",
+                tuple(unknown)
+            )
+            for row in rows:
+                result[str(row['itemid'])] = {
+                    'name': row['name'],
+                    'units': row['units'],
+                    'value_type': int(row['value_type'])
+                }
+        
+        return result
+
+    def get_items_history(
+        self,
+        value_types: Dict[str, int],
+        time_from: Optional[int] = None,
+        time_till: Optional[int] = None,
+        limit: int = 1000
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Obtém o histórico de vários itens com uma consulta por tipo de valor
+        
+        Os itens de mesmo tipo são lidos da mesma tabela em uma única
+        consulta; cada item mantém o próprio limite de pontos (um SELECT com
+        LIMIT por item, unidos com UNION ALL, usando o índice itemid/clock).
+        
+        Args:
+            value_types: Dicionário {itemid: value_type} (ver get_items_info)
+            time_from: Timestamp inicial (opcional)
+            time_till: Timestamp final (opcional)
+            limit: Limite de pontos por item
+            
+        Returns:
+            Dicionário {itemid: histórico do mais recente ao mais antigo}
+        """
+        # Agrupa os itens por tipo de valor
+        items_by_type: Dict[int, List[str]] = {}
+        for item_id, value_type in value_types.items():
+            if value_type not in HISTORY_TABLES:
+                logger.error(f"Tipo de valor desconhecido: {value_type}")
+                continue
+            items_by_type.setdefault(value_type, []).append(str(item_id))
+        
+        conditions = ""
+        window: List[Any] = []
+        if time_from:
+            conditions += " AND clock >= %s"
+            window.append(time_from)
+        if time_till:
+            conditions += " AND clock <= %s"
+            window.append(time_till)
+        
+        result: Dict[str, List[Dict[str, Any]]] = {str(item_id): [] for item_id in value_types}
+        for value_type, type_item_ids in items_by_type.items():
+            table_name = HISTORY_TABLES[value_type]
+            selects = []
+            params: List[Any] = []
+            for item_id in type_item_ids:
+                selects.append(
+                    f"(SELECT itemid, clock, value, ns FROM {table_name} "
+                    f"WHERE itemid = %s{conditions} ORDER BY clock DESC LIMIT %s)"
+                )
+                params.extend([item_id, *window, limit])
+            
+            for row in self.execute_query("\nUNION ALL\n".join(selects), params):
+                result[str(row['itemid'])].append(row)
+        
+        # Cada SELECT já vem ordenado; a união não garante a ordem entre eles
+        for rows in result.values():
+            rows.sort(key=lambda row: row['clock'], reverse=True)
+        
+        return result
+
 # Instância global do cliente de banco de dados
 db_client = ZabbixDBClient() 
\ No newline at end of file
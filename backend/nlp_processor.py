@@ -1,11 +1,25 @@
+import os
 import logging
 import re
 import json
-from typing import Dict, List, Any, Optional, Union, Tuple
+import copy
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable
 from datetime import datetime, timedelta
 
+from zabbia.backend.services.catalog import host_catalog
+from zabbia.backend.utils.host_resolver import HostResolver
+
 logger = logging.getLogger(__name__)
 
+# Quantidade máxima de consultas distintas mantidas em cada cache (0 desativa)
+NLP_CACHE_SIZE = int(os.getenv("NLP_CACHE_SIZE", "1024"))
+
+# Quantidade máxima de hosts resolvidos a partir de uma menção
+MAX_RESOLVED_HOSTS = 50
+
 class QueryIntent:
     """Representa a intenção identificada em uma consulta"""
     HIGH_CPU = "high_cpu"
@@ -72,6 +86,106 @@ class TimeRange:
         from_timestamp = int((now - delta).timestamp())
         return cls(from_timestamp, to_timestamp, period_str)
 
+@dataclass
+class ParsedQuery:
+    """Resultado da análise de uma consulta, calculado uma única vez por requisição
+    
+    Os valores de threshold e duração ficam como None quando não aparecem na
+    consulta, para que cada uso aplique o seu próprio padrão. host_ids traz os
+    IDs do host mencionado: o host de nome idêntico (exact_host) ou todos os
+    hosts cujo nome contém a menção; vazio se não resolvido.
+    """
+    text: str
+    normalized: str
+    intent: str
+    host: Optional[str] = None
+    threshold: Optional[int] = None
+    duration_minutes: Optional[int] = None
+    time_range: TimeRange = field(default_factory=lambda: TimeRange.from_period("24h"))
+    host_ids: List[str] = field(default_factory=list)
+    exact_host: bool = False
+    
+    def threshold_or(self, default: int) -> int:
+        """Retorna o threshold da consulta ou o padrão informado"""
+        return self.threshold if self.threshold is not None else default
+    
+    def duration_or(self, default: int) -> int:
+        """Retorna a duração da consulta (minutos) ou o padrão informado"""
+        return self.duration_minutes if self.duration_minutes is not None else default
+
+QueryInput = Union[str, ParsedQuery]
+
+def normalize_query(query: str) -> str:
+    """Normaliza o texto da consulta para uso como chave de cache"""
+    return " ".join(query.lower().split())
+
+class QueryCache:
+    """Cache LRU limitado, indexado pelo texto normalizado da consulta
+    
+    Guarda apenas valores independentes do horário da requisição; quem usa o
+    cache é responsável por recalcular os parâmetros de tempo a cada acesso.
+    """
+    
+    def __init__(self, maxsize: int = NLP_CACHE_SIZE):
+        """Inicializa o cache
+        
+        Args:
+            maxsize: Quantidade máxima de entradas (0 desativa o cache)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_create(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Retorna o valor em cache para a chave ou o calcula com factory
+        
+        Args:
+            key: Texto normalizado da consulta
+            factory: Função que calcula o valor quando ausente
+            
+        Returns:
+            Valor armazenado para a chave
+        """
+        if self.maxsize <= 0:
+            return factory()
+        
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        
+        value = factory()
+        
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+    
+    def clear(self) -> None:
+        """Remove todas as entradas e zera as estatísticas"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Retorna tamanho, acertos, faltas e taxa de acerto do cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
 class NLPProcessor:
     """Processador de linguagem natural para o Zabbia
     
@@ -80,8 +194,16 @@ class NLPProcessor:
     no Zabbix.
     """
     
-    def __init__(self):
-        """Inicializa o processador de linguagem natural"""
+    def __init__(self, cache_size: int = NLP_CACHE_SIZE, host_resolver: Optional[HostResolver] = None):
+        """Inicializa o processador de linguagem natural
+        
+        Args:
+            cache_size: Consultas distintas mantidas nos caches de análise,
+                        SQL e chamadas de API (0 desativa)
+            host_resolver: Resolvedor de nomes de hosts para IDs (opcional)
+        """
+        self.host_resolver = host_resolver
+        
         # Padrões regex para identificação de intenções
         self.intent_patterns = {
             QueryIntent.HIGH_CPU: [
@@ -135,134 +257,270 @@ class NLPProcessor:
         self.threshold_pattern = r"(?:acima|maior|superior|mais)[:\s]+(?:de|que)?[:\s]*(\d+)[%\s]"
         self.period_pattern = r"(?:últim(?:as?|os?))[:\s]+(\d+)[:\s]*(minutos?|horas?|dias?|m|h|d)"
         self.duration_pattern = r"(?:por|durante)[:\s]+(\d+)[:\s]*(minutos?|horas?|dias?|m|h|d)"
+        
+        self._compile_patterns()
+        
+        # Caches LRU indexados pelo texto normalizado da consulta
+        self.parse_cache = QueryCache(cache_size)
+        self.sql_cache = QueryCache(cache_size)
+        self.api_cache = QueryCache(cache_size)
+    
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna as estatísticas dos caches de análise, SQL e API"""
+        return {
+            "parse": self.parse_cache.stats(),
+            "sql": self.sql_cache.stats(),
+            "api": self.api_cache.stats()
+        }
+    
+    def clear_caches(self) -> None:
+        """Esvazia os caches (ex: após alterar os padrões de intenção)"""
+        self.parse_cache.clear()
+        self.sql_cache.clear()
+        self.api_cache.clear()
+    
+    def _compile_patterns(self) -> None:
+        """Pré-compila os padrões de intenção e de extração de parâmetros
+        
+        Todas as intenções formam uma única alternância ancorada no início do
+        texto. Cada ramo é um lookahead que procura os padrões da intenção em
+        qualquer posição, seguido de um grupo nomeado vazio; os ramos são
+        tentados na ordem de `intent_patterns`, preservando a prioridade original,
+        e `match.lastgroup` indica a intenção encontrada.
+        """
+        branches = [
+            f"(?=[\\s\\S]*?(?:{'|'.join(patterns)}))(?P<{intent}>)"
+            for intent, patterns in self.intent_patterns.items()
+        ]
+        self._intent_regex = re.compile("^(?:" + "|".join(branches) + ")")
+        
+        self._host_regex = re.compile(self.host_pattern)
+        self._threshold_regex = re.compile(self.threshold_pattern)
+        self._period_regex = re.compile(self.period_pattern)
+        self._duration_regex = re.compile(self.duration_pattern)
+    
+    def parse(self, query: QueryInput) -> ParsedQuery:
+        """Analisa a consulta uma única vez
+        
+        Args:
+            query: Consulta em linguagem natural (ou já analisada)
+            
+        Returns:
+            Objeto ParsedQuery com intenção, host, threshold, duração e período
+        """
+        if isinstance(query, ParsedQuery):
+            return query
+        
+        cached = self.parse_cache.get_or_create(normalize_query(query), lambda: self._parse(query))
+        
+        # O período é guardado no cache; o intervalo é recalculado a partir de agora.
+        # Os IDs dos hosts também são resolvidos a cada acesso (o catálogo muda)
+        host_ids, exact_host = self._resolve_host_ids(cached.host)
+        parsed = replace(
+            cached,
+            text=query,
+            time_range=TimeRange.from_period(cached.time_range.time_period),
+            host_ids=host_ids,
+            exact_host=exact_host
+        )
+        logger.debug(f"Intent detectada: {parsed.intent} para query '{query}'")
+        return parsed
+    
+    def _parse(self, query: str) -> ParsedQuery:
+        normalized = query.lower()
+        return ParsedQuery(
+            text=query,
+            normalized=normalized,
+            intent=self._match_intent(normalized),
+            host=self._match_host(normalized),
+            threshold=self._match_threshold(normalized),
+            duration_minutes=self._match_duration(normalized),
+            time_range=self._match_time_range(normalized)
+        )
+    
+    def _resolve_host_ids(self, host: Optional[str]) -> Tuple[List[str], bool]:
+        """IDs do host mencionado e se vieram de um nome idêntico
+
+        Nunca usa a correspondência aproximada: um nome parecido (ex: 'db03'
+        e db01) traria dados de outro host. Sem resolução, os filtros usam LIKE.
+        """
+        if not host or self.host_resolver is None:
+            return [], False
+        exact = self.host_resolver.exact_ids(host)
+        if exact:
+            return exact, True
+        return self.host_resolver.containing_ids(host, MAX_RESOLVED_HOSTS), False
+    
+    def _match_intent(self, normalized: str) -> str:
+        match = self._intent_regex.match(normalized)
+        if match:
+            return match.lastgroup
+        return QueryIntent.GENERAL_QUERY
+    
+    def _match_host(self, normalized: str) -> Optional[str]:
+        match = self._host_regex.search(normalized)
+        return match.group(1) if match else None
+    
+    def _match_threshold(self, normalized: str) -> Optional[int]:
+        match = self._threshold_regex.search(normalized)
+        return int(match.group(1)) if match else None
+    
+    def _match_time_range(self, normalized: str) -> TimeRange:
+        period_match = self._period_regex.search(normalized)
+        if period_match:
+            value = int(period_match.group(1))
+            unit = period_match.group(2)[0].lower()  # Pegar primeira letra (m, h, d)
+            
+            if unit == 'm' or unit.startswith('m'):
+                return TimeRange.from_period(f"{value}m")
+            elif unit == 'h' or unit.startswith('h'):
+                return TimeRange.from_period(f"{value}h")
+            elif unit == 'd' or unit.startswith('d'):
+                return TimeRange.from_period(f"{value}d")
+        
+        # Padrão: últimas 24 horas
+        return TimeRange.from_period("24h")
     
-    def detect_intent(self, query: str) -> str:
+    def _match_duration(self, normalized: str) -> Optional[int]:
+        match = self._duration_regex.search(normalized)
+        if match:
+            value = int(match.group(1))
+            unit = match.group(2)[0].lower()
+            
+            if unit == 'm' or unit.startswith('m'):
+                return value
+            elif unit == 'h' or unit.startswith('h'):
+                return value * 60
+            elif unit == 'd' or unit.startswith('d'):
+                return value * 60 * 24
+        
+        return None
+    
+    def detect_intent(self, query: QueryInput) -> str:
         """Detecta a intenção da consulta
         
         Args:
-            query: Consulta em linguagem natural
+            query: Consulta em linguagem natural (ou já analisada)
             
         Returns:
             Intenção da consulta (um dos valores de QueryIntent)
         """
-        # Normalizar consulta (remover acentos, converter para minúsculas)
-        normalized_query = query.lower()
-        
-        # Verificar cada padrão de intenção
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, normalized_query):
-                    logger.debug(f"Intent detectada: {intent} para query '{query}'")
-                    return intent
-        
-        # Se não encontrou uma intenção específica
-        logger.debug(f"Intent não encontrada para query '{query}', usando general_query")
-        return QueryIntent.GENERAL_QUERY
+        if isinstance(query, ParsedQuery):
+            return query.intent
+        return self._match_intent(query.lower())
     
-    def extract_host(self, query: str) -> Optional[str]:
+    def extract_host(self, query: QueryInput) -> Optional[str]:
         """Extrai o nome do host da consulta
         
         Args:
-            query: Consulta em linguagem natural
+            query: Consulta em linguagem natural (ou já analisada)
             
         Returns:
             Nome do host ou None se não encontrado
         """
-        match = re.search(self.host_pattern, query.lower())
-        if match:
-            return match.group(1)
-        return None
+        if isinstance(query, ParsedQuery):
+            return query.host
+        return self._match_host(query.lower())
     
-    def extract_threshold(self, query: str, default: int = 80) -> int:
+    def extract_threshold(self, query: QueryInput, default: int = 80) -> int:
         """Extrai o valor de threshold da consulta
         
         Args:
-            query: Consulta em linguagem natural
+            query: Consulta em linguagem natural (ou já analisada)
             default: Valor padrão se não encontrado
             
         Returns:
             Valor do threshold
         """
-        match = re.search(self.threshold_pattern, query.lower())
-        if match:
-            return int(match.group(1))
-        return default
+        if isinstance(query, ParsedQuery):
+            return query.threshold_or(default)
+        threshold = self._match_threshold(query.lower())
+        return threshold if threshold is not None else default
     
-    def extract_time_range(self, query: str) -> TimeRange:
+    def extract_time_range(self, query: QueryInput) -> TimeRange:
         """Extrai o intervalo de tempo da consulta
         
         Args:
-            query: Consulta em linguagem natural
+            query: Consulta em linguagem natural (ou já analisada)
             
         Returns:
             Objeto TimeRange
         """
-        # Verificar período (últimas X horas, etc.)
-        period_match = re.search(self.period_pattern, query.lower())
-        if period_match:
-            value = int(period_match.group(1))
-            unit = period_match.group(2)[0].lower()  # Pegar primeira letra (m, h, d)
-            
-            if unit == 'm' or unit.startswith('m'):
-                return TimeRange.from_period(f"{value}m")
-            elif unit == 'h' or unit.startswith('h'):
-                return TimeRange.from_period(f"{value}h")
-            elif unit == 'd' or unit.startswith('d'):
-                return TimeRange.from_period(f"{value}d")
-        
-        # Padrão: últimas 24 horas
-        return TimeRange.from_period("24h")
+        if isinstance(query, ParsedQuery):
+            return query.time_range
+        return self._match_time_range(query.lower())
     
-    def extract_duration(self, query: str, default: int = 60) -> int:
+    def extract_duration(self, query: QueryInput, default: int = 60) -> int:
         """Extrai a duração em minutos da consulta
         
         Args:
-            query: Consulta em linguagem natural
+            query: Consulta em linguagem natural (ou já analisada)
             default: Valor padrão em minutos se não encontrado
             
         Returns:
             Duração em minutos
         """
-        match = re.search(self.duration_pattern, query.lower())
-        if match:
-            value = int(match.group(1))
-            unit = match.group(2)[0].lower()
-            
-            if unit == 'm' or unit.startswith('m'):
-                return value
-            elif unit == 'h' or unit.startswith('h'):
-                return value * 60
-            elif unit == 'd' or unit.startswith('d'):
-                return value * 60 * 24
-        
-        return default
+        if isinstance(query, ParsedQuery):
+            return query.duration_or(default)
+        duration = self._match_duration(query.lower())
+        return duration if duration is not None else default
     
-    def generate_sql(self, query: str) -> Tuple[str, Dict[str, Any]]:
+    def generate_sql(self, query: QueryInput) -> Tuple[str, Dict[str, Any]]:
         """Gera uma consulta SQL a partir da consulta em linguagem natural
         
         Args:
-            query: Consulta em linguagem natural
+            query: Consulta em linguagem natural (ou já analisada com parse)
             
         Returns:
             Tupla com (consulta SQL, parâmetros de contexto)
         """
-        intent = self.detect_intent(query)
+        parsed = self.parse(query)
+        # O modelo depende da quantidade de hosts resolvidos (placeholders do IN)
+        sql, template = self.sql_cache.get_or_create(
+            f"{normalize_query(parsed.normalized)}#{len(parsed.host_ids)}",
+            lambda: self._build_sql(parsed)
+        )
+        
+        # Apenas os parâmetros dependentes do horário e dos hosts são recalculados
+        context = dict(template)
+        context["query"] = parsed.text
+        context["time_range"] = parsed.time_range
+        context["from_time"] = parsed.time_range.from_timestamp
+        context["to_time"] = parsed.time_range.to_timestamp
+        if parsed.host_ids:
+            context["host_ids"] = list(parsed.host_ids)
+            for index, host_id in enumerate(parsed.host_ids):
+                context[f"host_id_{index}"] = host_id
+        return sql, context
+    
+    def _host_filter(self, parsed: ParsedQuery, context: Dict[str, Any]) -> str:
+        """Condição SQL para o host mencionado
+        
+        Usa os IDs resolvidos (h.hostid IN (...), atendido pela chave primária)
+        e recorre ao LIKE apenas quando o nome não pôde ser resolvido.
+        """
+        if parsed.host_ids:
+            placeholders = ", ".join(f":host_id_{index}" for index in range(len(parsed.host_ids)))
+            return f"h.hostid IN ({placeholders})"
+        
+        context["host_pattern"] = f"%{parsed.host}%"
+        return "h.name LIKE :host_pattern"
+    
+    def _build_sql(self, parsed: ParsedQuery) -> Tuple[str, Dict[str, Any]]:
+        """Monta o SQL e os parâmetros independentes do horário da consulta"""
+        intent = parsed.intent
         context = {
-            "intent": intent,
-            "query": query
+            "intent": intent
         }
         
         # Extrair parâmetros comuns
-        host = self.extract_host(query)
+        host = parsed.host
         if host:
             context["host"] = host
         
-        time_range = self.extract_time_range(query)
-        context["time_range"] = time_range
-        
         # Gerar SQL baseado na intenção
         if intent == QueryIntent.HIGH_CPU:
-            threshold = self.extract_threshold(query, 80)
+            threshold = parsed.threshold_or(80)
             context["threshold"] = threshold
             
             sql = """
@@ -278,8 +536,7 @@ class NLPProcessor:
             """
             
             if host:
-                sql += " AND h.name LIKE :host_pattern"
-                context["host_pattern"] = f"%{host}%"
+                sql += " AND " + self._host_filter(parsed, context)
             
             sql += """
             GROUP BY h.hostid, h.name
@@ -288,7 +545,7 @@ class NLPProcessor:
             """
             
         elif intent == QueryIntent.MEMORY_USAGE:
-            threshold = self.extract_threshold(query, 80)
+            threshold = parsed.threshold_or(80)
             context["threshold"] = threshold
             
             sql = """
@@ -309,8 +566,7 @@ class NLPProcessor:
             """
             
             if host:
-                sql += " AND h.name LIKE :host_pattern"
-                context["host_pattern"] = f"%{host}%"
+                sql += " AND " + self._host_filter(parsed, context)
             
             sql += """
             GROUP BY h.hostid, h.name
@@ -337,8 +593,7 @@ class NLPProcessor:
             """
             
             if host:
-                sql += " WHERE h.name LIKE :host_pattern"
-                context["host_pattern"] = f"%{host}%"
+                sql += " WHERE " + self._host_filter(parsed, context)
             
             sql += " ORDER BY h.name;"
             
@@ -356,8 +611,7 @@ class NLPProcessor:
             """
             
             if host:
-                sql += " AND h.name LIKE :host_pattern"
-                context["host_pattern"] = f"%{host}%"
+                sql += " AND " + self._host_filter(parsed, context)
             
             sql += " ORDER BY h.name;"
         
@@ -378,8 +632,7 @@ class NLPProcessor:
             """
             
             if host:
-                sql += " AND h.name LIKE :host_pattern"
-                context["host_pattern"] = f"%{host}%"
+                sql += " AND " + self._host_filter(parsed, context)
             
             sql += " ORDER BY t.lastchange DESC;"
         
@@ -403,8 +656,7 @@ class NLPProcessor:
             """
             
             if host:
-                sql += " AND h.name LIKE :host_pattern"
-                context["host_pattern"] = f"%{host}%"
+                sql += " AND " + self._host_filter(parsed, context)
             
             sql += " ORDER BY p.clock DESC;"
             
@@ -418,38 +670,56 @@ class NLPProcessor:
             """
             
             if host:
-                sql += " AND h.name LIKE :host_pattern"
-                context["host_pattern"] = f"%{host}%"
+                sql += " AND " + self._host_filter(parsed, context)
             
             sql += " ORDER BY h.name;"
         
         return sql, context
     
-    def generate_api_call(self, query: str) -> Tuple[str, Dict[str, Any]]:
+    def generate_api_call(self, query: QueryInput) -> Tuple[str, Dict[str, Any]]:
         """Gera uma chamada de API a partir da consulta em linguagem natural
         
         Args:
-            query: Consulta em linguagem natural
+            query: Consulta em linguagem natural (ou já analisada com parse)
             
         Returns:
             Tupla com (método API, parâmetros)
         """
-        intent = self.detect_intent(query)
-        host = self.extract_host(query)
-        time_range = self.extract_time_range(query)
+        parsed = self.parse(query)
+        method, template = self.api_cache.get_or_create(
+            f"{normalize_query(parsed.normalized)}#{','.join(parsed.host_ids)}",
+            lambda: self._build_api_call(parsed)
+        )
+        
+        # Cópia para que o chamador possa alterar os parâmetros sem afetar o cache
+        params = copy.deepcopy(template)
+        
+        if method == "maintenance.create":
+            now = datetime.now()
+            params["active_since"] = int(now.timestamp())
+            params["active_till"] = int(now.timestamp() + params["timeperiods"][0]["period"])
+            params["description"] = f"Manutenção criada via Zabbia em {now.strftime('%Y-%m-%d %H:%M:%S')}"
+        
+        return method, params
+    
+    def _build_api_call(self, parsed: ParsedQuery) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Monta o método e os parâmetros independentes do horário da consulta"""
+        intent = parsed.intent
+        host = parsed.host
         
         method = None
         params = {}
         
         if intent == QueryIntent.HOST_MAINTENANCE:
             method = "maintenance.create"
-            host_ids = []  # Seria preenchido com IDs reais após busca
-            duration = self.extract_duration(query, 60)  # Minutos
+            # Apenas o host de nome idêntico: uma menção parcial poderia
+            # colocar outros hosts em manutenção
+            host_ids = list(parsed.host_ids) if parsed.exact_host else []
+            duration = parsed.duration_or(60)  # Minutos
             
+            # active_since, active_till e description são preenchidos em generate_api_call
             params = {
                 "name": f"Manutenção automática via Zabbia",
-                "active_since": int(datetime.now().timestamp()),
-                "active_till": int(datetime.now().timestamp() + duration * 60),
                 "hostids": host_ids,
                 "timeperiods": [
                     {
@@ -457,13 +727,12 @@ class NLPProcessor:
                         "period": duration * 60
                     }
                 ],
-                "description": f"Manutenção criada via Zabbia em {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
                 "maintenance_type": 0  # 0 = com coleta de dados, 1 = sem coleta
             }
             
         elif intent == QueryIntent.HIGH_CPU:
             method = "item.get"
-            threshold = self.extract_threshold(query, 80)
+            threshold = parsed.threshold_or(80)
             
             params = {
                 "output": ["itemid", "name", "lastvalue", "units"],
@@ -474,7 +743,9 @@ class NLPProcessor:
                 "monitored": True
             }
             
-            if host:
+            if parsed.host_ids:
+                params["hostids"] = list(parsed.host_ids)
+            elif host:
                 params["host"] = host
                 
         elif intent == QueryIntent.HOST_STATUS:
@@ -486,7 +757,9 @@ class NLPProcessor:
                 "selectGroups": "extend"
             }
             
-            if host:
+            if parsed.host_ids:
+                params["hostids"] = list(parsed.host_ids)
+            elif host:
                 params["search"] = {"name": host}
                 params["searchWildcardsEnabled"] = True
                 
@@ -501,23 +774,25 @@ class NLPProcessor:
                 "sortorder": "DESC"
             }
             
-            if host:
+            if parsed.host_ids:
+                params["hostids"] = list(parsed.host_ids)
+            elif host:
                 params["host"] = host
                 
         return method, params
     
-    def generate_graph_data(self, query: str) -> Dict[str, Any]:
+    def generate_graph_data(self, query: QueryInput) -> Dict[str, Any]:
         """Gera dados para um gráfico a partir da consulta em linguagem natural
         
         Args:
-            query: Consulta em linguagem natural
+            query: Consulta em linguagem natural (ou já analisada com parse)
             
         Returns:
             Dados para geração de gráfico (formato chartjs)
         """
-        intent = self.detect_intent(query)
-        host = self.extract_host(query)
-        time_range = self.extract_time_range(query)
+        parsed = self.parse(query)
+        host = parsed.host
+        normalized = parsed.normalized
         
         chart_data = {
             "chartType": "line",
@@ -528,7 +803,7 @@ class NLPProcessor:
         # Em uma implementação real, os dados seriam obtidos do banco
         # Aqui apenas retornamos a estrutura
         
-        if "cpu" in query.lower():
+        if "cpu" in normalized:
             chart_data["title"] = f"Uso de CPU" + (f" - {host}" if host else "")
             chart_data["datasets"].append({
                 "label": "CPU %",
@@ -537,7 +812,7 @@ class NLPProcessor:
                 "fill": False
             })
             
-        elif "memória" in query.lower() or "ram" in query.lower():
+        elif "memória" in normalized or "ram" in normalized:
             chart_data["title"] = f"Uso de Memória" + (f" - {host}" if host else "")
             chart_data["datasets"].append({
                 "label": "Memória %",
@@ -546,7 +821,7 @@ class NLPProcessor:
                 "fill": False
             })
             
-        elif "disco" in query.lower():
+        elif "disco" in normalized:
             chart_data["title"] = f"Uso de Disco" + (f" - {host}" if host else "")
             chart_data["datasets"].append({
                 "label": "Disco %",
@@ -557,5 +832,5 @@ class NLPProcessor:
             
         return chart_data
 
-# Criar instância global do processador
-nlp_processor = NLPProcessor() 
\ No newline at end of file
+# Criar instância global do processador (hosts resolvidos pelo catálogo)
+nlp_processor = NLPProcessor(host_resolver=HostResolver.from_catalog(host_catalog)) 
\ No newline at end of file
@@ -0,0 +1,188 @@
+import re
+import asyncio
+import logging
+import threading
+from decimal import Decimal
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+from zabbia.backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Placeholders nomeados (:nome), ignorando '::' e horários como '12:30'
+_NAMED_PARAM = re.compile(r"(?<![:\w]):([a-zA-Z_]\w*)")
+_LIMIT_CLAUSE = re.compile(r"\blimit\s+\d+\s*$", re.IGNORECASE)
+
+# Nome interno do parâmetro de limite acrescentado pelo executor
+LIMIT_PARAM = "__row_limit"
+
+class QueryExecutionError(Exception):
+    """Exceção para falhas ao executar um plano no banco do Zabbix"""
+    pass
+
+@dataclass(frozen=True)
+class CompiledPlan:
+    """SQL no formato do driver (%s) com a ordem fixa dos parâmetros"""
+    sql: str
+    param_names: Tuple[str, ...]
+
+    def bind(self, context: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Monta a tupla de parâmetros na ordem do SQL compilado
+
+        Args:
+            context: Parâmetros nomeados (ex: contexto de generate_sql)
+
+        Returns:
+            Tupla de valores posicionais
+        """
+        try:
+            return tuple(context[name] for name in self.param_names)
+        except KeyError as e:
+            raise QueryExecutionError(f"Parâmetro ausente na consulta: {e.args[0]}")
+
+def compile_plan(sql: str) -> CompiledPlan:
+    """Converte um SQL com placeholders nomeados no formato do driver
+
+    O ';' final é removido e, se o SQL não tiver LIMIT, é acrescentado um
+    LIMIT parametrizado (preenchido pelo executor).
+
+    Args:
+        sql: Consulta com placeholders :nome
+
+    Returns:
+        Plano compilado
+    """
+    param_names: List[str] = []
+
+    def replace(match: re.Match) -> str:
+        param_names.append(match.group(1))
+        return "%s"
+
+    compiled = _NAMED_PARAM.sub(replace, sql.strip().rstrip(";").rstrip())
+
+    if not _LIMIT_CLAUSE.search(compiled):
+        compiled += "\nLIMIT %s"
+        param_names.append(LIMIT_PARAM)
+
+    return CompiledPlan(compiled, tuple(param_names))
+
+def _to_python(value: Any) -> Any:
+    """Converte valores do driver em tipos serializáveis em JSON"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", errors="replace")
+    return value
+
+class QueryExecutor:
+    """Executa os SQL gerados pelo NLPProcessor no banco do Zabbix
+
+    Cada modelo de SQL é compilado uma única vez (placeholders nomeados para
+    %s, com ordem de parâmetros fixa) e executado em um cursor preparado de
+    uma conexão do pool. O número de linhas é limitado e os resultados são
+    lidos em lotes com fetchmany.
+    """
+
+    def __init__(self, db_client=None, row_limit: int = settings.query_row_limit, fetch_size: int = 200):
+        """Inicializa o executor
+
+        Args:
+            db_client: Cliente de banco com get_connection() (padrão: db_client de db_utils)
+            row_limit: Número máximo de linhas retornadas por consulta
+            fetch_size: Linhas lidas do servidor por lote
+        """
+        self._db_client = db_client
+        self.row_limit = row_limit
+        self.fetch_size = fetch_size
+        self._plans: Dict[str, CompiledPlan] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def db_client(self):
+        if self._db_client is None:
+            # Importado sob demanda: o driver MySQL só é necessário ao executar
+            from zabbia.backend.db_utils import db_client
+            self._db_client = db_client
+        return self._db_client
+
+    def plan(self, sql: str) -> CompiledPlan:
+        """Retorna o plano compilado do SQL, compilando-o na primeira vez"""
+        plan = self._plans.get(sql)
+        if plan is None:
+            with self._lock:
+                plan = self._plans.setdefault(sql, compile_plan(sql))
+        return plan
+
+    def stream(
+        self,
+        sql: str,
+        context: Dict[str, Any],
+        limit: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Executa o SQL e produz as linhas em lotes
+
+        Args:
+            sql: SQL com placeholders nomeados
+            context: Valores dos parâmetros nomeados
+            limit: Número máximo de linhas (padrão: row_limit)
+
+        Yields:
+            Listas de até fetch_size linhas (dicionários)
+        """
+        plan = self.plan(sql)
+        params = plan.bind({**context, LIMIT_PARAM: limit or self.row_limit})
+
+        try:
+            with self.db_client.get_connection() as conn:
+                cursor = conn.cursor(prepared=True)
+                try:
+                    cursor.execute(plan.sql, params)
+                    columns = [column[0] for column in cursor.description]
+                    while True:
+                        rows = cursor.fetchmany(self.fetch_size)
+                        if not rows:
+                            break
+                        yield [
+                            {column: _to_python(value) for column, value in zip(columns, row)}
+                            for row in rows
+                        ]
+                finally:
+                    cursor.close()
+        except QueryExecutionError:
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao executar consulta gerada: {e}")
+            logger.error(f"Query: {plan.sql}")
+            logger.error(f"Params: {params}")
+            raise QueryExecutionError(str(e)) from e
+
+    def execute(self, sql: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Executa o SQL e retorna as linhas até o limite configurado
+
+        Uma linha além do limite é solicitada apenas para indicar se o
+        resultado foi truncado.
+
+        Args:
+            sql: SQL com placeholders nomeados
+            context: Valores dos parâmetros nomeados
+
+        Returns:
+            Dicionário com rows, count e truncated
+        """
+        rows: List[Dict[str, Any]] = []
+        for batch in self.stream(sql, context, limit=self.row_limit + 1):
+            rows.extend(batch)
+
+        truncated = len(rows) > self.row_limit
+        if truncated:
+            rows = rows[:self.row_limit]
+
+        return {"rows": rows, "count": len(rows), "truncated": truncated}
+
+    async def execute_async(self, sql: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Versão assíncrona de execute (executada em uma thread)"""
+        return await asyncio.to_thread(self.execute, sql, context)
+
+# Instância global do executor
+query_executor = QueryExecutor()
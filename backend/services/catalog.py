@@ -0,0 +1,352 @@
+import time
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Callable, Iterable
+
+from ..config import settings
+from ..zabbix_projection import FieldProjection
+
+logger = logging.getLogger(__name__)
+
+# Campos mantidos no catálogo (metadados que raramente mudam)
+CATALOG_HOST_PROJECTION = FieldProjection(
+    "catalog_hosts",
+    ["hostid", "host", "name", "status"],
+    selectInterfaces=["ip"]
+)
+
+CATALOG_ITEM_PROJECTION = FieldProjection(
+    "catalog_items",
+    ["itemid", "hostid", "key_", "name", "units", "value_type", "status"]
+)
+
+Fetcher = Callable[[str, Dict[str, Any]], List[Dict[str, Any]]]
+HostListener = Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], None]
+
+def key_prefixes(key: str) -> List[str]:
+    """Gera os prefixos indexáveis de uma chave de item
+
+    A chave completa e cada prefixo da parte antes dos parâmetros, nos limites
+    de ponto, são indexados: 'vm.memory.size[pused]' gera 'vm.memory.size[pused]',
+    'vm.memory.size', 'vm.memory' e 'vm'.
+
+    Args:
+        key: Chave do item (key_)
+
+    Returns:
+        Lista de prefixos
+    """
+    base = key.split("[", 1)[0]
+    parts = base.split(".")
+    prefixes = [".".join(parts[:i]) for i in range(len(parts), 0, -1)]
+    if key != base:
+        prefixes.insert(0, key)
+    return prefixes
+
+class ZabbixCatalog:
+    """Catálogo em memória de hosts e itens do Zabbix
+
+    Mantém índices de hosts por nome e por ID e de itens por prefixo de chave,
+    por host e por ID (com value_type), atualizados incrementalmente em segundo
+    plano. Todas as consultas são buscas em dicionário.
+    """
+
+    def __init__(
+        self,
+        fetcher: Optional[Fetcher] = None,
+        refresh_interval: int = settings.catalog_refresh_interval,
+        full_refresh_interval: int = settings.catalog_full_refresh_interval
+    ):
+        """Inicializa o catálogo
+
+        Args:
+            fetcher: Função (método, parâmetros) -> resultado da API do Zabbix
+            refresh_interval: Intervalo em segundos da atualização incremental
+            full_refresh_interval: Intervalo em segundos da ressincronização completa dos itens
+        """
+        self._fetcher = fetcher
+        self.refresh_interval = refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+
+        self._lock = threading.RLock()
+        self._hosts_by_id: Dict[str, Dict[str, Any]] = {}
+        self._hosts_by_name: Dict[str, Dict[str, Any]] = {}
+        self._items_by_id: Dict[str, Dict[str, Any]] = {}
+        self._items_by_host: Dict[str, List[Dict[str, Any]]] = {}
+        self._items_by_prefix: Dict[str, List[Dict[str, Any]]] = {}
+        self._listeners: List[HostListener] = []
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.loaded = False
+        self.version = 0
+        self.last_refresh: Optional[float] = None
+        self.last_full_refresh: Optional[float] = None
+
+    @property
+    def is_bound(self) -> bool:
+        """Indica se o catálogo já possui uma fonte de dados"""
+        return self._fetcher is not None
+
+    def bind(self, fetcher: Fetcher) -> None:
+        """Define a fonte de dados do catálogo, se ainda não houver uma
+
+        Args:
+            fetcher: Função (método, parâmetros) -> resultado da API do Zabbix
+        """
+        if self._fetcher is None:
+            self._fetcher = fetcher
+
+    def add_listener(self, listener: HostListener) -> None:
+        """Registra uma função chamada quando hosts mudam
+
+        A função recebe (hosts adicionados ou alterados, hosts removidos).
+
+        Args:
+            listener: Função de notificação
+        """
+        self._listeners.append(listener)
+
+    # Consultas
+
+    def host_by_id(self, host_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna o host com o ID informado"""
+        return self._hosts_by_id.get(str(host_id))
+
+    def host_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """Retorna o host pelo nome técnico ou visível (sem diferenciar maiúsculas)"""
+        return self._hosts_by_name.get(name.lower())
+
+    def hosts(self) -> List[Dict[str, Any]]:
+        """Retorna todos os hosts do catálogo"""
+        with self._lock:
+            return list(self._hosts_by_id.values())
+
+    def item(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna o item com o ID informado"""
+        return self._items_by_id.get(str(item_id))
+
+    def value_type(self, item_id: str) -> Optional[int]:
+        """Retorna o value_type de um item ou None se desconhecido"""
+        item = self._items_by_id.get(str(item_id))
+        return item["value_type"] if item else None
+
+    def value_types(self, item_ids: Iterable[str]) -> Dict[str, int]:
+        """Retorna o value_type dos itens conhecidos pelo catálogo
+
+        Args:
+            item_ids: IDs dos itens
+
+        Returns:
+            Dicionário {itemid: value_type} apenas com os itens encontrados
+        """
+        result = {}
+        for item_id in item_ids:
+            item = self._items_by_id.get(str(item_id))
+            if item:
+                result[item["itemid"]] = item["value_type"]
+        return result
+
+    def items_by_key(self, key_prefix: str, host_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retorna os itens cuja chave começa com o prefixo informado
+
+        Args:
+            key_prefix: Chave completa ou prefixo em limite de ponto (ex: 'vm.memory')
+            host_id: Restringe a um host (opcional)
+
+        Returns:
+            Lista de itens
+        """
+        with self._lock:
+            items = self._items_by_prefix.get(key_prefix, [])
+            if host_id is None:
+                return list(items)
+            host_id = str(host_id)
+            return [item for item in items if item["hostid"] == host_id]
+
+    def items_containing(self, fragment: str) -> List[Dict[str, Any]]:
+        """Retorna os itens cuja chave contém o trecho informado (como LIKE '%trecho%')
+
+        Percorre os itens em memória; use items_by_key quando o prefixo basta.
+
+        Args:
+            fragment: Trecho da chave (ex: 'cpu.util')
+
+        Returns:
+            Lista de itens
+        """
+        with self._lock:
+            return [item for item in self._items_by_id.values() if fragment in item["key_"]]
+
+    def items_by_host(self, host_id: str) -> List[Dict[str, Any]]:
+        """Retorna os itens de um host"""
+        with self._lock:
+            return list(self._items_by_host.get(str(host_id), []))
+
+    # Atualização
+
+    def _fetch(self, method: str, projection: FieldProjection, **params: Any) -> List[Dict[str, Any]]:
+        request = projection.to_params()
+        request.update(params)
+        return self._fetcher(method, request) or []
+
+    @staticmethod
+    def _normalize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "itemid": str(item["itemid"]),
+            "hostid": str(item["hostid"]),
+            "key_": item.get("key_", ""),
+            "name": item.get("name", ""),
+            "units": item.get("units", ""),
+            "value_type": int(item.get("value_type", 0)),
+            "status": int(item.get("status", 0))
+        }
+
+    def _index_item(self, item: Dict[str, Any]) -> None:
+        self._items_by_id[item["itemid"]] = item
+        self._items_by_host.setdefault(item["hostid"], []).append(item)
+        for prefix in key_prefixes(item["key_"]):
+            self._items_by_prefix.setdefault(prefix, []).append(item)
+
+    def _unindex_host_items(self, host_id: str) -> None:
+        items = self._items_by_host.pop(host_id, [])
+        if not items:
+            return
+        item_ids = {item["itemid"] for item in items}
+        for item in items:
+            self._items_by_id.pop(item["itemid"], None)
+            for prefix in key_prefixes(item["key_"]):
+                bucket = self._items_by_prefix.get(prefix)
+                if bucket is None:
+                    continue
+                bucket[:] = [other for other in bucket if other["itemid"] not in item_ids]
+                if not bucket:
+                    del self._items_by_prefix[prefix]
+
+    def _rebuild_host_names(self) -> None:
+        by_name = {}
+        for host in self._hosts_by_id.values():
+            by_name[host["name"].lower()] = host
+            by_name.setdefault(host["host"].lower(), host)
+        self._hosts_by_name = by_name
+
+    def _load_items(self, host_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        params: Dict[str, Any] = {}
+        if host_ids is not None:
+            params["hostids"] = host_ids
+        return [self._normalize_item(item) for item in self._fetch("item.get", CATALOG_ITEM_PROJECTION, **params)]
+
+    def refresh(self, full: bool = False) -> None:
+        """Atualiza o catálogo
+
+        A atualização incremental busca apenas a lista leve de hosts e carrega
+        itens somente dos hosts novos. A ressincronização completa dos itens
+        ocorre quando `full` é True ou quando o intervalo completo expira.
+
+        Args:
+            full: Se True, recarrega todos os itens
+        """
+        if self._fetcher is None:
+            raise RuntimeError("Catálogo sem fonte de dados (use bind)")
+
+        now = time.time()
+        if not self.loaded or self.last_full_refresh is None or now - self.last_full_refresh >= self.full_refresh_interval:
+            full = True
+
+        hosts = {str(host["hostid"]): host for host in self._fetch("host.get", CATALOG_HOST_PROJECTION)}
+
+        with self._lock:
+            current = self._hosts_by_id
+            removed = [current[host_id] for host_id in current.keys() - hosts.keys()]
+            added_ids = [host_id for host_id in hosts.keys() - current.keys()]
+            changed = [
+                host for host_id, host in hosts.items()
+                if host_id in current and (
+                    current[host_id]["name"] != host["name"]
+                    or current[host_id]["host"] != host["host"]
+                    or current[host_id]["status"] != host["status"]
+                )
+            ]
+
+        # Buscar itens fora do lock para não bloquear consultas
+        if full:
+            items = self._load_items()
+        elif added_ids:
+            items = self._load_items(added_ids)
+        else:
+            items = []
+
+        with self._lock:
+            if full:
+                self._items_by_id = {}
+                self._items_by_host = {}
+                self._items_by_prefix = {}
+            else:
+                for host in removed:
+                    self._unindex_host_items(str(host["hostid"]))
+
+            for item in items:
+                if item["hostid"] in hosts:
+                    self._index_item(item)
+
+            self._hosts_by_id = hosts
+            self._rebuild_host_names()
+
+            self.loaded = True
+            self.last_refresh = now
+            if full:
+                self.last_full_refresh = now
+            if removed or added_ids or changed:
+                self.version += 1
+
+        updated = [hosts[host_id] for host_id in added_ids] + changed
+        if updated or removed:
+            logger.info(f"Catálogo atualizado: {len(added_ids)} hosts novos, {len(changed)} alterados, {len(removed)} removidos")
+            for listener in self._listeners:
+                try:
+                    listener(updated, removed)
+                except Exception as e:
+                    logger.error(f"Erro ao notificar alteração do catálogo: {e}")
+
+    def ensure_loaded(self) -> bool:
+        """Carrega o catálogo na primeira utilização, se houver fonte de dados
+
+        Returns:
+            True se o catálogo está carregado
+        """
+        if self.loaded:
+            return True
+        if self._fetcher is None:
+            return False
+        try:
+            self.refresh(full=True)
+        except Exception as e:
+            logger.error(f"Erro ao carregar catálogo do Zabbix: {e}")
+        return self.loaded
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Erro ao atualizar catálogo do Zabbix: {e}")
+            self._stop_event.wait(self.refresh_interval)
+
+    def start(self) -> None:
+        """Inicia a atualização periódica em segundo plano"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="zabbix-catalog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Interrompe a atualização periódica"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+# Catálogo global compartilhado pelo processo
+host_catalog = ZabbixCatalog()
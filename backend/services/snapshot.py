@@ -0,0 +1,225 @@
+import json
+import time
+import asyncio
+import inspect
+import logging
+from typing import Dict, Any, Optional, Callable
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+class SnapshotEngine:
+    """
+    Mantém um snapshot pré-calculado de dados do dashboard.
+
+    Um laço em segundo plano recalcula o snapshot a cada `interval` segundos
+    e o guarda em memória e, se configurado, no Redis. As requisições apenas
+    leem o snapshot em memória. Com vários processos, um snapshot recente
+    encontrado no Redis é reaproveitado em vez de recalculado.
+
+    Usado pela API legada. A aplicação em app/ é empacotada sozinha e mantém
+    sua própria versão em app/services/snapshot.py.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        builder: Callable[[], Any],
+        interval: float = settings.dashboard_snapshot_interval,
+        min_force_interval: float = settings.dashboard_min_force_interval,
+        redis_url: Optional[str] = settings.redis_url
+    ):
+        """
+        Args:
+            name: Nome do snapshot (usado na chave do Redis)
+            builder: Função que monta os dados (síncrona ou coroutine)
+            interval: Intervalo entre atualizações automáticas em segundos
+            min_force_interval: Intervalo mínimo entre atualizações forçadas em segundos
+            redis_url: URL do Redis (opcional)
+        """
+        self.name = name
+        self.builder = builder
+        self.interval = interval
+        self.min_force_interval = min_force_interval
+        self.redis_url = redis_url
+
+        self._data: Optional[Dict[str, Any]] = None
+        self._generated_at: Optional[float] = None
+        self._build_ms: Optional[float] = None
+        self._last_forced: float = 0.0
+        self._last_error: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._redis = None
+
+    @property
+    def redis_key(self) -> str:
+        return f"zabbia:snapshot:{self.name}"
+
+    @property
+    def age(self) -> Optional[float]:
+        """Idade do snapshot atual em segundos"""
+        if self._generated_at is None:
+            return None
+        return time.time() - self._generated_at
+
+    async def _build(self) -> Dict[str, Any]:
+        if inspect.iscoroutinefunction(self.builder):
+            return await self.builder()
+        return await asyncio.to_thread(self.builder)
+
+    async def _load_from_redis(self) -> bool:
+        if self._redis is None:
+            return False
+        try:
+            raw = await self._redis.get(self.redis_key)
+        except Exception as e:
+            logger.warning(f"Erro ao ler snapshot '{self.name}' do Redis: {e}")
+            return False
+        if not raw:
+            return False
+
+        stored = json.loads(raw)
+        if self._generated_at is not None and stored["generated_at"] <= self._generated_at:
+            return False
+
+        self._data = stored["data"]
+        self._generated_at = stored["generated_at"]
+        self._build_ms = stored.get("build_ms")
+        return True
+
+    async def _save_to_redis(self) -> None:
+        if self._redis is None:
+            return
+        payload = json.dumps({
+            "data": self._data,
+            "generated_at": self._generated_at,
+            "build_ms": self._build_ms
+        }, default=str)
+        try:
+            # Expira após alguns ciclos sem atualização
+            await self._redis.set(self.redis_key, payload, ex=max(int(self.interval * 5), 1))
+        except Exception as e:
+            logger.warning(f"Erro ao gravar snapshot '{self.name}' no Redis: {e}")
+
+    async def refresh(self, max_age: Optional[float] = None) -> None:
+        """
+        Recalcula o snapshot.
+
+        Args:
+            max_age: Se informado, não recalcula quando o snapshot (inclusive um
+                     gerado por uma chamada concorrente) for mais novo que isso
+        """
+        async with self._lock:
+            if max_age is not None and self.age is not None and self.age < max_age:
+                return
+
+            started = time.perf_counter()
+            try:
+                data = await self._build()
+            except Exception as e:
+                self._last_error = str(e)
+                logger.error(f"Erro ao atualizar snapshot '{self.name}': {e}")
+                raise
+
+            self._data = data
+            self._generated_at = time.time()
+            self._build_ms = round((time.perf_counter() - started) * 1000, 2)
+            self._last_error = None
+
+        await self._save_to_redis()
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                # Outro processo pode já ter gerado um snapshot recente
+                await self._load_from_redis()
+                await self.refresh(max_age=self.interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Erro já registrado; mantém o snapshot anterior até o próximo ciclo
+                pass
+
+            wait = self.interval - (self.age or 0)
+            await asyncio.sleep(max(wait, 1.0))
+
+    async def start(self) -> None:
+        """
+        Inicia a atualização periódica (chamado na inicialização da aplicação).
+        """
+        if self.redis_url and self._redis is None:
+            # Importado apenas quando configurado: o Redis é opcional
+            try:
+                import redis.asyncio as aioredis
+            except ImportError:
+                logger.warning("REDIS_URL definido, mas o pacote redis não está instalado")
+            else:
+                self._redis = aioredis.from_url(self.redis_url)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+
+    async def stop(self) -> None:
+        """
+        Interrompe a atualização periódica e fecha a conexão com o Redis.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    async def get(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Retorna o snapshot atual com seus metadados em 'snapshot'.
+
+        Args:
+            force: Solicita uma atualização imediata (limitada a uma a cada
+                   `min_force_interval` segundos)
+
+        Returns:
+            Dados do snapshot acrescidos de idade e situação da atualização
+        """
+        refreshed = False
+        retry_after = None
+
+        if force:
+            now = time.monotonic()
+            elapsed = now - self._last_forced
+            if elapsed >= self.min_force_interval:
+                self._last_forced = now
+                try:
+                    await self.refresh()
+                    refreshed = True
+                except Exception:
+                    # Erro já registrado em last_error; serve o snapshot anterior
+                    if self._data is None:
+                        raise
+            else:
+                retry_after = round(self.min_force_interval - elapsed, 1)
+
+        if self._data is None:
+            # Primeira requisição antes do primeiro ciclo do laço
+            if not await self._load_from_redis():
+                await self.refresh(max_age=self.interval)
+                refreshed = True
+
+        response = dict(self._data)
+        response["snapshot"] = {
+            "generated_at": self._generated_at,
+            "age_seconds": round(self.age, 3),
+            "interval_seconds": self.interval,
+            "build_ms": self._build_ms,
+            "refreshed": refreshed,
+            "retry_after": retry_after,
+            "last_error": self._last_error
+        }
+        return response
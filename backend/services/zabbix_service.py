@@ -1,8 +1,78 @@
 import time
 import datetime
+import numpy as np
 from typing import List, Dict, Any, Optional, Union
 from pyzabbix import ZabbixAPI
 from ..config import settings
+from .catalog import host_catalog
+from ..utils.host_matcher import HostNameMatcher
+from ..utils.downsampling import parse_history, lttb, DEFAULT_MAX_POINTS
+
+# Períodos suportados e sua duração em segundos
+PERIOD_SECONDS = {
+    '1h': 3600,
+    '3h': 10800,
+    '6h': 21600,
+    '12h': 43200,
+    '24h': 86400,
+    '7d': 604800,
+    '30d': 2592000
+}
+
+# Operadores de comparação aceitos pelo motor de varredura
+THRESHOLD_OPERATORS = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal
+}
+
+# Agregações calculadas por item
+THRESHOLD_AGGREGATIONS = ('max', 'min', 'avg', 'p95')
+
+# Tipos de valor numéricos (0 = float, 3 = inteiro sem sinal)
+NUMERIC_VALUE_TYPES = (0, 3)
+
+# Quantidade máxima de itens por chamada history.get
+HISTORY_CHUNK_SIZE = 500
+
+# Reconhecedor de menções a hosts, mantido em sincronia com o catálogo
+host_matcher = HostNameMatcher.from_catalog(host_catalog)
+
+def aggregate_by_group(group_idx: np.ndarray, values: np.ndarray, n_groups: int) -> Dict[str, np.ndarray]:
+    """
+    Calcula max, min, avg e p95 por grupo em uma única ordenação.
+    
+    Args:
+        group_idx: Índice do grupo de cada amostra
+        values: Valores das amostras
+        n_groups: Número total de grupos
+        
+    Returns:
+        Dicionário {agregação: array com um valor por grupo (NaN se vazio)}
+    """
+    counts = np.bincount(group_idx, minlength=n_groups)
+    sums = np.bincount(group_idx, weights=values, minlength=n_groups)
+    
+    # Ordenar por (grupo, valor): min, max e percentis viram acessos por índice
+    order = np.lexsort((values, group_idx))
+    sorted_values = values[order]
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    has_data = counts > 0
+    
+    result = {name: np.full(n_groups, np.nan) for name in THRESHOLD_AGGREGATIONS}
+    result['min'][has_data] = sorted_values[starts[has_data]]
+    result['max'][has_data] = sorted_values[ends[has_data] - 1]
+    result['avg'][has_data] = sums[has_data] / counts[has_data]
+    
+    # Percentil 95 pelo método nearest-rank
+    rank = np.maximum(np.ceil(0.95 * counts[has_data]).astype(np.int64) - 1, 0)
+    result['p95'][has_data] = sorted_values[starts[has_data] + rank]
+    
+    return result
 
 class ZabbixService:
     """
@@ -65,6 +135,13 @@ class ZabbixService:
         Returns:
             Detalhes do host
         """
+        # Consultar o catálogo em memória antes de ir à API; hosts criados
+        # após a última atualização do catálogo ainda são buscados na API
+        if host_catalog.loaded:
+            host = host_catalog.host_by_name(host_name)
+            if host:
+                return dict(host)
+        
         hosts = self.api.do_request('host.get', {
             'output': ['hostid', 'host', 'name', 'status'],
             'filter': {'host': host_name},
@@ -160,68 +237,143 @@ class ZabbixService:
         
         return self.api.do_request('history.get', params)['result']
     
-    def get_hosts_with_high_cpu(self, threshold: float = 80.0, period: str = '1h') -> List[Dict[str, Any]]:
+    def scan_threshold(self,
+                       key_pattern: str,
+                       threshold: float,
+                       operator: str = '>',
+                       aggregation: str = 'max',
+                       period: str = '1h',
+                       name_pattern: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Obtém hosts com utilização de CPU acima do threshold especificado.
+        Varre toda a frota em busca de hosts cujas métricas violam um limite.
+        
+        Faz um único item.get para o padrão de chave, busca o histórico em lotes
+        por value_type e agrega os valores por item com NumPy. Para cada host é
+        retornado o item com o valor mais extremo entre os que violam o limite.
         
         Args:
-            threshold: Limite percentual para considerar CPU alta
-            period: Período de tempo para verificar ('1h', '3h', '6h', '12h', '24h', '7d')
+            key_pattern: Padrão da chave do item (aceita curingas, ex: 'system.cpu.util*')
+            threshold: Valor limite
+            operator: Operador de comparação ('>', '>=', '<', '<=', '==', '!=')
+            aggregation: Agregação comparada ao limite ('max', 'min', 'avg', 'p95')
+            period: Período de tempo ('1h', '3h', '6h', '12h', '24h', '7d', '30d')
+            name_pattern: Padrão adicional para o nome do item (opcional)
             
         Returns:
-            Lista de hosts com CPU alta
+            Lista de hosts com 'value', 'aggregation', 'itemid' e 'item_name'
         """
-        # Converter período em segundos
-        period_dict = {
-            '1h': 3600,
-            '3h': 10800,
-            '6h': 21600,
-            '12h': 43200,
-            '24h': 86400,
-            '7d': 604800
-        }
-        
-        seconds = period_dict.get(period, 3600)
-        time_from = int(time.time()) - seconds
+        if operator not in THRESHOLD_OPERATORS:
+            raise ValueError(f"Operador inválido: {operator}")
+        if aggregation not in THRESHOLD_AGGREGATIONS:
+            raise ValueError(f"Agregação inválida: {aggregation}")
         
-        # Obter todos os hosts
-        hosts = self.get_hosts()
-        result = []
+        time_from = int(time.time()) - PERIOD_SECONDS.get(period, 3600)
         
-        for host in hosts:
-            host_id = host['hostid']
-            
-            # Buscar itens de CPU do host
-            cpu_items = self.api.do_request('item.get', {
-                'output': ['itemid', 'name', 'key_'],
-                'hostids': host_id,
-                'search': {'key_': 'cpu', 'name': 'CPU'},
-                'searchWildcardsEnabled': True
-            })['result']
-            
-            if not cpu_items:
-                continue
+        # Uma única busca de itens para toda a frota
+        search = {'key_': key_pattern}
+        if name_pattern:
+            search['name'] = name_pattern
             
-            # Para cada item de CPU, verificar se está acima do threshold
-            for item in cpu_items:
-                item_id = item['itemid']
-                history = self.get_history(item_id, 0, time_from)
+        items = self.api.do_request('item.get', {
+            'output': ['itemid', 'hostid', 'name', 'key_', 'value_type'],
+            'search': search,
+            'searchWildcardsEnabled': True,
+            'monitored': True
+        })['result']
+        
+        items = [item for item in items if int(item.get('value_type', 0)) in NUMERIC_VALUE_TYPES]
+        if not items:
+            return []
+        
+        item_index = {item['itemid']: idx for idx, item in enumerate(items)}
+        
+        # Histórico em lotes, agrupado por value_type
+        itemids_by_type: Dict[int, List[str]] = {}
+        for item in items:
+            itemids_by_type.setdefault(int(item.get('value_type', 0)), []).append(item['itemid'])
+        
+        group_chunks = []
+        value_chunks = []
+        for value_type, itemids in itemids_by_type.items():
+            for offset in range(0, len(itemids), HISTORY_CHUNK_SIZE):
+                history = self.api.do_request('history.get', {
+                    'output': ['itemid', 'value'],
+                    'itemids': itemids[offset:offset + HISTORY_CHUNK_SIZE],
+                    'history': value_type,
+                    'time_from': time_from
+                })['result']
                 
                 if not history:
                     continue
                 
-                # Verificar valores
-                max_value = 0
-                for record in history:
-                    value = float(record['value'])
-                    max_value = max(max_value, value)
-                
-                if max_value > threshold:
-                    host_copy = host.copy()
-                    host_copy['cpu_max'] = str(max_value)
-                    host_copy['item_name'] = item['name']
-                    result.append(host_copy)
-                    break  # Já encontramos um item acima do threshold para este host
+                group_chunks.append(np.fromiter(
+                    (item_index[record['itemid']] for record in history),
+                    dtype=np.int64,
+                    count=len(history)
+                ))
+                value_chunks.append(np.array([record['value'] for record in history], dtype=np.float64))
+        
+        if not group_chunks:
+            return []
+        
+        aggregated = aggregate_by_group(
+            np.concatenate(group_chunks),
+            np.concatenate(value_chunks),
+            len(items)
+        )[aggregation]
+        
+        has_data = ~np.isnan(aggregated)
+        violating = np.zeros(len(items), dtype=bool)
+        violating[has_data] = THRESHOLD_OPERATORS[operator](aggregated[has_data], threshold)
+        
+        # Escolher, por host, o item mais extremo na direção do operador
+        descending = operator not in ('<', '<=')
+        worst_by_host: Dict[str, int] = {}
+        for idx in np.flatnonzero(violating):
+            host_id = items[idx]['hostid']
+            current = worst_by_host.get(host_id)
+            if current is None or (aggregated[idx] > aggregated[current]) == descending:
+                worst_by_host[host_id] = idx
+        
+        if not worst_by_host:
+            return []
+        
+        hosts = self.api.do_request('host.get', {
+            'output': ['hostid', 'host', 'name', 'status'],
+            'hostids': list(worst_by_host.keys()),
+            'selectInterfaces': ['ip']
+        })['result']
+        
+        result = []
+        for host in hosts:
+            idx = worst_by_host.get(host['hostid'])
+            if idx is None:
+                continue
+            host_copy = host.copy()
+            host_copy['value'] = float(aggregated[idx])
+            host_copy['aggregation'] = aggregation
+            host_copy['itemid'] = items[idx]['itemid']
+            host_copy['item_name'] = items[idx]['name']
+            result.append(host_copy)
+        
+        result.sort(key=lambda h: h['value'], reverse=descending)
+        return result
+    
+    def get_hosts_with_high_cpu(self, threshold: float = 80.0, period: str = '1h') -> List[Dict[str, Any]]:
+        """
+        Obtém hosts com utilização de CPU acima do threshold especificado.
+        
+        Args:
+            threshold: Limite percentual para considerar CPU alta
+            period: Período de tempo para verificar ('1h', '3h', '6h', '12h', '24h', '7d')
+            
+        Returns:
+            Lista de hosts com CPU alta
+        """
+        result = self.scan_threshold('cpu', threshold, '>', 'max', period, name_pattern='CPU')
+        
+        for host in result:
+            host['cpu_max'] = str(host['value'])
         
         return result
     
@@ -236,57 +388,10 @@ class ZabbixService:
         Returns:
             Lista de hosts com pouca memória
         """
-        # Converter período em segundos (similar ao método get_hosts_with_high_cpu)
-        period_dict = {
-            '1h': 3600,
-            '3h': 10800,
-            '6h': 21600,
-            '12h': 43200,
-            '24h': 86400,
-            '7d': 604800
-        }
-        
-        seconds = period_dict.get(period, 3600)
-        time_from = int(time.time()) - seconds
+        result = self.scan_threshold('mem', threshold, '<', 'min', period, name_pattern='memory')
         
-        # Obter todos os hosts
-        hosts = self.get_hosts()
-        result = []
-        
-        for host in hosts:
-            host_id = host['hostid']
-            
-            # Buscar itens de memória do host
-            memory_items = self.api.do_request('item.get', {
-                'output': ['itemid', 'name', 'key_'],
-                'hostids': host_id,
-                'search': {'key_': 'mem', 'name': 'memory'},
-                'searchWildcardsEnabled': True
-            })['result']
-            
-            if not memory_items:
-                continue
-            
-            # Para cada item de memória, verificar se está abaixo do threshold
-            for item in memory_items:
-                item_id = item['itemid']
-                history = self.get_history(item_id, 0, time_from)
-                
-                if not history:
-                    continue
-                
-                # Verificar valores
-                min_value = float('inf')
-                for record in history:
-                    value = float(record['value'])
-                    min_value = min(min_value, value)
-                
-                if min_value < threshold:
-                    host_copy = host.copy()
-                    host_copy['memory_min'] = str(min_value)
-                    host_copy['item_name'] = item['name']
-                    result.append(host_copy)
-                    break  # Já encontramos um item abaixo do threshold para este host
+        for host in result:
+            host['memory_min'] = str(host['value'])
         
         return result
     
@@ -351,30 +456,25 @@ class ZabbixService:
     def generate_graph_data(self, 
                            item_id: str, 
                            period: str = '7d',
-                           history_type: int = 0) -> Dict[str, Any]:
+                           history_type: int = 0,
+                           max_points: int = DEFAULT_MAX_POINTS) -> Dict[str, Any]:
         """
         Gera dados para graficação de um item.
         
+        O histórico é convertido em bloco com NumPy e reduzido com LTTB para no
+        máximo `max_points` pontos, preservando picos e vales da série.
+        
         Args:
             item_id: ID do item a ser graficado
             period: Período de tempo ('1h', '3h', '6h', '12h', '24h', '7d', '30d')
             history_type: Tipo de histórico (0-float, 1-string, 2-log, 3-integer, 4-text)
+            max_points: Quantidade máxima de pontos retornados (0 desativa a redução)
             
         Returns:
             Dicionário com timestamps e valores para gráfico
         """
         # Converter período em segundos
-        period_dict = {
-            '1h': 3600,
-            '3h': 10800,
-            '6h': 21600,
-            '12h': 43200,
-            '24h': 86400,
-            '7d': 604800,
-            '30d': 2592000
-        }
-        
-        seconds = period_dict.get(period, 604800)  # Padrão: 7 dias
+        seconds = PERIOD_SECONDS.get(period, 604800)  # Padrão: 7 dias
         time_from = int(time.time()) - seconds
         
         # Obter dados do item
@@ -397,21 +497,44 @@ class ZabbixService:
         # Obter histórico
         history = self.get_history(item_id, history_type, time_from)
         
-        # Processar dados
-        timestamps = []
-        values = []
+        # Processar dados em bloco
+        clocks, values = parse_history(history)
+        original_points = len(values)
         
-        for record in history:
-            timestamps.append(int(record['clock']) * 1000)  # Converter para milissegundos para JS
-            values.append(float(record['value']))
+        if max_points and original_points > max_points:
+            clocks, values = lttb(clocks, values, max_points)
         
         return {
-            'timestamps': timestamps,
-            'values': values,
+            'timestamps': (clocks * 1000).tolist(),  # Converter para milissegundos para JS
+            'values': values.tolist(),
             'name': item_name,
-            'units': units
+            'units': units,
+            'original_points': original_points
         }
     
+    def find_host_in_query(self, query_lower: str) -> Optional[Dict[str, Any]]:
+        """
+        Identifica o host mencionado em uma consulta.
+        
+        Com o catálogo carregado, usa o autômato de nomes de hosts (tempo linear
+        no tamanho da consulta); caso contrário, compara com a lista de hosts da API.
+        
+        Args:
+            query_lower: Consulta em minúsculas
+            
+        Returns:
+            Host mencionado ou None
+        """
+        if host_catalog.loaded:
+            host_id = host_matcher.best_match(query_lower)
+            return host_catalog.host_by_id(host_id) if host_id else None
+        
+        for host in self.get_hosts():
+            if host['host'].lower() in query_lower or host['name'].lower() in query_lower:
+                return host
+        
+        return None
+    
     def execute_query(self, query: str) -> Dict[str, Any]:
         """
         Executa uma consulta em linguagem natural no Zabbix.
@@ -477,15 +600,13 @@ class ZabbixService:
             host_info = None
             
             # Buscar menção a qualquer host na consulta
-            hosts = self.get_hosts()
-            for host in hosts:
-                if host['host'].lower() in query_lower or host['name'].lower() in query_lower:
-                    host_info = self.get_host_uptime(host['hostid'])
-                    host_info.update({
-                        'host': host['host'],
-                        'name': host['name']
-                    })
-                    break
+            host = self.find_host_in_query(query_lower)
+            if host:
+                host_info = self.get_host_uptime(host['hostid'])
+                host_info.update({
+                    'host': host['host'],
+                    'name': host['name']
+                })
             
             if not host_info:
                 return {
@@ -512,12 +633,10 @@ class ZabbixService:
             period = '7d'  # padrão: 7 dias
             
             # Tentar extrair nome do host e do item
-            hosts = self.get_hosts()
-            for host in hosts:
-                if host['host'].lower() in query_lower or host['name'].lower() in query_lower:
-                    host_name = host['host']
-                    host_id = host['hostid']
-                    break
+            host = self.find_host_in_query(query_lower)
+            if host:
+                host_name = host['host']
+                host_id = host['hostid']
             
             if not host_name:
                 return {
@@ -611,5 +730,9 @@ def get_zabbix_service():
         password = settings.ZABBIX_PASSWORD
         
         _zabbix_service = ZabbixService(url, username, password)
+        
+        # Usar a conexão do serviço como fonte do catálogo, se nenhuma outra foi definida
+        api = _zabbix_service.api
+        host_catalog.bind(lambda method, params: api.do_request(method, params)['result'])
     
     return _zabbix_service 
\ No newline at end of file
@@ -0,0 +1,59 @@
+from app.services.availability import problem_intervals, merge_intervals, downtime_seconds
+
+WINDOW_START = 1000
+WINDOW_END = 2000
+
+def event(clock, value):
+    return {"clock": str(clock), "value": str(value)}
+
+class TestProblemIntervals:
+    """Testes para a conversão de eventos de trigger em intervalos de problema."""
+
+    def test_problem_closed_by_ok(self):
+        """Testa um PROBLEM fechado pelo OK seguinte."""
+        events = [event(1100, 1), event(1300, 0)]
+        assert problem_intervals(events, WINDOW_START, WINDOW_END) == [(1100, 1300)]
+
+    def test_ok_before_any_problem_starts_at_window(self):
+        """Testa que um OK sem PROBLEM anterior fecha um problema iniciado antes da janela."""
+        events = [event(1200, 0), event(1500, 1), event(1600, 0)]
+        assert problem_intervals(events, WINDOW_START, WINDOW_END) == [(1000, 1200), (1500, 1600)]
+
+    def test_problem_open_at_window_end(self):
+        """Testa que um PROBLEM sem OK permanece aberto até o fim da janela."""
+        events = [event(1100, 1), event(1200, 0), event(1800, 1)]
+        assert problem_intervals(events, WINDOW_START, WINDOW_END) == [(1100, 1200), (1800, 2000)]
+
+    def test_repeated_events_keep_first_problem(self):
+        """Testa que PROBLEMs repetidos não reiniciam o intervalo e OKs repetidos são ignorados."""
+        events = [event(1100, 1), event(1150, 1), event(1200, 0), event(1250, 0)]
+        assert problem_intervals(events, WINDOW_START, WINDOW_END) == [(1100, 1200)]
+
+    def test_no_events(self):
+        """Testa um trigger sem eventos na janela."""
+        assert problem_intervals([], WINDOW_START, WINDOW_END) == []
+
+class TestMergeIntervals:
+    """Testes para a união de intervalos e o cálculo de indisponibilidade."""
+
+    def test_overlapping_triggers_on_one_host_count_once(self):
+        """Testa que problemas simultâneos em vários triggers contam uma vez."""
+        cpu = problem_intervals([event(1100, 1), event(1400, 0)], WINDOW_START, WINDOW_END)
+        disk = problem_intervals([event(1300, 1), event(1500, 0)], WINDOW_START, WINDOW_END)
+        ping = problem_intervals([event(1150, 1), event(1200, 0)], WINDOW_START, WINDOW_END)
+
+        intervals = cpu + disk + ping
+        assert merge_intervals(intervals) == [(1100, 1500)]
+        assert downtime_seconds(intervals) == 400
+
+    def test_touching_intervals_are_merged(self):
+        """Testa que intervalos que se tocam formam um só."""
+        assert merge_intervals([(1300, 1400), (1100, 1300)]) == [(1100, 1400)]
+        assert downtime_seconds([(1100, 1300), (1300, 1400)]) == 300
+
+    def test_disjoint_intervals(self):
+        """Testa intervalos separados e a lista vazia."""
+        assert merge_intervals([(1500, 1600), (1100, 1200)]) == [(1100, 1200), (1500, 1600)]
+        assert downtime_seconds([(1100, 1200), (1500, 1600)]) == 200
+        assert merge_intervals([]) == []
+        assert downtime_seconds([]) == 0
@@ -0,0 +1,119 @@
+import pytest
+from zabbia.backend.services.catalog import ZabbixCatalog, key_prefixes
+
+class FakeZabbix:
+    """Fonte de dados em memória que registra as chamadas recebidas."""
+
+    def __init__(self):
+        self.hosts = {
+            "10001": {"hostid": "10001", "host": "web01", "name": "Web 01", "status": "0"},
+            "10002": {"hostid": "10002", "host": "db01", "name": "DB 01", "status": "0"},
+        }
+        self.items = [
+            {"itemid": "1", "hostid": "10001", "key_": "system.cpu.util", "value_type": "0"},
+            {"itemid": "2", "hostid": "10002", "key_": "vm.memory.size[pused]", "value_type": "0"},
+            {"itemid": "3", "hostid": "10003", "key_": "system.cpu.util", "value_type": "0"},
+        ]
+        self.calls = []
+
+    def __call__(self, method, params):
+        self.calls.append((method, params))
+        if method == "host.get":
+            return [dict(host) for host in self.hosts.values()]
+        host_ids = params.get("hostids")
+        return [dict(item) for item in self.items if host_ids is None or item["hostid"] in host_ids]
+
+@pytest.fixture
+def zabbix():
+    return FakeZabbix()
+
+@pytest.fixture
+def catalog(zabbix):
+    catalog = ZabbixCatalog(fetcher=zabbix, full_refresh_interval=3600)
+    catalog.refresh()
+    return catalog
+
+def host_ids(hosts):
+    return sorted(host["hostid"] for host in hosts)
+
+class TestCatalogRefresh:
+    """Testes para a atualização incremental do catálogo."""
+
+    def test_listener_receives_added_changed_and_removed(self, catalog, zabbix):
+        """Testa os conjuntos (atualizados, removidos) enviados aos listeners."""
+        notifications = []
+        catalog.add_listener(lambda updated, removed: notifications.append((host_ids(updated), host_ids(removed))))
+
+        zabbix.hosts["10003"] = {"hostid": "10003", "host": "app01", "name": "App 01", "status": "0"}
+        zabbix.hosts["10001"]["status"] = "1"
+        del zabbix.hosts["10002"]
+        catalog.refresh()
+
+        assert notifications == [(["10001", "10003"], ["10002"])]
+        assert catalog.host_by_name("app 01")["hostid"] == "10003"
+        assert catalog.host_by_name("db01") is None
+
+    def test_unchanged_refresh_does_not_notify(self, catalog):
+        """Testa que uma atualização sem mudanças não notifica nem muda a versão."""
+        notifications = []
+        catalog.add_listener(lambda updated, removed: notifications.append((updated, removed)))
+        version = catalog.version
+
+        catalog.refresh()
+
+        assert notifications == []
+        assert catalog.version == version
+
+    def test_incremental_refresh_loads_items_of_new_hosts_only(self, catalog, zabbix):
+        """Testa que a atualização incremental busca itens apenas dos hosts novos."""
+        zabbix.hosts["10003"] = {"hostid": "10003", "host": "app01", "name": "App 01", "status": "0"}
+        del zabbix.hosts["10002"]
+        zabbix.calls.clear()
+
+        catalog.refresh()
+
+        item_calls = [params for method, params in zabbix.calls if method == "item.get"]
+        assert [params["hostids"] for params in item_calls] == [["10003"]]
+        assert sorted(item["hostid"] for item in catalog.items_by_key("system.cpu")) == ["10001", "10003"]
+        assert catalog.items_by_key("vm.memory") == []
+        assert catalog.value_type("3") == 0
+
+    def test_key_prefixes(self):
+        """Testa os prefixos indexados de uma chave de item."""
+        assert key_prefixes("vm.memory.size[pused]") == [
+            "vm.memory.size[pused]", "vm.memory.size", "vm.memory", "vm"
+        ]
+
+    def test_items_containing_matches_substrings(self, catalog):
+        """Testa a busca por trecho de chave, com a mesma semântica de LIKE '%trecho%'."""
+        assert sorted(item["itemid"] for item in catalog.items_containing("cpu.util")) == ["1"]
+        assert [item["itemid"] for item in catalog.items_containing("pused")] == ["2"]
+        assert catalog.items_containing("net.if") == []
+
+class TestItemLastValues:
+    """Testes para a resolução de chaves de ZabbixDBClient.get_item_last_values."""
+
+    @pytest.fixture
+    def client(self, catalog, monkeypatch):
+        zabbix_db = pytest.importorskip("zabbia.backend.zabbix_db")
+        monkeypatch.setattr(zabbix_db, "host_catalog", catalog)
+        client = zabbix_db.ZabbixDBClient.__new__(zabbix_db.ZabbixDBClient)
+        client.queries = []
+        client.execute_query = lambda query, params=None: client.queries.append((query, params)) or []
+        return client
+
+    def test_uses_catalog_item_ids(self, client):
+        """Testa que itens conhecidos pelo catálogo são filtrados por itemid."""
+        client.get_item_last_values(["cpu.util", "pused"])
+
+        query, params = client.queries[0]
+        assert "i.itemid IN (%s, %s)" in query
+        assert params == ("1", "2")
+
+    def test_falls_back_to_like_on_catalog_miss(self, client):
+        """Testa que uma chave desconhecida pelo catálogo ainda é buscada no banco."""
+        client.get_item_last_values(["net.if.in"], host_pattern="web")
+
+        query, params = client.queries[0]
+        assert "i.key_ LIKE %s" in query
+        assert params == ("%net.if.in%", "%web%")
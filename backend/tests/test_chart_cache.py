@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from zabbia.backend.chart_cache import ChartCache, CachedChart, chart_key, snap_window, etag_matches
+
+class TestChartCache:
+    """Testes para o cache de gráficos renderizados."""
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        """Testa que o limite de bytes descarta a imagem menos usada."""
+        async def scenario():
+            cache = ChartCache(max_bytes=10, redis_url=None)
+            await cache.put("a", CachedChart.from_bytes(b"aaaa", "image/png"))
+            await cache.put("b", CachedChart.from_bytes(b"bbbb", "image/png"))
+            await cache.get("a")
+            await cache.put("c", CachedChart.from_bytes(b"cccc", "image/png"))
+            return cache
+
+        cache = asyncio.run(scenario())
+        assert cache._get_local("a") is not None
+        assert cache._get_local("b") is None
+        assert cache.stats()["bytes"] == 8
+
+    def test_concurrent_requests_render_once(self):
+        """Testa que requisições simultâneas da mesma chave renderizam uma vez."""
+        calls = []
+
+        async def render():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return b"png"
+
+        async def scenario():
+            cache = ChartCache(max_bytes=1024, redis_url=None)
+            charts = await asyncio.gather(*(cache.get_or_render("k", render) for _ in range(5)))
+            again = await cache.get_or_render("k", render)
+            return charts, again
+
+        charts, again = asyncio.run(scenario())
+        assert len(calls) == 1
+        assert {chart.etag for chart in charts} == {again.etag}
+
+    def test_missing_data_is_not_cached(self):
+        """Testa que gráficos sem dados não são armazenados."""
+        async def render():
+            return None
+
+        async def scenario():
+            cache = ChartCache(max_bytes=1024, redis_url=None)
+            first = await cache.get_or_render("k", render)
+            return first, cache.stats()
+
+        first, stats = asyncio.run(scenario())
+        assert first is None
+        assert stats["entries"] == 0
+
+    def test_keys_and_windows(self):
+        """Testa o alinhamento das janelas, as chaves e o If-None-Match."""
+        assert snap_window(1000, 1090, 60) == (990, 1080)
+        assert snap_window(1010, 1100, 60) == (990, 1080)
+        assert chart_key(item_ids=["1"], width=10) == chart_key(width=10, item_ids=["1"])
+        assert chart_key(item_ids=["1"], width=10) != chart_key(item_ids=["1"], width=12)
+
+        etag = CachedChart.from_bytes(b"png", "image/png").etag
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(None, etag)
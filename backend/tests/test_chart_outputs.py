@@ -0,0 +1,57 @@
+import base64
+import pytest
+import pandas as pd
+from zabbia.backend.utils.zabbix_analyzer import ZabbixAnalyzer
+from zabbia.backend.chart_utils import ZabbixChartGenerator
+
+class TestChartOutputs:
+    """Testes para as saídas binária, vetorial e apenas de dados dos gráficos."""
+
+    def test_analyzer_returns_raw_png_and_svg(self):
+        """Testa os bytes PNG/SVG e a compatibilidade do retorno em base64."""
+        df = pd.DataFrame({
+            "timestamp": pd.date_range("2024-01-01", periods=24, freq="h"),
+            "value": range(24)
+        })
+
+        png = ZabbixAnalyzer.generate_chart_bytes(df)
+        svg = ZabbixAnalyzer.generate_chart_bytes(df, image_format="svg")
+
+        assert png.startswith(b"\x89PNG")
+        assert svg.startswith(b"<?xml")
+        assert base64.b64decode(ZabbixAnalyzer.generate_chart(df))[:4] == b"\x89PNG"
+        assert ZabbixAnalyzer.generate_chart_bytes(pd.DataFrame()) == b""
+
+    def test_chart_data_downsamples_series(self):
+        """Testa que o modo apenas de dados reduz as séries e usa milissegundos."""
+        spec = {
+            "kind": "time_series",
+            "title": "CPU",
+            "ylabel": "%",
+            "timestamps": list(range(0, 60 * 1000, 60)),
+            "values": [float(i % 10) for i in range(1000)]
+        }
+        data = ZabbixChartGenerator.chart_data(spec, max_points=100)
+
+        series = data["series"][0]
+        assert len(series["values"]) == 100
+        assert series["original_points"] == 1000
+        assert series["timestamps"][0] == 0
+        assert series["timestamps"][-1] == 999 * 60 * 1000
+
+class TestChartRouteLimits:
+    """Testes para os limites de tamanho e de pontos das rotas de gráficos."""
+
+    @pytest.mark.parametrize("url", [
+        "/charts/resource/web01?width=2000&height=2000",
+        "/charts/resource/web01?width=0",
+        "/charts/resource/web01?max_points=0",
+        "/charts/items?itemid=1&height=500",
+        "/charts/items?itemid=1&max_points=100000",
+    ])
+    def test_out_of_range_parameters_are_rejected(self, url):
+        """Testa que tamanhos e pontos fora dos limites retornam 422 sem renderizar."""
+        from fastapi.testclient import TestClient
+        from zabbia.backend.api import app
+
+        assert TestClient(app).get(url).status_code == 422
@@ -0,0 +1,48 @@
+import os
+import signal
+import asyncio
+import pytest
+from zabbia.backend.chart_render import ChartRenderer
+
+SPEC = {
+    "kind": "time_series",
+    "title": "CPU",
+    "ylabel": "%",
+    "timestamps": [0, 60, 120],
+    "values": [1.0, 3.0, 2.0]
+}
+
+class TestChartRenderer:
+    """Testes para a renderização de gráficos no pool de processos."""
+
+    def test_renders_in_thread_without_pool(self):
+        """Testa a renderização em thread quando o pool não foi iniciado."""
+        renderer = ChartRenderer(max_workers=1)
+
+        png = asyncio.run(renderer.render(SPEC))
+
+        assert not renderer.running
+        assert png.startswith(b"\x89PNG")
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="requer SIGKILL")
+    def test_recovers_after_worker_dies(self):
+        """Testa que o pool é recriado quando um processo de renderização morre."""
+        renderer = ChartRenderer(max_workers=1)
+
+        async def run():
+            await renderer.start()
+            try:
+                first = await renderer.render(SPEC)
+                broken = renderer._pool
+                for process in list(broken._processes.values()):
+                    os.kill(process.pid, signal.SIGKILL)
+                second = await renderer.render(SPEC)
+                return first, second, broken, renderer._pool
+            finally:
+                await renderer.stop()
+
+        first, second, broken, replaced = asyncio.run(run())
+
+        assert first.startswith(b"\x89PNG")
+        assert second.startswith(b"\x89PNG")
+        assert replaced is not None and replaced is not broken
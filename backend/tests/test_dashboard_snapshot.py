@@ -0,0 +1,25 @@
+import asyncio
+import pytest
+from zabbia.backend.services.snapshot import SnapshotEngine
+
+class TestDashboardSnapshot:
+    """Testes para o snapshot do dashboard da API legada."""
+
+    def test_serves_snapshot_and_limits_forced_refresh(self):
+        """Testa o snapshot servido, a atualização forçada e o intervalo mínimo entre elas."""
+        builds = []
+
+        def builder():
+            builds.append(1)
+            return {"hosts": len(builds)}
+
+        engine = SnapshotEngine("dashboard", builder, min_force_interval=60, redis_url=None)
+
+        async def run():
+            return await engine.get(), await engine.get(force=True), await engine.get(force=True)
+
+        first, forced, limited = asyncio.run(run())
+
+        assert first["hosts"] == 1 and first["snapshot"]["refreshed"] is True
+        assert forced["hosts"] == 2 and forced["snapshot"]["refreshed"] is True
+        assert limited["hosts"] == 2 and limited["snapshot"]["retry_after"] > 0
@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from app.services.database import upgrade_schema
+
+LEGACY_HOST = """
+CREATE TABLE host (
+    id CHAR(32) PRIMARY KEY,
+    created_at DATETIME,
+    updated_at DATETIME,
+    host_id VARCHAR NOT NULL,
+    name VARCHAR NOT NULL,
+    status INTEGER NOT NULL,
+    ip VARCHAR,
+    dns VARCHAR,
+    description VARCHAR,
+    metadata JSON
+)
+"""
+
+LEGACY_METRIC = """
+CREATE TABLE metric (
+    id CHAR(32) PRIMARY KEY,
+    created_at DATETIME,
+    updated_at DATETIME,
+    host_id VARCHAR NOT NULL,
+    item_id VARCHAR NOT NULL,
+    timestamp DATETIME NOT NULL,
+    key_ VARCHAR NOT NULL,
+    value VARCHAR NOT NULL,
+    value_type INTEGER NOT NULL,
+    units VARCHAR
+)
+"""
+
+@pytest.fixture
+def legacy_engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(LEGACY_HOST))
+        conn.execute(text("CREATE INDEX ix_host_host_id ON host (host_id)"))
+        conn.execute(text(LEGACY_METRIC))
+        conn.execute(text("CREATE INDEX ix_metric_item_id ON metric (item_id)"))
+        conn.execute(text(
+            "INSERT INTO host (id, updated_at, host_id, name, status) VALUES "
+            "('a', '2024-01-01', '10001', 'antigo', 0), "
+            "('b', '2024-02-01', '10001', 'web01', 0), "
+            "('c', '2024-01-01', '10002', 'db01', 0)"
+        ))
+    return engine
+
+class TestUpgradeSchema:
+    """Testes para a atualização de tabelas criadas por versões anteriores."""
+
+    def test_upgrades_legacy_host_table(self, legacy_engine):
+        """Testa a coluna content_hash e o índice único exigido pelo upsert."""
+        upgrade_schema(legacy_engine)
+
+        inspector = inspect(legacy_engine)
+        assert "content_hash" in {column["name"] for column in inspector.get_columns("host")}
+        indexes = {index["name"]: index for index in inspector.get_indexes("host")}
+        assert indexes["ix_host_host_id"]["unique"]
+
+        with legacy_engine.connect() as conn:
+            rows = conn.execute(text("SELECT host_id, name FROM host ORDER BY host_id")).all()
+        assert rows == [("10001", "web01"), ("10002", "db01")]
+
+    def test_is_idempotent(self, legacy_engine):
+        """Testa que executar a atualização novamente não altera nada."""
+        upgrade_schema(legacy_engine)
+        upgrade_schema(legacy_engine)
+
+        with legacy_engine.begin() as conn:
+            conn.execute(text("INSERT INTO host (id, host_id, name, status) VALUES ('d', '10003', 'app01', 0)"))
+            with pytest.raises(Exception):
+                conn.execute(text("INSERT INTO host (id, host_id, name, status) VALUES ('e', '10003', 'app01', 0)"))
+
+    def test_drops_legacy_metric_table(self, legacy_engine):
+        """Testa que a tabela metric no formato antigo é removida para ser recriada."""
+        upgrade_schema(legacy_engine)
+
+        inspector = inspect(legacy_engine)
+        assert not inspector.has_table("metric")
+        assert inspector.has_table("host")
+
+    def test_keeps_current_metric_table(self):
+        """Testa que a tabela metric no formato atual é mantida."""
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE metric (item_id VARCHAR, clock INTEGER, ns INTEGER, "
+                "host_id VARCHAR, value FLOAT, PRIMARY KEY (item_id, clock, ns))"
+            ))
+
+        upgrade_schema(engine)
+
+        assert inspect(engine).has_table("metric")
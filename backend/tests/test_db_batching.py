@@ -0,0 +1,48 @@
+import pytest
+from unittest.mock import patch
+from zabbia.backend.db_utils import ZabbixDBClient
+
+class TestDBBatching:
+    """Testes para a leitura em lote de metadados e histórico de itens."""
+
+    def test_history_one_query_per_value_type(self):
+        """Testa que itens de mesmo tipo são lidos em uma única consulta."""
+        client = ZabbixDBClient()
+        rows = {
+            "history": [
+                {"itemid": 1, "clock": 100, "value": 1.0, "ns": 0},
+                {"itemid": 2, "clock": 200, "value": 2.0, "ns": 0},
+                {"itemid": 1, "clock": 300, "value": 3.0, "ns": 0},
+            ],
+            "history_uint": [{"itemid": 3, "clock": 100, "value": 7, "ns": 0}],
+        }
+
+        def fake_query(query, params=None):
+            table = "history_uint" if "history_uint" in query else "history"
+            return rows[table]
+
+        with patch.object(client, "execute_query", side_effect=fake_query) as execute:
+            history = client.get_items_history({"1": 0, "2": 0, "3": 3}, time_from=50, limit=10)
+
+        assert execute.call_count == 2
+        query, params = execute.call_args_list[0].args
+        assert query.count("UNION ALL") == 1
+        assert params == ["1", 50, 10, "2", 50, 10]
+        assert [row["clock"] for row in history["1"]] == [300, 100]
+        assert len(history["3"]) == 1
+
+    def test_items_info_single_query_for_unknown_items(self):
+        """Testa que os metadados dos itens fora do catálogo vêm de uma consulta."""
+        client = ZabbixDBClient()
+        result = [
+            {"itemid": 10, "name": "CPU", "units": "%", "value_type": 0},
+            {"itemid": 11, "name": "Mem", "units": "B", "value_type": 3},
+        ]
+
+        with patch.object(client, "execute_query", return_value=result) as execute:
+            info = client.get_items_info([10, 11, 12])
+
+        assert execute.call_count == 1
+        assert "IN (%s, %s, %s)" in execute.call_args.args[0]
+        assert info["11"] == {"name": "Mem", "units": "B", "value_type": 3}
+        assert "12" not in info
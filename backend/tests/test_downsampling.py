@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+from zabbia.backend.utils.downsampling import parse_history, lttb
+
+class TestDownsampling:
+    """Testes para a redução de séries usada nos gráficos."""
+
+    def test_parse_history(self):
+        """Testa a conversão em bloco do histórico do Zabbix."""
+        history = [
+            {"itemid": "1", "clock": "1621234567", "value": "10.5", "ns": "0"},
+            {"itemid": "1", "clock": "1621234627", "value": "12", "ns": "0"}
+        ]
+
+        clocks, values = parse_history(history)
+
+        assert clocks.dtype == np.int64
+        assert clocks.tolist() == [1621234567, 1621234627]
+        assert values.tolist() == [10.5, 12.0]
+
+    def test_parse_history_empty(self):
+        """Testa a conversão de um histórico vazio."""
+        clocks, values = parse_history([])
+
+        assert len(clocks) == 0
+        assert len(values) == 0
+
+    def test_lttb_keeps_short_series(self):
+        """Testa que séries menores que o limite não são alteradas."""
+        x = np.arange(10)
+        y = np.arange(10, dtype=float)
+
+        out_x, out_y = lttb(x, y, 100)
+
+        assert out_x.tolist() == x.tolist()
+        assert out_y.tolist() == y.tolist()
+
+    def test_lttb_preserves_peaks(self):
+        """Testa que a redução mantém extremos e as pontas da série."""
+        n = 100000
+        x = np.arange(n, dtype=np.int64) * 60
+        y = np.sin(np.linspace(0, 20, n))
+        y[12345] = 50.0
+        y[67890] = -50.0
+
+        out_x, out_y = lttb(x, y, 2000)
+
+        assert len(out_x) == 2000
+        assert out_x[0] == x[0] and out_x[-1] == x[-1]
+        assert np.all(np.diff(out_x) > 0)
+        assert out_y.max() == 50.0
+        assert out_y.min() == -50.0
@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlmodel import SQLModel
+from app.domain.models import Host
+from app.services.host_cache import HostCache
+
+def make_host(hostid, name, status="0"):
+    return {"hostid": hostid, "name": name, "status": status, "interfaces": [{"ip": "10.0.0.1", "dns": ""}]}
+
+class PortableHostCache(HostCache):
+    """Simula um banco sem INSERT ... ON CONFLICT."""
+
+    def _insert(self):
+        return None
+
+@pytest.fixture(params=[HostCache, PortableHostCache], ids=["upsert", "select-update"])
+def cache(request):
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine, tables=[Host.__table__])
+    return request.param(db_engine=engine)
+
+def stored(cache):
+    table = Host.__table__
+    with cache.engine.connect() as conn:
+        return dict(conn.execute(select(table.c.host_id, table.c.name)).all())
+
+class TestHostCache:
+    """Testes para a sincronização da tabela Host."""
+
+    def test_writes_only_new_or_changed_hosts(self, cache):
+        """Testa que apenas hosts novos ou alterados são gravados."""
+        assert cache.sync([make_host("1", "web01"), make_host("2", "db01")]) == 2
+        assert cache.sync([make_host("1", "web01"), make_host("2", "db01")]) == 0
+        assert cache.sync([make_host("1", "web01"), make_host("2", "db02"), make_host("3", "app01")]) == 2
+
+        assert stored(cache) == {"1": "web01", "2": "db02", "3": "app01"}
+
+    def test_reloads_hashes_after_invalidate(self, cache):
+        """Testa que os hashes são recarregados do banco após invalidate()."""
+        cache.sync([make_host("1", "web01")])
+        cache.invalidate()
+
+        assert cache.sync([make_host("1", "web01")]) == 0
+        assert cache.sync([make_host("1", "web01", status="1")]) == 1
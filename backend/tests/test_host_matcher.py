@@ -0,0 +1,68 @@
+import pytest
+from zabbia.backend.services.catalog import ZabbixCatalog
+from zabbia.backend.utils.host_matcher import HostNameMatcher
+
+HOSTS = [
+    {"hostid": "10001", "host": "web01", "name": "Web Server 01", "status": "0"},
+    {"hostid": "10002", "host": "web", "name": "Web", "status": "0"},
+    {"hostid": "10003", "host": "db-master", "name": "Database Master", "status": "0"},
+    {"hostid": "10004", "host": "master", "name": "Master", "status": "0"},
+]
+
+@pytest.fixture
+def matcher():
+    matcher = HostNameMatcher()
+    for host in HOSTS:
+        matcher.add_host(host)
+    return matcher
+
+class TestHostNameMatcher:
+    """Testes para o reconhecimento de hosts com Aho-Corasick."""
+
+    def test_overlapping_names(self, matcher):
+        """Testa que nomes sobrepostos e contidos em outros são todos encontrados."""
+        matches = matcher.find_all("cpu do web01 e do db-master")
+
+        assert sorted(matches) == [
+            ("10001", 7, 12),
+            ("10002", 7, 10),
+            ("10003", 18, 27),
+            ("10004", 21, 27),
+        ]
+
+    def test_longest_match_wins(self, matcher):
+        """Testa que a menção mais longa (mais específica) é escolhida."""
+        assert matcher.best_match("status do web01") == "10001"
+        assert matcher.best_match("memória do database master") == "10003"
+        assert matcher.best_match("status do web") == "10002"
+        assert matcher.best_match("status do mail01") is None
+
+    def test_add_and_remove_host(self, matcher):
+        """Testa a atualização do autômato após buscas já realizadas."""
+        assert matcher.best_match("status do web01") == "10001"
+
+        matcher.remove_host("10001")
+        matcher.add_host({"hostid": "10005", "host": "web01-backup", "name": "Backup"})
+
+        assert matcher.best_match("status do web01") == "10002"
+        assert matcher.best_match("status do web01-backup") == "10005"
+        assert len(matcher) == 4
+
+    def test_catalog_listener(self):
+        """Testa a sincronização com o catálogo (hosts adicionados, renomeados e removidos)."""
+        hosts = {host["hostid"]: dict(host) for host in HOSTS[:3]}
+        catalog = ZabbixCatalog(fetcher=lambda method, params: [dict(host) for host in hosts.values()] if method == "host.get" else [])
+        catalog.refresh(full=True)
+        matcher = HostNameMatcher.from_catalog(catalog)
+
+        assert matcher.best_match("status do db-master") == "10003"
+
+        del hosts["10003"]
+        hosts["10001"]["host"] = "app01"
+        hosts["10006"] = {"hostid": "10006", "host": "mail01", "name": "Mail", "status": "0"}
+        catalog.refresh()
+
+        assert matcher.best_match("status do db-master") is None
+        assert matcher.best_match("status do web01") == "10002"
+        assert matcher.best_match("status do app01") == "10001"
+        assert matcher.best_match("fila do mail01") == "10006"
@@ -0,0 +1,93 @@
+import pytest
+from zabbia.backend.nlp_processor import NLPProcessor
+from zabbia.backend.utils.host_resolver import HostResolver
+
+HOSTS = [
+    {"hostid": "10001", "host": "web01", "name": "Web Server 01"},
+    {"hostid": "10002", "host": "web02", "name": "Web Server 02"},
+    {"hostid": "10003", "host": "db-master", "name": "Database Master"},
+    {"hostid": "10004", "host": "mail01", "name": "Mail"},
+]
+
+@pytest.fixture
+def resolver():
+    resolver = HostResolver()
+    for host in HOSTS:
+        resolver.add_host(host)
+    return resolver
+
+class TestHostResolver:
+    """Testes para a resolução de nomes de hosts por trigramas."""
+
+    def test_exact_name(self, resolver):
+        """Testa que um nome idêntico resolve apenas para o seu host."""
+        assert resolver.resolve_ids("WEB01") == ["10001"]
+
+    def test_misspelled_name(self, resolver):
+        """Testa a resolução de um nome com erro de digitação."""
+        assert resolver.resolve_ids("db-mastre") == ["10003"]
+
+    def test_partial_name(self, resolver):
+        """Testa que uma menção parcial resolve para todos os hosts compatíveis."""
+        assert resolver.resolve_ids("web") == ["10001", "10002"]
+
+    def test_unrelated_name(self, resolver):
+        """Testa que menções sem semelhança não são resolvidas."""
+        assert resolver.resolve_ids("xyz") == []
+
+    def test_incremental_updates(self, resolver):
+        """Testa a atualização do índice pelas notificações do catálogo."""
+        resolver.on_hosts_changed(
+            [{"hostid": "10005", "host": "web03", "name": "Web Server 03"}],
+            [{"hostid": "10001"}]
+        )
+
+        assert resolver.resolve_ids("web01") != ["10001"]
+        assert resolver.resolve_ids("web03") == ["10005"]
+
+    def test_sql_filters_by_hostid(self, resolver):
+        """Testa que o SQL gerado filtra pelos IDs resolvidos em vez de LIKE."""
+        processor = NLPProcessor(cache_size=8, host_resolver=resolver)
+
+        sql, context = processor.generate_sql("status do servidor web")
+        method, params = processor.generate_api_call("status do servidor web")
+
+        assert "h.hostid IN (:host_id_0, :host_id_1)" in sql
+        assert "LIKE" not in sql
+        assert (context["host_id_0"], context["host_id_1"]) == ("10001", "10002")
+        assert params["hostids"] == ["10001", "10002"]
+
+class TestQueryHostFilter:
+    """Testes para os IDs de hosts usados nos filtros das consultas geradas."""
+
+    @pytest.fixture
+    def processor(self):
+        resolver = HostResolver()
+        names = ["web01", "web02", "db01", "db02", "webserver-prod-01", "app-02", "mail01"]
+        for index, name in enumerate(names):
+            resolver.add_host({"hostid": str(20001 + index), "host": name, "name": name})
+        return NLPProcessor(cache_size=8, host_resolver=resolver)
+
+    def test_similar_host_is_not_substituted(self, processor):
+        """Testa que um host inexistente parecido com outros mantém o filtro LIKE."""
+        for host in ("db03", "web03"):
+            sql, context = processor.generate_sql(f"status do servidor {host}")
+            method, params = processor.generate_api_call(f"status do servidor {host}")
+
+            assert "h.name LIKE :host_pattern" in sql
+            assert context["host_pattern"] == f"%{host}%"
+            assert "hostids" not in params
+
+    def test_partial_name_includes_every_matching_host(self, processor):
+        """Testa que uma menção parcial inclui todos os hosts que o LIKE encontraria."""
+        method, params = processor.generate_api_call("status do servidor web")
+
+        assert params["hostids"] == ["20001", "20002", "20005"]
+
+    def test_maintenance_requires_exact_name(self, processor):
+        """Testa que a manutenção só recebe o host de nome idêntico."""
+        method, params = processor.generate_api_call("colocar host web01 em manutenção por 2 horas")
+        assert params["hostids"] == ["20001"]
+
+        method, params = processor.generate_api_call("colocar host web em manutenção por 2 horas")
+        assert params["hostids"] == []
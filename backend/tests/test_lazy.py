@@ -0,0 +1,30 @@
+import pytest
+from zabbia.backend.utils.lazy import LazyProxy, lazy_import, is_initialized
+
+class TestLazyProxy:
+    """Testes para a criação adiada de objetos globais."""
+
+    def test_factory_runs_once_on_first_use(self):
+        """Testa que o objeto é criado apenas no primeiro acesso."""
+        created = []
+
+        class Client:
+            def __init__(self):
+                created.append(self)
+                self.name = "zabbix"
+
+        proxy = LazyProxy(Client)
+        assert not created and not is_initialized(proxy)
+
+        assert proxy.name == "zabbix"
+        proxy.name = "outro"
+        assert proxy.name == "outro"
+        assert len(created) == 1 and is_initialized(proxy)
+
+    def test_lazy_import(self):
+        """Testa que o atributo do módulo é resolvido no primeiro uso."""
+        dumps = lazy_import("json", "dumps")
+        assert not is_initialized(dumps)
+        assert dumps.__name__ == "dumps"
+        assert is_initialized(dumps)
+        assert is_initialized(object())
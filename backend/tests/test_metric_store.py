@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from app.domain.models import Metric, MetricCoverage
+from app.services.metric_store import MetricStore, subtract_ranges
+from app.services import zabbix as zabbix_module
+
+class TestSubtractRanges:
+    """Testes para o cálculo dos trechos ausentes do armazenamento local."""
+
+    def test_no_coverage(self):
+        """Testa que sem cobertura todo o intervalo é lacuna."""
+        assert subtract_ranges(1000, 2000, []) == [(1000, 2000)]
+
+    def test_adjacent_coverage_leaves_no_gap(self):
+        """Testa que intervalos adjacentes (inclusivos) não deixam lacuna entre si."""
+        assert subtract_ranges(1000, 2000, [(1000, 1499), (1500, 2000)]) == []
+        assert subtract_ranges(1000, 2000, [(1000, 1499), (1501, 2000)]) == [(1500, 1500)]
+
+    def test_overlapping_coverage(self):
+        """Testa intervalos sobrepostos e fora de ordem."""
+        covered = [(1400, 1700), (1100, 1500), (1650, 1800)]
+        assert subtract_ranges(1000, 2000, covered) == [(1000, 1099), (1801, 2000)]
+
+    def test_coverage_outside_the_range(self):
+        """Testa que cobertura antes ou depois do intervalo é ignorada."""
+        covered = [(0, 999), (2001, 3000)]
+        assert subtract_ranges(1000, 2000, covered) == [(1000, 2000)]
+
+    def test_coverage_crossing_the_edges(self):
+        """Testa cobertura que começa antes e termina depois do intervalo."""
+        assert subtract_ranges(1000, 2000, [(500, 1200), (1900, 2500)]) == [(1201, 1899)]
+        assert subtract_ranges(1000, 2000, [(0, 3000)]) == []
+
+@pytest.fixture
+def store():
+    # Uma única conexão: as leituras são feitas em outra thread (asyncio.to_thread)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=[Metric.__table__, MetricCoverage.__table__])
+    return MetricStore(db_engine=engine)
+
+class TestMetricStore:
+    """Testes para a gravação de amostras e cobertura no armazenamento local."""
+
+    def test_write_read_and_gaps(self, store):
+        """Testa que amostras repetidas são ignoradas e coberturas adjacentes são unidas."""
+        samples = [
+            {"item_id": "1", "clock": 1000, "ns": 0, "host_id": "10001", "value": 1.5},
+            {"item_id": "1", "clock": 1060, "ns": 0, "host_id": "10001", "value": 2.5}
+        ]
+        store.write(samples, [("1", 1000, 1099)])
+        store.write(samples[:1], [("1", 1100, 1199), ("1", 1500, 1599)])
+
+        assert store.read(["1"], 1000, 1199) == [
+            {"itemid": "1", "clock": 1000, "value": 1.5},
+            {"itemid": "1", "clock": 1060, "value": 2.5}
+        ]
+        assert store.gaps(["1", "2"], 1000, 1999) == {
+            "1": [(1200, 1499), (1600, 1999)],
+            "2": [(1000, 1999)]
+        }
+
+class FakeConnection:
+    """Conexão que responde history.get com uma amostra por minuto no período pedido."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def call(self, method, params=None, retry=True):
+        self.calls.append(params)
+        return [
+            {"itemid": item_id, "clock": str(clock), "ns": "0", "value": "1"}
+            for item_id in params["itemids"]
+            for clock in range(params["time_from"], params["time_till"] + 1, 60)
+        ]
+
+class TestLoadSeriesFromStore:
+    """Testes para a leitura das séries combinando o armazenamento local e o Zabbix."""
+
+    def test_fetches_each_gap_separately(self, store, monkeypatch):
+        """Testa que lacunas nas pontas são buscadas separadamente, sem repetir o trecho copiado."""
+        samples = [
+            {"item_id": "1", "clock": clock, "ns": 0, "host_id": "10001", "value": 2.0}
+            for clock in range(1600, 9000, 600)
+        ]
+        store.write(samples, [("1", 1600, 8999)])
+        monkeypatch.setattr(zabbix_module, "metric_store", store)
+        connection = FakeConnection()
+        service = zabbix_module.ZabbixService(connection=connection)
+        items = [{"itemid": "1", "hostid": "10001", "value_type": "0"}]
+
+        series = asyncio.run(service._load_series_from_store(items, 1000, 9599))
+
+        assert [(call["time_from"], call["time_till"]) for call in connection.calls] == [(1000, 1599), (9000, 9599)]
+        clocks = series.item_series("1")["timestamps"]
+        assert clocks == sorted(clocks)
+        assert len(clocks) == 10 + len(samples) + 10
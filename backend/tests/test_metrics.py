@@ -1,7 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
 import json
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 from app.main import app
 from app.services.zabbix import ZabbixService
@@ -24,9 +24,15 @@ def mock_zabbix_service():
         instance.get_cpu_metrics.return_value = [
             {
                 "host_id": "10001",
-                "data": [
-                    {"timestamp": "2023-10-01T12:00:00", "value": 45.5},
-                    {"timestamp": "2023-10-01T12:05:00", "value": 52.3},
+                "items": [
+                    {
+                        "item_id": "28001",
+                        "name": "CPU utilization",
+                        "key": "system.cpu.util",
+                        "units": "%",
+                        "timestamps": [1696161600, 1696161900],
+                        "values": [45.5, 52.3]
+                    }
                 ]
             }
         ]
@@ -35,9 +41,15 @@ def mock_zabbix_service():
         instance.get_memory_metrics.return_value = [
             {
                 "host_id": "10001",
-                "data": [
-                    {"timestamp": "2023-10-01T12:00:00", "value": 65.2},
-                    {"timestamp": "2023-10-01T12:05:00", "value": 67.8},
+                "items": [
+                    {
+                        "item_id": "28002",
+                        "name": "Memory utilization",
+                        "key": "vm.memory.util",
+                        "units": "%",
+                        "timestamps": [1696161600, 1696161900],
+                        "values": [65.2, 67.8]
+                    }
                 ]
             }
         ]
@@ -143,4 +155,32 @@ async def test_get_high_cpu_hosts(mock_zabbix_service):
     )
     
     # Limpar override
-    app.dependency_overrides.clear() 
\ No newline at end of file
+    app.dependency_overrides.clear() 
+@pytest.mark.asyncio
+async def test_get_host_metrics_max_points(mock_zabbix_service):
+    """
+    Testa o limite de pontos por série do endpoint de métricas de um host.
+    """
+    mock_zabbix_service.get_host_details = AsyncMock(return_value={"hostid": "10001", "name": "web01"})
+    mock_zabbix_service.get_host_metrics = AsyncMock(return_value={"cpu": [], "memory": [], "disk": [], "network": []})
+    app.dependency_overrides[ZabbixService] = lambda: mock_zabbix_service
+    headers = {"X-License-Key": "teste"}
+    period = "from=2023-10-01T00:00:00&to=2023-10-01T23:59:59"
+    
+    with patch("app.main.verify_license", return_value=(True, None)):
+        # Acima do limite da rota
+        response = client.get(f"/api/metrics/web01?{period}&max_points=20001", headers=headers)
+        assert response.status_code == 422
+        
+        response = client.get(f"/api/metrics/web01?{period}&max_points=100&agg=max", headers=headers)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["resolution"] == {"max_points": 100, "agg": "max", "bucket_seconds": 864}
+    
+    kwargs = mock_zabbix_service.get_host_metrics.call_args.kwargs
+    assert kwargs["max_points"] == 100
+    assert kwargs["agg"] == "max"
+    
+    # Limpar override
+    app.dependency_overrides.clear()
@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import patch
+from zabbia.backend.nlp_processor import NLPProcessor, QueryCache, QueryIntent
+
+class TestNLPCache:
+    """Testes para o cache de consultas do NLPProcessor."""
+
+    def test_lru_eviction(self):
+        """Testa que a entrada menos usada é descartada ao atingir o limite."""
+        cache = QueryCache(maxsize=2)
+        cache.get_or_create("a", lambda: 1)
+        cache.get_or_create("b", lambda: 2)
+        cache.get_or_create("a", lambda: 0)
+        cache.get_or_create("c", lambda: 3)
+
+        assert cache.get_or_create("a", lambda: 0) == 1
+        assert cache.get_or_create("b", lambda: 0) == 0
+        assert cache.stats()["size"] == 2
+
+    def test_parse_hits_normalized_text(self):
+        """Testa que consultas com mesma forma normalizada usam o cache."""
+        processor = NLPProcessor(cache_size=8)
+        first = processor.parse("Quais hosts estão com CPU alta?")
+        second = processor.parse("  quais hosts   estão com cpu alta?")
+
+        stats = processor.cache_stats()["parse"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert second.intent == first.intent == QueryIntent.HIGH_CPU
+        assert second.text == "  quais hosts   estão com cpu alta?"
+
+    def test_sql_rebinds_time_range(self):
+        """Testa que o SQL em cache recebe o intervalo de tempo atual."""
+        processor = NLPProcessor(cache_size=8)
+        query = "hosts com cpu acima de 90% nas últimas 2 horas"
+
+        with patch("zabbia.backend.nlp_processor.datetime") as mock_datetime:
+            from datetime import datetime
+            mock_datetime.now.return_value = datetime(2024, 1, 1, 12, 0, 0)
+            sql_first, context_first = processor.generate_sql(query)
+            mock_datetime.now.return_value = datetime(2024, 1, 1, 13, 0, 0)
+            sql_second, context_second = processor.generate_sql(query)
+
+        assert sql_first == sql_second
+        assert processor.cache_stats()["sql"]["hits"] == 1
+        assert context_second["to_time"] - context_first["to_time"] == 3600
+        assert context_second["to_time"] - context_second["from_time"] == 7200
+        assert context_second["threshold"] == 90
+
+    def test_api_call_params_are_copies(self):
+        """Testa que alterar os parâmetros retornados não afeta o cache."""
+        processor = NLPProcessor(cache_size=8)
+        query = "Colocar host db02 em manutenção por 2 horas"
+
+        _, params = processor.generate_api_call(query)
+        params["hostids"].append("10084")
+        method, params = processor.generate_api_call(query)
+
+        assert method == "maintenance.create"
+        assert params["hostids"] == []
+        assert params["active_till"] - params["active_since"] == 7200
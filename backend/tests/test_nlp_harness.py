@@ -0,0 +1,83 @@
+from zabbia.backend.nlp_processor import NLPProcessor
+from zabbia.backend.benchmarks.nlp_harness import check_regressions, legacy_mismatches
+
+BASELINE = {
+    "calibration_ops": 200000,
+    "detect_intent_qps": 72000,
+    "parse_qps": 27000,
+    "parse_cached_qps": 54000,
+    "legacy_qps": 18000,
+    "cache_speedup": 2.0,
+    "parse_vs_legacy": 1.5,
+    "accuracy": {"intent": 0.96, "host": 1.0}
+}
+
+def result(parse_qps, parse_cached_qps, intent=0.96, host=1.0, speed=1.0, legacy_qps=None):
+    """Resultado medido em uma máquina `speed` vezes mais rápida que a do baseline."""
+    return {
+        "calibration_ops": 200000 * speed,
+        "detect_intent_qps": 72000 * speed,
+        "parse_qps": parse_qps,
+        "parse_cached_qps": parse_cached_qps,
+        "legacy_qps": 18000 * speed if legacy_qps is None else legacy_qps,
+        "accuracy": {"intent": intent, "host": host}
+    }
+
+def failed(failures):
+    return [failure.split(":")[0] for failure in failures]
+
+class TestCheckRegressions:
+    """Testes para o critério de regressão do harness do NLPProcessor."""
+
+    def test_slower_machine_is_not_a_regression(self):
+        """Testa que uma máquina mais lenta, com as mesmas vazões relativas, não reprova."""
+        assert check_regressions(result(9000, 18000, speed=1 / 3), BASELINE, 0.25) == []
+
+    def test_slower_parse_is_a_regression(self):
+        """Testa que um parse mais lento reprova mesmo que o ganho do cache aumente."""
+        failures = check_regressions(result(13500, 54000), BASELINE, 0.25)
+        assert failed(failures) == ["normalized.parse_qps", "parse_vs_legacy"]
+
+    def test_slower_parse_on_a_slower_machine(self):
+        """Testa que a normalização pela calibração detecta a regressão em outra máquina."""
+        failures = check_regressions(result(4500, 18000, speed=1 / 3), BASELINE, 0.25)
+        assert "normalized.parse_qps" in failed(failures)
+
+    def test_cache_speedup_drop(self):
+        """Testa que a queda do ganho do cache além da tolerância reprova."""
+        failures = check_regressions(result(27000, 35000), BASELINE, 0.25)
+        assert failed(failures) == ["normalized.parse_cached_qps", "cache_speedup"]
+
+    def test_absolute_gate_is_opt_in(self):
+        """Testa que a vazão bruta só é comparada com absolute=True."""
+        slower = result(9000, 18000, speed=1 / 3)
+        assert check_regressions(slower, BASELINE, 0.25) == []
+        assert "parse_qps" in failed(check_regressions(slower, BASELINE, 0.25, absolute=True))
+
+    def test_accuracy_drop(self):
+        """Testa que a queda de qualquer acurácia reprova."""
+        failures = check_regressions(result(27000, 54000, host=0.99), BASELINE, 0.25)
+        assert failures == ["accuracy.host: 0.99 < 1.0"]
+
+    def test_legacy_mismatch(self):
+        """Testa que uma divergência do matcher combinado com o fluxo anterior reprova."""
+        measured = dict(result(27000, 54000), legacy_mismatches=2)
+        assert failed(check_regressions(measured, BASELINE, 0.25)) == ["legacy_mismatches"]
+
+    def test_baseline_without_ratio(self):
+        """Testa que baselines antigos usam a razão calculada das vazões gravadas."""
+        baseline = {key: value for key, value in BASELINE.items() if key != "cache_speedup"}
+        assert "cache_speedup" in failed(check_regressions(result(27000, 35000), baseline, 0.25))
+
+class TestLegacyEquivalence:
+    """Testes para a comparação com o fluxo anterior de detecção de intenção."""
+
+    def test_matcher_agrees_with_legacy_detection(self):
+        """Testa que o matcher combinado escolhe a mesma intenção que o fluxo anterior."""
+        queries = [
+            "Quais hosts estão com CPU alta nas últimas 3 horas?",
+            "Servidores com memória acima de 85% nas últimas 12 horas",
+            "Colocar host db02 em manutenção por 2 horas",
+            "Quantos hosts existem no ambiente?",
+        ]
+        assert legacy_mismatches(NLPProcessor(cache_size=0), queries) == 0
@@ -0,0 +1,123 @@
+import re
+import pytest
+from zabbia.backend.nlp_processor import NLPProcessor, QueryIntent
+
+# Uma consulta por padrão de cada grupo de intenção, na ordem de intent_patterns.
+# Os padrões com est[áa][ão]o aceitam "estaão"/"estáoo", mas não "estão".
+SAMPLES = {
+    QueryIntent.HIGH_CPU: [
+        "quais servidores com cpu elevada?",
+        "cpu acima de 90% agora",
+        "quais hosts com cpu acima",
+    ],
+    QueryIntent.MEMORY_USAGE: [
+        "servidores com memória alta",
+        "ram maior que 80 %",
+        "uso de memória do banco",
+    ],
+    QueryIntent.DISK_USAGE: [
+        "hosts com disco acima do normal",
+        "armazenamento acima de 90%",
+        "uso de disco no fileserver",
+    ],
+    QueryIntent.HOST_STATUS: [
+        "status dos servidores",
+        "hosts e seu estado",
+        "quais hosts estaão online",
+    ],
+    QueryIntent.HOST_UPTIME: [
+        "uptime dos hosts",
+        "servidores e seu uptime",
+        "desde quando os servidores estão ativos",
+    ],
+    QueryIntent.UNAVAILABLE_SERVICES: [
+        "serviços fora do ar",
+        "quais aplicações estaão down",
+    ],
+    QueryIntent.ALERT_SUMMARY: [
+        "resumo dos alertas de hoje",
+        "problemas: quero um sumário",
+        "alertas críticos",
+    ],
+    QueryIntent.GRAPH_REQUEST: [
+        "gráfico de cpu",
+        "mostrar um chart",
+        "visualizar gráfico",
+    ],
+    QueryIntent.HOST_MAINTENANCE: [
+        "colocar web01 em manutenção",
+        "manutenção do servidor web01",
+        "hosts em manutenção",
+    ],
+}
+
+@pytest.fixture(scope="module")
+def processor():
+    return NLPProcessor(cache_size=0)
+
+def first_matching_intent(processor, text):
+    """Implementação de referência: testa cada padrão separadamente, em ordem."""
+    for intent, patterns in processor.intent_patterns.items():
+        if any(re.search(pattern, text) for pattern in patterns):
+            return intent
+    return QueryIntent.GENERAL_QUERY
+
+class TestIntentMatching:
+    """Testes para a detecção de intenção com o regex combinado."""
+
+    def test_every_pattern_has_a_sample(self, processor):
+        """Testa que cada padrão é coberto por uma consulta de exemplo."""
+        for intent, patterns in processor.intent_patterns.items():
+            for pattern in patterns:
+                assert any(re.search(pattern, text) for text in SAMPLES[intent]), pattern
+
+    @pytest.mark.parametrize("intent, text", [
+        (intent, text) for intent, texts in SAMPLES.items() for text in texts
+    ])
+    def test_intent_per_pattern_group(self, processor, intent, text):
+        """Testa que o regex combinado retorna a intenção do grupo e a da referência."""
+        assert processor.detect_intent(text) == intent
+        assert processor.detect_intent(text) == first_matching_intent(processor, text)
+
+    def test_group_order_is_priority(self, processor):
+        """Testa que, com vários grupos compatíveis, vale o primeiro declarado."""
+        text = "gerar gráfico dos hosts com cpu alta"
+        assert processor.detect_intent(text) == QueryIntent.HIGH_CPU
+
+    def test_unknown_query(self, processor):
+        """Testa o retorno de consulta geral quando nenhum padrão corresponde."""
+        assert processor.detect_intent("bom dia") == QueryIntent.GENERAL_QUERY
+
+    def test_recompiled_patterns(self):
+        """Testa que padrões alterados passam a valer após _compile_patterns()."""
+        processor = NLPProcessor(cache_size=0)
+        processor.intent_patterns[QueryIntent.HOST_UPTIME].append(r"tempo ligado")
+        processor._compile_patterns()
+
+        assert processor.detect_intent("tempo ligado do web01") == QueryIntent.HOST_UPTIME
+
+class TestParse:
+    """Testes para a análise única da consulta."""
+
+    def test_extracts_all_parameters(self, processor):
+        """Testa a extração de host, limite, duração e período em uma só análise."""
+        parsed = processor.parse("colocar host: web01 em manutenção por 2 horas")
+
+        assert parsed.intent == QueryIntent.HOST_MAINTENANCE
+        assert parsed.host == "web01"
+        assert parsed.duration_minutes == 120
+
+        parsed = processor.parse("servidores com cpu acima de 95% nas últimas 3 horas")
+
+        assert parsed.intent == QueryIntent.HIGH_CPU
+        assert parsed.threshold == 95
+        assert parsed.time_range.time_period == "3h"
+        assert parsed.host is None
+
+    def test_defaults(self, processor):
+        """Testa os valores padrão quando a consulta não informa parâmetros."""
+        parsed = processor.parse("status dos servidores")
+
+        assert parsed.threshold_or(80) == 80
+        assert parsed.duration_or(60) == 60
+        assert parsed.time_range.time_period == "24h"
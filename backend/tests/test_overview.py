@@ -0,0 +1,74 @@
+import time
+import asyncio
+from collections import Counter
+from app.services.overview import OverviewBuilder
+
+class FakeZabbixService:
+    """Serviço que conta as chamadas e simula a latência do Zabbix."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = Counter()
+
+    async def _call(self, name, result):
+        self.calls[name] += 1
+        await asyncio.sleep(self.delay)
+        return result
+
+    async def get_active_hosts(self):
+        return await self._call("hosts", [{"hostid": "10001", "name": "web01"}])
+
+    async def get_cpu_metrics(self, hours):
+        return await self._call("cpu", [])
+
+    async def get_memory_metrics(self, hours):
+        return await self._call("memory", [])
+
+    async def get_availability_metrics(self, hours):
+        return await self._call("availability", [{"host_id": "10001", "data": {"availability_percent": 99.5}}])
+
+    async def get_average_uptime(self, availability):
+        return await self._call("avg_uptime", availability[0]["data"]["availability_percent"])
+
+    async def get_hosts_in_alert(self):
+        return await self._call("hosts_in_alert", [])
+
+class TestOverviewBuilder:
+    """Testes para a montagem da visão geral do dashboard."""
+
+    def test_shared_results_are_fetched_once(self):
+        """Testa que a disponibilidade é buscada uma vez e reaproveitada pelo uptime médio."""
+        service = FakeZabbixService()
+
+        overview = asyncio.run(OverviewBuilder(service).build())
+
+        assert service.calls["availability"] == 1
+        assert set(service.calls.values()) == {1}
+        assert overview["avg_uptime"] == 99.5
+        assert overview["hosts"][0]["name"] == "web01"
+        assert {"hosts", "cpu", "memory", "availability", "avg_uptime", "hosts_in_alert", "total"} <= overview["timings"].keys()
+
+    def test_memo_hit_reuses_task(self):
+        """Testa que chamadas repetidas na mesma requisição não consultam o Zabbix de novo."""
+        service = FakeZabbixService(delay=0)
+        builder = OverviewBuilder(service)
+
+        async def run():
+            await asyncio.gather(builder.availability(), builder.availability(), builder.avg_uptime())
+            return await builder.availability()
+
+        asyncio.run(run())
+
+        assert service.calls["availability"] == 1
+        assert service.calls["avg_uptime"] == 1
+
+    def test_independent_parts_run_in_parallel(self):
+        """Testa que as consultas independentes são executadas em paralelo."""
+        service = FakeZabbixService(delay=0.1)
+
+        started = time.perf_counter()
+        asyncio.run(OverviewBuilder(service).build())
+        elapsed = time.perf_counter() - started
+
+        # Seis consultas de 0,1 s; apenas o uptime médio espera a disponibilidade
+        assert elapsed < 0.35
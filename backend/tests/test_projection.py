@@ -0,0 +1,102 @@
+import pytest
+from zabbia.backend.zabbix_projection import FieldProjection, projection_tracker
+from zabbia.backend.services.catalog import ZabbixCatalog
+
+HOST_PROJECTION = FieldProjection(
+    "hosts",
+    ["hostid", "name"],
+    selectInterfaces=["ip"],
+    selectParentTemplates="count"
+)
+
+@pytest.fixture
+def tracker():
+    projection_tracker.reset()
+    projection_tracker.enabled = True
+    yield projection_tracker
+    projection_tracker.enabled = False
+    projection_tracker.reset()
+
+class TestFieldProjection:
+    """Testes para a projeção de campos das chamadas *.get."""
+
+    def test_to_params(self):
+        """Testa que apenas os campos declarados são solicitados."""
+        assert HOST_PROJECTION.to_params() == {
+            "output": ["hostid", "name"],
+            "selectInterfaces": ["ip"],
+            "selectParentTemplates": "count"
+        }
+
+    def test_extend_and_fields(self):
+        """Testa a extensão sem duplicar campos e os nomes dos sub-campos."""
+        extended = HOST_PROJECTION.extend("hosts_status", ["name", "status"], selectInterfaces=["ip", "dns"])
+
+        assert extended.to_params()["output"] == ["hostid", "name", "status"]
+        assert extended.fields() == ["hostid", "name", "status", "interfaces.ip", "interfaces.dns", "parentTemplates"]
+        assert HOST_PROJECTION.to_params()["selectInterfaces"] == ["ip"]
+
+    def test_catalog_requests_projected_output(self):
+        """Testa que o catálogo envia a projeção em vez de output=extend."""
+        calls = []
+
+        def fetcher(method, params):
+            calls.append((method, params))
+            return []
+
+        ZabbixCatalog(fetcher=fetcher).refresh(full=True)
+
+        params = dict(calls)
+        assert params["host.get"] == {"output": ["hostid", "host", "name", "status"], "selectInterfaces": ["ip"]}
+        assert "extend" not in params["item.get"]["output"]
+
+class TestProjectionTracker:
+    """Testes para o relatório de campos buscados e não utilizados."""
+
+    def test_disabled_returns_records_unchanged(self):
+        """Testa que sem depuração os registros não são instrumentados."""
+        records = [{"hostid": "1"}]
+        assert HOST_PROJECTION.track(records) is records
+
+    def test_reports_unused_fields(self, tracker):
+        """Testa que apenas os campos lidos deixam de aparecer no relatório."""
+        records = HOST_PROJECTION.track([
+            {"hostid": "1", "name": "web01", "interfaces": [{"ip": "10.0.0.1"}], "parentTemplates": "2"}
+        ])
+
+        host = records[0]
+        assert host["name"] == "web01"
+        assert host.get("interfaces")[0]["ip"] == "10.0.0.1"
+
+        assert tracker.report() == {"hosts": ["hostid", "parentTemplates"]}
+
+    def test_serialization_marks_all_fields(self, tracker):
+        """Testa que iterar ou copiar o registro (como na serialização da resposta) marca todos os campos."""
+        records = HOST_PROJECTION.track([
+            {"hostid": "1", "name": "web01", "interfaces": [{"ip": "10.0.0.1"}], "parentTemplates": "2"}
+        ])
+
+        data = {key: value for key, value in records[0].items()}
+        [dict(interface) for interface in data["interfaces"]]
+
+        assert tracker.report() == {"hosts": []}
+
+class TestDefaultProjections:
+    """Testes para as projeções padrão dos métodos usados pelas rotas HTTP."""
+
+    def test_http_facing_defaults_keep_baseline_fields(self):
+        """Testa que /hosts e /problems continuam recebendo os registros completos."""
+        from zabbia.backend.zabbix_api import HOST_DEFAULT_PROJECTION, PROBLEM_DEFAULT_PROJECTION
+
+        assert HOST_DEFAULT_PROJECTION.to_params() == {
+            "output": "extend",
+            "selectInterfaces": ["ip", "dns", "useip", "port", "type"],
+            "selectGroups": "extend",
+            "selectTags": "extend",
+            "selectInventory": True
+        }
+        assert PROBLEM_DEFAULT_PROJECTION.to_params() == {
+            "output": "extend",
+            "selectHosts": ["hostid", "name"],
+            "selectTags": "extend"
+        }
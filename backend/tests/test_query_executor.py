@@ -0,0 +1,71 @@
+import pytest
+from contextlib import contextmanager
+from decimal import Decimal
+from zabbia.backend.nlp_processor import NLPProcessor
+from zabbia.backend.query_executor import QueryExecutor, compile_plan, LIMIT_PARAM
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.description = [("hostid",), ("cpu_usage",)]
+        self.executed = None
+
+    def execute(self, sql, params):
+        self.executed = (sql, params)
+        self.rows = self.rows[:params[-1]]
+
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        pass
+
+class FakeDBClient:
+    def __init__(self, rows):
+        self.cursor = FakeCursor(rows)
+
+    @contextmanager
+    def get_connection(self):
+        client = self
+
+        class Connection:
+            def cursor(self, prepared=False):
+                assert prepared
+                return client.cursor
+
+        yield Connection()
+
+class TestQueryExecutor:
+    """Testes para a execução dos SQL gerados pelo NLPProcessor."""
+
+    def test_compile_plan_orders_params(self):
+        """Testa a conversão de placeholders nomeados e o LIMIT acrescentado."""
+        plan = compile_plan("SELECT 1 FROM t WHERE a > :from_time AND b <= :to_time AND c > :from_time;")
+
+        assert plan.sql.count("%s") == 4
+        assert ":" not in plan.sql
+        assert plan.param_names == ("from_time", "to_time", "from_time", LIMIT_PARAM)
+
+    def test_compile_plan_keeps_existing_limit(self):
+        """Testa que um LIMIT existente não é duplicado."""
+        plan = compile_plan("SELECT 1 FROM t LIMIT 10")
+
+        assert plan.param_names == ()
+
+    def test_execute_generated_sql(self):
+        """Testa a execução de um SQL gerado com limite de linhas."""
+        processor = NLPProcessor(cache_size=0)
+        sql, context = processor.generate_sql("hosts com cpu acima de 90% no host web01")
+
+        rows = [("1", Decimal("95.5")), ("2", Decimal("93.0")), ("3", Decimal("91.2"))]
+        db_client = FakeDBClient(rows)
+        executor = QueryExecutor(db_client, row_limit=2, fetch_size=1)
+
+        result = executor.execute(sql, context)
+
+        executed_sql, params = db_client.cursor.executed
+        assert params == (context["from_time"], context["to_time"], "%web01%", 90, 3)
+        assert result["rows"] == [{"hostid": "1", "cpu_usage": 95.5}, {"hostid": "2", "cpu_usage": 93.0}]
+        assert result["truncated"] is True
+        assert executor.plan(sql) is executor.plan(sql)
@@ -0,0 +1,63 @@
+import pytest
+from app.services.series import bucket_width, bucket_series, BUCKET_AGGREGATIONS
+
+SERIES = {
+    "item_id": "28001",
+    "name": "CPU utilization",
+    "timestamps": [1000, 1010, 1030, 1060, 1065, 1150],
+    "values": [1.0, 5.0, 3.0, 2.0, 4.0, 7.0]
+}
+
+class TestBucketWidth:
+    """Testes para a largura dos intervalos de agregação."""
+
+    def test_rounds_up_to_fit_max_points(self):
+        """Testa que a largura é arredondada para cima e tem no mínimo 1 segundo."""
+        assert bucket_width(0, 99, 10) == 10
+        assert bucket_width(0, 100, 10) == 11
+        assert bucket_width(0, 5, 100) == 1
+        assert bucket_width(10, 10, 100) == 1
+
+    @pytest.mark.parametrize("max_points", [2, 7, 1000])
+    def test_points_never_exceed_max_points(self, max_points):
+        """Testa que uma série densa gera no máximo `max_points` pontos."""
+        clock_from, clock_till = 0, 86399
+        series = {"timestamps": list(range(clock_from, clock_till + 1, 7)), "values": [1.0] * 12343}
+        width = bucket_width(clock_from, clock_till, max_points)
+
+        result = bucket_series(series, clock_from, width, "avg")
+
+        assert len(result["timestamps"]) <= max_points
+
+class TestBucketSeries:
+    """Testes para a agregação das séries em intervalos."""
+
+    def test_min_avg_max_per_bucket(self):
+        """Testa mínimo, média e máximo de cada intervalo não vazio."""
+        result = bucket_series(SERIES, 1000, 50)
+
+        assert result["min"] == [1.0, 2.0, 7.0]
+        assert result["avg"] == [3.0, 3.0, 7.0]
+        assert result["max"] == [5.0, 4.0, 7.0]
+        assert "values" not in result
+
+    def test_timestamps_are_bucket_starts(self):
+        """Testa que o timestamp de cada ponto é o início do intervalo (intervalos vazios omitidos)."""
+        result = bucket_series(SERIES, 1000, 50)
+
+        assert result["timestamps"] == [1000, 1050, 1150]
+        assert result["item_id"] == "28001"
+        assert result["name"] == "CPU utilization"
+
+    @pytest.mark.parametrize("agg, expected", [
+        ("min", [1.0, 2.0, 7.0]),
+        ("avg", [3.0, 3.0, 7.0]),
+        ("max", [5.0, 4.0, 7.0])
+    ])
+    def test_single_aggregation(self, agg, expected):
+        """Testa que agg diferente de 'all' retorna apenas 'values'."""
+        result = bucket_series(SERIES, 1000, 50, agg)
+
+        assert agg in BUCKET_AGGREGATIONS
+        assert result["values"] == expected
+        assert not {"min", "avg", "max"} & result.keys()
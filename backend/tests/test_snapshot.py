@@ -0,0 +1,40 @@
+import asyncio
+import pytest
+from app.services.snapshot import SnapshotEngine
+
+class TestSnapshotEngine:
+    """Testes para o snapshot pré-calculado do dashboard."""
+
+    def test_forced_refresh_failure_serves_stale_snapshot(self):
+        """Testa que uma atualização forçada com erro mantém o snapshot anterior."""
+        builds = []
+
+        def builder():
+            builds.append(1)
+            if len(builds) > 1:
+                raise RuntimeError("zabbix indisponível")
+            return {"hosts": 3}
+
+        engine = SnapshotEngine("teste", builder, min_force_interval=0, redis_url=None)
+
+        async def run():
+            first = await engine.get()
+            stale = await engine.get(force=True)
+            return first, stale
+
+        first, stale = asyncio.run(run())
+
+        assert first["snapshot"]["refreshed"] is True
+        assert stale["hosts"] == 3
+        assert stale["snapshot"]["refreshed"] is False
+        assert stale["snapshot"]["last_error"] == "zabbix indisponível"
+
+    def test_forced_refresh_failure_without_snapshot_raises(self):
+        """Testa que o erro é propagado quando ainda não há snapshot."""
+        def builder():
+            raise RuntimeError("zabbix indisponível")
+
+        engine = SnapshotEngine("teste", builder, min_force_interval=0, redis_url=None)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(engine.get(force=True))
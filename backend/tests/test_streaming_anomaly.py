@@ -0,0 +1,93 @@
+import json
+import pytest
+import numpy as np
+import pandas as pd
+from zabbia.backend.utils.streaming_anomaly import StreamingAnomalyDetector
+
+def make_history(values, start=1000, step=60):
+    return [{"clock": str(start + i * step), "value": str(v)} for i, v in enumerate(values)]
+
+class TestStreamingAnomalyDetector:
+    """Testes para o detector de anomalias incremental."""
+
+    def test_matches_trailing_rolling_window(self):
+        """Testa que média e desvio equivalem a uma janela móvel das amostras anteriores."""
+        values = np.random.default_rng(7).normal(50, 5, 300)
+        values[[100, 200]] = [120, -20]
+        detector = StreamingAnomalyDetector(window=10, threshold=3.0)
+
+        results = [detector.update("1", 1000 + i, v) for i, v in enumerate(values)]
+
+        series = pd.Series(values)
+        mean = series.rolling(10).mean().shift(1)
+        std = series.rolling(10).std().shift(1)
+        np.testing.assert_allclose([r["mean"] for r in results[10:]], mean[10:], rtol=1e-9)
+        np.testing.assert_allclose([r["std"] for r in results[10:]], std[10:], rtol=1e-9)
+
+        expected = (series - mean).abs() > 3.0 * std
+        assert [r["is_anomaly"] for r in results] == expected.tolist()
+        assert results[100]["is_anomaly"] and results[200]["is_anomaly"]
+
+    def test_ignores_replayed_history(self):
+        """Testa que amostras já processadas não alteram o estado."""
+        detector = StreamingAnomalyDetector(window=5)
+        history = make_history([10, 11, 10, 11, 10, 50])
+
+        assert [a["clock"] for a in detector.update_history("1", history)] == [1300]
+        assert detector.update_history("1", history) == []
+        assert detector.update("1", 1300, 99) is None
+        assert detector.update("1", 1360, float("nan")) is None
+
+    def test_checkpoint_and_restore(self):
+        """Testa que o detector restaurado continua exatamente de onde parou."""
+        values = np.random.default_rng(3).normal(0, 1, 60)
+        original = StreamingAnomalyDetector(window=8)
+        original.update_history("1", make_history(values[:40]))
+        original.update_history("2", make_history(values[:5]))
+
+        state = json.loads(json.dumps(original.checkpoint()))
+        restored = StreamingAnomalyDetector.from_checkpoint(state)
+
+        assert len(restored) == 2
+        for i, value in enumerate(values[40:], start=40):
+            clock = 1000 + i * 60
+            expected = original.update("1", clock, value)
+            result = restored.update("1", clock, value)
+            assert result["mean"] == pytest.approx(expected["mean"])
+            assert result["is_anomaly"] == expected["is_anomaly"]
+
+        with pytest.raises(ValueError):
+            restored.restore({"version": 0})
+
+    def test_samples_in_the_same_second(self):
+        """Testa que amostras no mesmo segundo são distinguidas pelo ns."""
+        detector = StreamingAnomalyDetector(window=3)
+        history = [
+            {"clock": "1000", "ns": "500000000", "value": "2"},
+            {"clock": "1000", "ns": "0", "value": "1"},
+            {"clock": "1001", "ns": "0", "value": "3"},
+        ]
+        detector.update_history("1", history)
+
+        assert detector.checkpoint()["items"]["1"]["values"] == [1.0, 2.0, 3.0]
+        assert detector.update("1", 1001, 4.0, ns=0) is None
+        assert detector.update("1", 1001, 4.0, ns=1)["ns"] == 1
+
+        restored = StreamingAnomalyDetector.from_checkpoint(detector.checkpoint())
+        assert restored.update("1", 1001, 5.0, ns=1) is None
+        assert restored.update("1", 1001, 5.0, ns=2) is not None
+
+    def test_malformed_records_are_skipped(self):
+        """Testa que registros sem clock ou com valores não numéricos não interrompem o lote."""
+        detector = StreamingAnomalyDetector(window=3)
+        history = [
+            {"clock": "1002", "value": "3"},
+            {"value": "9"},
+            {"clock": "abc", "value": "9"},
+            {"clock": "1001", "value": "n/a"},
+            {"clock": "1000", "ns": None, "value": "1"},
+            {"clock": "1001", "value": "2"},
+        ]
+
+        assert detector.update_history("1", history) == []
+        assert detector.checkpoint()["items"]["1"]["values"] == [2.0, 3.0]
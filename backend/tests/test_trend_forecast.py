@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+import pandas as pd
+from zabbia.backend.utils.zabbix_analyzer import ZabbixAnalyzer
+
+def loop_prediction(values, periods_ahead=5, alpha=0.3):
+    """Implementação original (laço em Python) usada como referência."""
+    ema = [values[0]]
+    for i in range(1, len(values)):
+        ema.append(alpha * values[i] + (1 - alpha) * ema[i - 1])
+    std = np.std(values[-10:]) if len(values) >= 10 else np.std(values)
+    return [ema[-1]] * periods_ahead, [1.96 * std] * periods_ahead
+
+class TestTrendForecast:
+    """Testes para a previsão de tendência vetorizada."""
+
+    @pytest.mark.parametrize("size", [1, 2, 9, 10, 500])
+    def test_matches_loop_implementation(self, size):
+        """Testa que o resultado é o mesmo da recursão original."""
+        values = np.random.default_rng(size).normal(50, 10, size)
+        forecast, confidence = ZabbixAnalyzer.generate_trend_prediction(pd.DataFrame({"value": values}))
+        expected_forecast, expected_confidence = loop_prediction(values)
+
+        assert forecast == pytest.approx(expected_forecast, rel=1e-12)
+        assert confidence == pytest.approx(expected_confidence, rel=1e-12)
+
+    def test_batch_matches_ewm_with_gaps(self):
+        """Testa a previsão em lote, inclusive séries com pontos ausentes."""
+        matrix = np.random.default_rng(1).normal(50, 10, (6, 200))
+        matrix[1, :30] = np.nan
+        matrix[2, [50, 51, 199]] = np.nan
+        matrix[3, :] = np.nan
+
+        forecast, confidence = ZabbixAnalyzer.forecast_batch(matrix, periods_ahead=3)
+
+        expected = [
+            pd.Series(row).ewm(alpha=0.3, adjust=False, ignore_na=True).mean().iloc[-1]
+            for row in matrix
+        ]
+        assert forecast.shape == confidence.shape == (6, 3)
+        np.testing.assert_allclose(forecast[:, 0], expected)
+        assert np.isnan(forecast[3]).all()
+
+    def test_align_history(self):
+        """Testa o alinhamento do histórico de vários itens em uma grade comum."""
+        history = {
+            "1": [{"clock": str(100 + i * 30), "value": str(i)} for i in range(4)],
+            "2": [{"clock": "160", "value": "5"}],
+        }
+
+        item_ids, grid, matrix = ZabbixAnalyzer.align_history(history, interval=60)
+
+        assert item_ids == ["1", "2"]
+        assert grid.tolist() == [100, 160]
+        np.testing.assert_allclose(matrix, [[0.5, 2.5], [np.nan, 5.0]])
@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+from app.services.zabbix_connection import ZabbixConnection
+
+class FakeResponse:
+    def __init__(self, result):
+        self._result = result
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return self._result
+
+class FakeSession:
+    """Sessão HTTP que invalida a conexão durante a requisição, como um salvamento das configurações."""
+
+    closed = False
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.urls = []
+
+    def post(self, url, json):
+        self.urls.append(url)
+        self.connection.invalidate()
+        result = "token" if json["method"] == "user.login" else [{"hostid": "1"}]
+        return FakeResponse({"result": result})
+
+class TestZabbixConnection:
+    """Testes para a conexão compartilhada com a API do Zabbix."""
+
+    def test_invalidate_during_call_uses_captured_url(self):
+        """Testa que login e chamada usam a URL obtida junto com as credenciais."""
+        connection = ZabbixConnection()
+        connection._load_credentials = lambda: {"url": "http://zabbix", "username": "Admin", "password": "zabbix"}
+        session = FakeSession(connection)
+        connection._session = session
+
+        result = asyncio.run(connection.call("host.get"))
+
+        assert result == [{"hostid": "1"}]
+        assert session.urls == ["http://zabbix/api_jsonrpc.php"] * 2
+        assert connection.api_url is None
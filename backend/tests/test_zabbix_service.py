@@ -227,6 +227,7 @@ class TestZabbixService:
         }
         
         # Configurar o comportamento do mock para retornar diferentes respostas
+        # (uma única busca de itens e um history.get em lote para toda a frota)
         def side_effect_func(*args, **kwargs):
             method = args[0]
             params = args[1] if len(args) > 1 else {}
@@ -236,14 +237,12 @@ class TestZabbixService:
             elif method == 'item.get':
                 return mock_items_response
             elif method == 'history.get':
-                if 'itemids' in params and params['itemids'] == '28336':
-                    return mock_history_10084
-                elif 'itemids' in params and params['itemids'] == '28337':
-                    return mock_history_10085
+                assert params['itemids'] == ['28336', '28337']
+                return {"result": mock_history_10084["result"] + mock_history_10085["result"]}
             
             return {"result": []}
         
-        mock_zabbix_api.return_value.do_request.side_effect = side_effect_func
+        mock_zabbix_api.do_request.side_effect = side_effect_func
         
         # Executar
         service = ZabbixService("http://example.com", "user", "pass")
@@ -254,4 +253,59 @@ class TestZabbixService:
         assert high_cpu_hosts[0]['hostid'] == '10084'
         assert high_cpu_hosts[0]['name'] == 'Servidor Web 1'
         assert 'cpu_max' in high_cpu_hosts[0]
-        assert high_cpu_hosts[0]['cpu_max'] == '88.7'  # Deve capturar o valor máximo 
\ No newline at end of file
+        assert high_cpu_hosts[0]['cpu_max'] == '88.7'  # Deve capturar o valor máximo
+        
+        # Apenas três chamadas, independentemente do número de hosts
+        called_methods = [call[0][0] for call in mock_zabbix_api.do_request.call_args_list]
+        assert called_methods == ['item.get', 'history.get', 'host.get']
+    
+    def test_scan_threshold_aggregations(self, mock_zabbix_api):
+        """Testa o motor de varredura com agregações e operadores arbitrários."""
+        # Configurar: dois itens no mesmo host e um item em outro host
+        mock_items_response = {
+            "result": [
+                {"itemid": "1", "hostid": "10084", "name": "Free memory", "key_": "vm.memory.size[pavailable]", "value_type": "0"},
+                {"itemid": "2", "hostid": "10084", "name": "Free swap", "key_": "vm.memory.size[pfree]", "value_type": "3"},
+                {"itemid": "3", "hostid": "10085", "name": "Free memory", "key_": "vm.memory.size[pavailable]", "value_type": "0"}
+            ]
+        }
+        
+        history_by_type = {
+            0: [
+                {"itemid": "1", "value": "30"}, {"itemid": "1", "value": "8"},
+                {"itemid": "3", "value": "50"}, {"itemid": "3", "value": "40"}
+            ],
+            3: [
+                {"itemid": "2", "value": "5"}, {"itemid": "2", "value": "20"}
+            ]
+        }
+        
+        def side_effect_func(method, params):
+            if method == 'item.get':
+                return mock_items_response
+            elif method == 'history.get':
+                return {"result": history_by_type[params['history']]}
+            elif method == 'host.get':
+                return {"result": [
+                    {"hostid": hostid, "host": f"h{hostid}", "name": f"Host {hostid}"}
+                    for hostid in params['hostids']
+                ]}
+            return {"result": []}
+        
+        mock_zabbix_api.do_request.side_effect = side_effect_func
+        service = ZabbixService("http://example.com", "user", "pass")
+        
+        # Mínimo abaixo de 10: o host 10084 deve reportar o item mais baixo (swap = 5)
+        low = service.scan_threshold('vm.memory.size*', 10, '<', 'min', '1h')
+        assert [host['hostid'] for host in low] == ['10084']
+        assert low[0]['itemid'] == '2'
+        assert low[0]['value'] == 5.0
+        
+        # Média maior ou igual a 45: apenas o host 10085
+        high_avg = service.scan_threshold('vm.memory.size*', 45, '>=', 'avg', '1h')
+        assert [host['hostid'] for host in high_avg] == ['10085']
+        assert high_avg[0]['value'] == 45.0
+        
+        # Operador inválido
+        with pytest.raises(ValueError):
+            service.scan_threshold('vm.memory.size*', 10, '=>')
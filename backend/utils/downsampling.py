@@ -0,0 +1,89 @@
+import numpy as np
+from operator import itemgetter
+from typing import List, Dict, Any, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Quantidade padrão de pontos enviados ao frontend por série
+DEFAULT_MAX_POINTS = 2000
+
+_get_clock = itemgetter('clock')
+_get_value = itemgetter('value')
+
+def parse_history(history: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converte registros de histórico do Zabbix em vetores NumPy.
+
+    A conversão de texto para número é feita em bloco pelo NumPy, sem
+    chamadas int()/float() por registro.
+
+    Args:
+        history: Registros retornados por history.get (clock e value como texto)
+
+    Returns:
+        Tupla (clocks em segundos como int64, valores como float64)
+    """
+    if not history:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    clocks = np.array(list(map(_get_clock, history)), dtype=np.int64)
+    values = np.array(list(map(_get_value, history)), dtype=np.float64)
+    return clocks, values
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduz uma série com o algoritmo Largest-Triangle-Three-Buckets.
+
+    O primeiro e o último ponto são mantidos; os demais são divididos em
+    n_out - 2 faixas e, em cada uma, é escolhido o ponto que forma o maior
+    triângulo com o ponto escolhido na faixa anterior e a média da faixa
+    seguinte. Picos e vales são preservados, ao contrário de uma média simples.
+
+    Args:
+        x: Eixo x ordenado (ex: timestamps)
+        y: Valores
+        n_out: Quantidade de pontos desejada
+
+    Returns:
+        Tupla (x, y) reduzida
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+
+    if n_out >= n or n <= 2:
+        return x, y
+    if n_out < 3:
+        return x[[0, n - 1]], y[[0, n - 1]]
+
+    xf = x.astype(np.float64)
+
+    # Limites das faixas: n_out - 2 faixas internas seguidas do último ponto
+    every = (n - 2) / (n_out - 2)
+    edges = np.empty(n_out, dtype=np.int64)
+    edges[:-1] = np.floor(np.arange(n_out - 1) * every).astype(np.int64) + 1
+    edges[-2] = n - 1
+    edges[-1] = n
+
+    # Médias de todas as faixas calculadas de uma vez
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(xf, edges[:-1]) / counts
+    avg_y = np.add.reduceat(y, edges[:-1]) / counts
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        ax, ay = xf[a], y[a]
+        areas = np.abs(
+            (ax - avg_x[i + 1]) * (y[start:end] - ay)
+            - (ax - xf[start:end]) * (avg_y[i + 1] - ay)
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return x[selected], y[selected]
@@ -0,0 +1,183 @@
+import threading
+import logging
+from collections import deque
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+class HostNameMatcher:
+    """
+    Reconhecedor de menções a hosts baseado no autômato de Aho-Corasick.
+
+    Os nomes técnicos e visíveis dos hosts são inseridos em uma trie única;
+    a busca percorre a consulta uma só vez, em tempo linear no tamanho do
+    texto mais o número de ocorrências, independentemente de quantos hosts existem.
+    """
+
+    def __init__(self):
+        """Inicializa um autômato vazio"""
+        self._lock = threading.RLock()
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output_link: List[int] = [0]
+        self._depth: List[int] = [0]
+        self._terminal: Dict[int, Set[str]] = {}
+        self._patterns_by_host: Dict[str, Set[str]] = {}
+        self._dirty = False
+
+    @classmethod
+    def from_catalog(cls, catalog: Any) -> 'HostNameMatcher':
+        """
+        Cria um reconhecedor sincronizado com o catálogo de hosts.
+
+        Args:
+            catalog: Catálogo com os métodos hosts() e add_listener()
+
+        Returns:
+            Instância de HostNameMatcher
+        """
+        matcher = cls()
+        for host in catalog.hosts():
+            matcher.add_host(host)
+        catalog.add_listener(matcher.on_hosts_changed)
+        return matcher
+
+    def __len__(self) -> int:
+        return len(self._patterns_by_host)
+
+    def _node_for(self, pattern: str) -> int:
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output_link.append(0)
+                self._depth.append(self._depth[node] + 1)
+                self._goto[node][char] = next_node
+            node = next_node
+        return node
+
+    def add_host(self, host: Dict[str, Any]) -> None:
+        """
+        Adiciona (ou atualiza) os nomes de um host no autômato.
+
+        Args:
+            host: Host com 'hostid', 'host' e 'name'
+        """
+        host_id = str(host['hostid'])
+        patterns = {
+            name.lower() for name in (host.get('host'), host.get('name')) if name
+        }
+
+        with self._lock:
+            self._remove_patterns(host_id)
+            for pattern in patterns:
+                node = self._node_for(pattern)
+                self._terminal.setdefault(node, set()).add(host_id)
+            self._patterns_by_host[host_id] = patterns
+            self._dirty = True
+
+    def remove_host(self, host_id: str) -> None:
+        """
+        Remove os nomes de um host do autômato.
+
+        Args:
+            host_id: ID do host
+        """
+        with self._lock:
+            self._remove_patterns(str(host_id))
+            self._patterns_by_host.pop(str(host_id), None)
+
+    def _remove_patterns(self, host_id: str) -> None:
+        for pattern in self._patterns_by_host.get(host_id, ()):
+            node = 0
+            for char in pattern:
+                node = self._goto[node][char]
+            owners = self._terminal.get(node)
+            if owners is not None:
+                owners.discard(host_id)
+                if not owners:
+                    del self._terminal[node]
+                    self._dirty = True
+
+    def on_hosts_changed(self, updated: List[Dict[str, Any]], removed: List[Dict[str, Any]]) -> None:
+        """Callback do catálogo: aplica as alterações de hosts"""
+        for host in removed:
+            self.remove_host(host['hostid'])
+        for host in updated:
+            self.add_host(host)
+
+    def _build_links(self) -> None:
+        """Recalcula os links de falha e de saída (BFS sobre a trie)"""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            self._output_link[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+
+                # Próximo estado terminal na cadeia de falhas
+                fail_node = self._fail[child]
+                self._output_link[child] = fail_node if fail_node in self._terminal else self._output_link[fail_node]
+                queue.append(child)
+
+        self._dirty = False
+
+    def find_all(self, text: str) -> List[Tuple[str, int, int]]:
+        """
+        Encontra todas as menções a hosts no texto.
+
+        Args:
+            text: Texto já normalizado em minúsculas
+
+        Returns:
+            Lista de tuplas (hostid, início, fim)
+        """
+        matches = []
+        with self._lock:
+            if self._dirty:
+                self._build_links()
+
+            goto = self._goto
+            fail = self._fail
+            node = 0
+            for position, char in enumerate(text):
+                while node and char not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(char, 0)
+
+                match_node = node if node in self._terminal else self._output_link[node]
+                while match_node:
+                    start = position - self._depth[match_node] + 1
+                    for host_id in self._terminal.get(match_node, ()):
+                        matches.append((host_id, start, position + 1))
+                    match_node = self._output_link[match_node]
+
+        return matches
+
+    def best_match(self, text: str) -> Optional[str]:
+        """
+        Retorna o host com a menção mais longa no texto (a mais específica).
+
+        Args:
+            text: Texto já normalizado em minúsculas
+
+        Returns:
+            ID do host ou None se nenhum host for mencionado
+        """
+        matches = self.find_all(text)
+        if not matches:
+            return None
+
+        host_id, _, _ = max(matches, key=lambda match: (match[2] - match[1], -match[1]))
+        return host_id
@@ -0,0 +1,273 @@
+import math
+import threading
+import logging
+from collections import Counter
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Similaridade mínima para aceitar um host como correspondente
+DEFAULT_MIN_SIMILARITY = 0.3
+
+# Fração da melhor pontuação que os demais candidatos precisam atingir
+RELATIVE_CUTOFF = 0.8
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Gera os trigramas de um nome, com preenchimento nas bordas (como o pg_trgm).
+
+    Args:
+        text: Nome já normalizado em minúsculas
+
+    Returns:
+        Conjunto de trigramas
+    """
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class HostResolver:
+    """
+    Resolve menções a hosts (possivelmente parciais ou com erros de digitação)
+    para IDs de hosts, usando um índice invertido de trigramas.
+
+    Os nomes técnicos e visíveis dos hosts são indexados por trigrama. Os
+    candidatos vêm apenas das listas dos trigramas mais raros da menção
+    (filtro de prefixo) e são avaliados em ordem decrescente de trigramas em
+    comum, parando quando nenhum restante pode atingir a pontuação mínima.
+    A pontuação é a similaridade de Jaccard; menções contidas em um nome
+    também são aceitas.
+
+    resolve() é aproximado e serve para sugestões. Para filtrar consultas use
+    exact_ids() e containing_ids(), que nunca trocam o host mencionado por
+    outro parecido (ex: 'db03' por db01).
+    """
+
+    def __init__(self, min_similarity: float = DEFAULT_MIN_SIMILARITY):
+        """
+        Inicializa um índice vazio.
+
+        Args:
+            min_similarity: Similaridade mínima (0 a 1) para aceitar um host
+        """
+        self.min_similarity = min_similarity
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Set[str]] = {}
+        self._trigrams_by_name: Dict[str, Set[str]] = {}
+        self._hosts_by_name: Dict[str, Set[str]] = {}
+        self._names_by_host: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def from_catalog(cls, catalog: Any, **kwargs: Any) -> 'HostResolver':
+        """
+        Cria um resolvedor sincronizado com o catálogo de hosts.
+
+        Args:
+            catalog: Catálogo com os métodos hosts() e add_listener()
+
+        Returns:
+            Instância de HostResolver
+        """
+        resolver = cls(**kwargs)
+        for host in catalog.hosts():
+            resolver.add_host(host)
+        catalog.add_listener(resolver.on_hosts_changed)
+        return resolver
+
+    def __len__(self) -> int:
+        return len(self._names_by_host)
+
+    def add_host(self, host: Dict[str, Any]) -> None:
+        """
+        Adiciona (ou atualiza) os nomes de um host no índice.
+
+        Args:
+            host: Host com 'hostid', 'host' e 'name'
+        """
+        host_id = str(host['hostid'])
+        names = {
+            name.lower() for name in (host.get('host'), host.get('name')) if name
+        }
+
+        with self._lock:
+            self._remove_names(host_id)
+            for name in names:
+                owners = self._hosts_by_name.get(name)
+                if owners is None:
+                    owners = self._hosts_by_name[name] = set()
+                    grams = trigrams(name)
+                    self._trigrams_by_name[name] = grams
+                    for gram in grams:
+                        self._postings.setdefault(gram, set()).add(name)
+                owners.add(host_id)
+            self._names_by_host[host_id] = names
+
+    def remove_host(self, host_id: str) -> None:
+        """
+        Remove os nomes de um host do índice.
+
+        Args:
+            host_id: ID do host
+        """
+        with self._lock:
+            self._remove_names(str(host_id))
+            self._names_by_host.pop(str(host_id), None)
+
+    def _remove_names(self, host_id: str) -> None:
+        for name in self._names_by_host.get(host_id, ()):
+            owners = self._hosts_by_name.get(name)
+            if owners is None:
+                continue
+            owners.discard(host_id)
+            if owners:
+                continue
+
+            # Nenhum outro host usa o nome: remove-o das listas de trigramas
+            del self._hosts_by_name[name]
+            for gram in self._trigrams_by_name.pop(name, ()):
+                names = self._postings.get(gram)
+                if names is not None:
+                    names.discard(name)
+                    if not names:
+                        del self._postings[gram]
+
+    def on_hosts_changed(self, updated: List[Dict[str, Any]], removed: List[Dict[str, Any]]) -> None:
+        """Callback do catálogo: aplica as alterações de hosts"""
+        for host in removed:
+            self.remove_host(host['hostid'])
+        for host in updated:
+            self.add_host(host)
+
+    def exact_ids(self, mention: Optional[str]) -> List[str]:
+        """
+        Retorna os IDs dos hosts cujo nome técnico ou visível é idêntico à menção.
+
+        Args:
+            mention: Nome mencionado na consulta (ou None)
+
+        Returns:
+            Lista de IDs de hosts (vazia se nenhum nome for idêntico)
+        """
+        if not mention:
+            return []
+        with self._lock:
+            return sorted(self._hosts_by_name.get(mention.lower().strip(), ()))
+
+    def containing_ids(self, mention: Optional[str], limit: int = 50) -> List[str]:
+        """
+        Retorna os IDs de todos os hosts com um nome que contém a menção.
+
+        O resultado inclui todos os hosts que um LIKE '%menção%' encontraria
+        no nome técnico ou visível. Quando isso não é possível (menção com
+        menos de 3 caracteres ou mais de `limit` hosts), retorna uma lista
+        vazia para que quem chama use o LIKE.
+
+        Args:
+            mention: Nome mencionado na consulta (ou None)
+            limit: Quantidade máxima de hosts
+
+        Returns:
+            Lista de IDs de hosts
+        """
+        mention = (mention or "").lower().strip()
+        if len(mention) < 3:
+            return []
+
+        # Um nome que contém a menção contém todos os trigramas internos dela
+        inner = {mention[i:i + 3] for i in range(len(mention) - 2)}
+        with self._lock:
+            postings = sorted((self._postings.get(gram, set()) for gram in inner), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+
+            host_ids: Set[str] = set()
+            for name in candidates:
+                if mention in name:
+                    host_ids.update(self._hosts_by_name[name])
+
+        if len(host_ids) > limit:
+            return []
+        return sorted(host_ids)
+
+    def resolve(self, mention: str, limit: int = 50) -> List[Tuple[str, float]]:
+        """
+        Retorna os hosts correspondentes à menção, do mais ao menos similar.
+
+        Um nome idêntico resolve apenas para os seus hosts. Caso contrário são
+        retornados os hosts com similaridade mínima e próxima da melhor
+        (ex: 'web' resolve para web01 e web02; 'db-mastre' para db-master).
+
+        Args:
+            mention: Nome mencionado na consulta
+            limit: Quantidade máxima de hosts retornados
+
+        Returns:
+            Lista de tuplas (hostid, similaridade)
+        """
+        mention = mention.lower().strip()
+        if not mention:
+            return []
+
+        with self._lock:
+            exact = self._hosts_by_name.get(mention)
+            if exact:
+                return [(host_id, 1.0) for host_id in sorted(exact)][:limit]
+
+            query_grams = trigrams(mention)
+            total = len(query_grams)
+
+            # Filtro de prefixo: um nome aceito compartilha ao menos `min_overlap`
+            # trigramas, logo aparece em alguma das listas dos trigramas mais raros.
+            # Menções contidas em um nome compartilham ao menos total - 4 trigramas
+            min_overlap = max(1, min(math.ceil(self.min_similarity * total), total - 4))
+            ordered = sorted(query_grams, key=lambda gram: len(self._postings.get(gram, ())))
+            prefix_size = total - min_overlap + 1
+            remaining = total - prefix_size
+
+            counts: Counter = Counter()
+            for gram in ordered[:prefix_size]:
+                counts.update(self._postings.get(gram, ()))
+
+            scores: Dict[str, float] = {}
+            best = 0.0
+            for name, count in counts.most_common():
+                # Limite superior da pontuação para os candidatos restantes
+                bound = 1.0 if count + remaining >= total - 4 else (count + remaining) / total
+                if bound < max(self.min_similarity, best * RELATIVE_CUTOFF):
+                    break
+
+                name_grams = self._trigrams_by_name[name]
+                common = len(query_grams & name_grams)
+                score = common / (total + len(name_grams) - common)
+                if len(mention) >= 3 and mention in name:
+                    # Menção parcial: quanto maior a parte coberta, maior a pontuação
+                    score = max(score, 0.5 + 0.5 * len(mention) / len(name))
+                if score < self.min_similarity:
+                    continue
+                best = max(best, score)
+                for host_id in self._hosts_by_name[name]:
+                    if score > scores.get(host_id, 0.0):
+                        scores[host_id] = score
+
+        if not scores:
+            return []
+
+        cutoff = max(scores.values()) * RELATIVE_CUTOFF
+        ranked = sorted(
+            ((host_id, round(score, 4)) for host_id, score in scores.items() if score >= cutoff),
+            key=lambda match: (-match[1], match[0])
+        )
+        return ranked[:limit]
+
+    def resolve_ids(self, mention: Optional[str], limit: int = 50) -> List[str]:
+        """
+        Retorna apenas os IDs dos hosts correspondentes à menção.
+
+        Args:
+            mention: Nome mencionado na consulta (ou None)
+            limit: Quantidade máxima de hosts retornados
+
+        Returns:
+            Lista de IDs de hosts (vazia se nada corresponder)
+        """
+        if not mention:
+            return []
+        return [host_id for host_id, _ in self.resolve(mention, limit)]
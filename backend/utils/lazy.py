@@ -0,0 +1,64 @@
+import importlib
+import threading
+from typing import Any, Callable
+
+class LazyProxy:
+    """
+    Objeto global criado apenas no primeiro uso.
+
+    Encaminha o acesso a atributos para o objeto retornado por `factory`,
+    chamada uma única vez (com trava) no primeiro acesso. Permite manter
+    instâncias globais como `api_client` sem importar dependências pesadas
+    nem abrir conexões durante a importação do módulo.
+    """
+
+    __slots__ = ("_factory", "_target", "_lock")
+
+    def __init__(self, factory: Callable[[], Any]):
+        """
+        Args:
+            factory: Função que cria o objeto real
+        """
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _resolve(self) -> Any:
+        target = self._target
+        if target is None:
+            with self._lock:
+                target = self._target
+                if target is None:
+                    target = self._factory()
+                    object.__setattr__(self, "_target", target)
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._resolve(), name, value)
+
+    def __repr__(self) -> str:
+        if self._target is None:
+            return f"<LazyProxy (não inicializado) {self._factory!r}>"
+        return repr(self._target)
+
+def lazy_import(module: str, attribute: str) -> LazyProxy:
+    """
+    Adia a importação de `module` até o primeiro uso de `module.attribute`.
+
+    Args:
+        module: Nome completo do módulo
+        attribute: Nome do objeto no módulo
+
+    Returns:
+        Proxy para o objeto
+    """
+    return LazyProxy(lambda: getattr(importlib.import_module(module), attribute))
+
+def is_initialized(obj: Any) -> bool:
+    """Indica se o objeto já foi criado (objetos comuns sempre estão)"""
+    if isinstance(obj, LazyProxy):
+        return object.__getattribute__(obj, "_target") is not None
+    return True
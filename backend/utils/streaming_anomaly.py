@@ -0,0 +1,248 @@
+import math
+import threading
+import logging
+from collections import deque
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Mesmos padrões de ZabbixAnalyzer.detect_anomalies
+DEFAULT_WINDOW = 10
+DEFAULT_THRESHOLD = 2.0
+
+# Versão do formato de checkpoint
+CHECKPOINT_VERSION = 1
+
+class WindowStats:
+    """
+    Média e variância de uma janela deslizante, atualizadas em O(1).
+
+    Usa o algoritmo de Welford: cada amostra nova entra na soma e, quando a
+    janela está cheia, a mais antiga sai pela operação inversa, sem
+    percorrer a janela.
+    """
+
+    __slots__ = ("size", "values", "mean", "m2")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: deque = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def push(self, value: float) -> None:
+        """Adiciona uma amostra, removendo a mais antiga se a janela estiver cheia"""
+        if len(self.values) == self.size:
+            old = self.values.popleft()
+            n = len(self.values)
+            if n:
+                delta = old - self.mean
+                self.mean -= delta / n
+                self.m2 -= delta * (old - self.mean)
+            else:
+                self.mean = self.m2 = 0.0
+
+        self.values.append(value)
+        delta = value - self.mean
+        self.mean += delta / len(self.values)
+        self.m2 += delta * (value - self.mean)
+        # Erros de arredondamento não podem tornar a variância negativa
+        if self.m2 < 0.0:
+            self.m2 = 0.0
+
+    def std(self) -> float:
+        """Desvio padrão amostral (ddof=1, como o rolling().std() do pandas)"""
+        n = len(self.values)
+        return math.sqrt(self.m2 / (n - 1)) if n > 1 else 0.0
+
+class StreamingAnomalyDetector:
+    """
+    Detector de anomalias incremental, com estado por item.
+
+    Cada amostra é comparada com a média e o desvio padrão das `window`
+    amostras anteriores do mesmo item e marcada como anomalia quando se
+    afasta mais de `threshold` desvios. Ao contrário de
+    ZabbixAnalyzer.detect_anomalies, a janela não é centralizada (as
+    amostras seguintes ainda não existem) e cada atualização custa O(1).
+
+    O estado pode ser salvo com checkpoint() e recuperado com restore();
+    amostras com (clock, ns) igual ou anterior ao último processado são
+    ignoradas, então reenviar um trecho de histórico já visto não altera o
+    estado. Várias amostras no mesmo segundo são distinguidas pelo ns.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, threshold: float = DEFAULT_THRESHOLD,
+                 min_samples: Optional[int] = None):
+        """
+        Args:
+            window: Quantidade de amostras anteriores usadas na estatística
+            threshold: Limite de desvios padrão para considerar um ponto como anomalia
+            min_samples: Amostras necessárias antes de avaliar (padrão: window)
+        """
+        if window < 2:
+            raise ValueError("window deve ser pelo menos 2")
+        self.window = window
+        self.threshold = threshold
+        self.min_samples = max(2, min(min_samples or window, window))
+        self._lock = threading.Lock()
+        self._stats: Dict[str, WindowStats] = {}
+        self._last_seen: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def update(self, item_id: str, clock: int, value: float, ns: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Processa uma amostra de um item.
+
+        Args:
+            item_id: ID do item
+            clock: Timestamp da amostra em segundos
+            value: Valor da amostra
+            ns: Nanossegundos do timestamp (campo ns do histórico do Zabbix)
+
+        Returns:
+            Dicionário com itemid, clock, ns, value, mean, std, score e
+            is_anomaly, ou None se a amostra foi ignorada (repetida, fora
+            de ordem ou não numérica)
+        """
+        value = float(value)
+        if math.isnan(value):
+            return None
+
+        with self._lock:
+            timestamp = (clock, ns)
+            last = self._last_seen.get(item_id)
+            if last is not None and timestamp <= last:
+                return None
+            self._last_seen[item_id] = timestamp
+
+            stats = self._stats.get(item_id)
+            if stats is None:
+                stats = self._stats[item_id] = WindowStats(self.window)
+
+            mean = stats.mean
+            std = stats.std()
+            ready = len(stats) >= self.min_samples
+            stats.push(value)
+
+        deviation = abs(value - mean)
+        if std > 0:
+            score = deviation / std
+        else:
+            score = math.inf if deviation > 0 else 0.0
+
+        return {
+            "itemid": item_id,
+            "clock": clock,
+            "ns": ns,
+            "value": value,
+            "mean": mean,
+            "std": std,
+            "score": score if ready else 0.0,
+            "is_anomaly": ready and deviation > self.threshold * std
+        }
+
+    def update_history(self, item_id: str, history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Processa registros de histórico do Zabbix de um item, em ordem de clock e ns.
+
+        Args:
+            item_id: ID do item
+            history: Registros com 'clock', 'ns' (opcional) e 'value' (como retornados por history.get)
+
+        Returns:
+            Lista das amostras marcadas como anomalia
+        """
+        # Registros malformados (sem clock/valor ou não numéricos) são descartados antes da ordenação
+        samples = []
+        for record in history:
+            try:
+                samples.append((int(record['clock']), int(record.get('ns', 0)), float(record['value'])))
+            except (KeyError, TypeError, ValueError):
+                continue
+        samples.sort(key=lambda sample: (sample[0], sample[1]))
+
+        anomalies = []
+        for clock, ns, value in samples:
+            result = self.update(item_id, clock, value, ns)
+            if result and result["is_anomaly"]:
+                anomalies.append(result)
+        return anomalies
+
+    def forget(self, item_id: str) -> None:
+        """Descarta o estado de um item"""
+        with self._lock:
+            self._stats.pop(item_id, None)
+            self._last_seen.pop(item_id, None)
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """
+        Exporta o estado do detector em formato serializável em JSON.
+
+        Returns:
+            Dicionário com os parâmetros e, por item, o último clock/ns e os
+            valores da janela
+        """
+        with self._lock:
+            items = {}
+            for item_id, stats in self._stats.items():
+                clock, ns = self._last_seen.get(item_id, (None, None))
+                items[item_id] = {"last_clock": clock, "last_ns": ns, "values": list(stats.values)}
+        return {
+            "version": CHECKPOINT_VERSION,
+            "window": self.window,
+            "threshold": self.threshold,
+            "min_samples": self.min_samples,
+            "items": items
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """
+        Substitui o estado atual pelo de um checkpoint.
+
+        As estatísticas são recalculadas a partir dos valores da janela,
+        o que também descarta erros de arredondamento acumulados.
+
+        Args:
+            state: Dicionário retornado por checkpoint()
+        """
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Versão de checkpoint não suportada: {state.get('version')}")
+
+        stats_by_item: Dict[str, WindowStats] = {}
+        last_seen: Dict[str, Tuple[int, int]] = {}
+        for item_id, item in state.get("items", {}).items():
+            stats = WindowStats(self.window)
+            for value in item["values"][-self.window:]:
+                stats.push(float(value))
+            stats_by_item[item_id] = stats
+            if item.get("last_clock") is not None:
+                last_seen[item_id] = (int(item["last_clock"]), int(item.get("last_ns") or 0))
+
+        with self._lock:
+            self._stats = stats_by_item
+            self._last_seen = last_seen
+        logger.info(f"Estado do detector de anomalias restaurado ({len(stats_by_item)} itens)")
+
+    @classmethod
+    def from_checkpoint(cls, state: Dict[str, Any]) -> 'StreamingAnomalyDetector':
+        """
+        Cria um detector com os parâmetros e o estado de um checkpoint.
+
+        Args:
+            state: Dicionário retornado por checkpoint()
+
+        Returns:
+            Instância de StreamingAnomalyDetector
+        """
+        detector = cls(
+            window=state["window"],
+            threshold=state["threshold"],
+            min_samples=state.get("min_samples")
+        )
+        detector.restore(state)
+        return detector
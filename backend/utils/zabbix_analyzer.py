@@ -1,14 +1,22 @@
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
-import matplotlib.pyplot as plt
 import io
 import base64
+import warnings
 from datetime import datetime, timedelta
 import logging
 
+from .downsampling import parse_history
+
 logger = logging.getLogger(__name__)
 
+# Fator de suavização da média móvel exponencial usada nas previsões
+EMA_ALPHA = 0.3
+
+# Quantidade de pontos recentes usados no intervalo de confiança
+CONFIDENCE_WINDOW = 10
+
 class ZabbixAnalyzer:
     """
     Classe utilitária para análise de dados do Zabbix.
@@ -85,14 +93,20 @@ class ZabbixAnalyzer:
     
     @staticmethod
     def generate_trend_prediction(df: pd.DataFrame, value_col: str = 'value', 
-                                periods_ahead: int = 5) -> Tuple[List[float], List[float]]:
+                                periods_ahead: int = 5,
+                                alpha: float = EMA_ALPHA) -> Tuple[List[float], List[float]]:
         """
         Gera uma previsão simples de tendência usando médias móveis.
         
+        A previsão repete o último valor da média móvel exponencial e o
+        intervalo de confiança usa o desvio padrão dos últimos pontos. Para
+        muitas séries de uma vez, use forecast_batch.
+        
         Args:
             df: DataFrame com os dados históricos
             value_col: Nome da coluna com os valores
             periods_ahead: Número de períodos à frente para prever
+            alpha: Fator de suavização da média móvel exponencial
             
         Returns:
             Tupla contendo (valores_previstos, limites_confiança)
@@ -101,28 +115,140 @@ class ZabbixAnalyzer:
             return ([], [])
             
         try:
-            # Usar média móvel exponencial para previsão simples
-            values = df[value_col].values
+            values = df[value_col].to_numpy(dtype=np.float64)
+            forecast, confidence = ZabbixAnalyzer.forecast_batch(
+                values[np.newaxis, :], periods_ahead, alpha
+            )
+            return (forecast[0].tolist(), confidence[0].tolist())
+        except Exception as e:
+            logger.error(f"Erro ao gerar previsão de tendência: {e}")
+            return ([], [])
+    
+    @staticmethod
+    def last_ema(matrix: np.ndarray, alpha: float = EMA_ALPHA) -> np.ndarray:
+        """
+        Último valor da média móvel exponencial de cada linha da matriz.
+        
+        Equivale à recursão ema[i] = alpha * x[i] + (1 - alpha) * ema[i-1],
+        com ema[0] = x[0], mas calculada sem laço: o resultado é a soma dos
+        valores ponderados por alpha * (1 - alpha)^k, onde k é a quantidade de
+        pontos válidos posteriores (o primeiro ponto recebe (1 - alpha)^k).
+        Valores NaN são ignorados, como no ewm(adjust=False, ignore_na=True)
+        do pandas.
+        
+        Args:
+            matrix: Matriz (séries x pontos), alinhada no tempo
+            alpha: Fator de suavização
             
-            # Calcular média móvel exponencial
-            alpha = 0.3  # Fator de suavização
-            ema = [values[0]]
+        Returns:
+            Vetor com o último EMA de cada série (NaN se a série estiver vazia)
+        """
+        matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float64))
+        n_series, n_points = matrix.shape
+        result = np.full(n_series, np.nan)
+        if n_points == 0:
+            return result
+        
+        # Potências de (1 - alpha) indexadas pela quantidade de pontos posteriores
+        decay = np.power(1.0 - alpha, np.arange(n_points, dtype=np.float64))
+        
+        valid = ~np.isnan(matrix)
+        complete = valid.all(axis=1)
+        
+        # Séries completas compartilham os pesos: um único produto matriz-vetor
+        if complete.any():
+            weights = alpha * decay[::-1]
+            weights[0] = decay[-1]
+            result[complete] = matrix[complete] @ weights
+        
+        gaps = np.flatnonzero(~complete & valid.any(axis=1))
+        if len(gaps):
+            sub_valid = valid[gaps]
+            after = np.cumsum(sub_valid[:, ::-1], axis=1)[:, ::-1] - sub_valid
+            weights = alpha * decay[after] * sub_valid
             
-            for i in range(1, len(values)):
-                ema.append(alpha * values[i] + (1 - alpha) * ema[i-1])
+            # O primeiro ponto válido de cada série inicia a média (peso sem alpha)
+            first = sub_valid.argmax(axis=1)
+            rows = np.arange(len(gaps))
+            weights[rows, first] = decay[after[rows, first]]
             
-            # Prever próximos valores
-            last_ema = ema[-1]
-            forecast = [last_ema] * periods_ahead
+            result[gaps] = np.einsum('ij,ij->i', weights, np.where(sub_valid, matrix[gaps], 0.0))
+        
+        return result
+    
+    @staticmethod
+    def forecast_batch(matrix: np.ndarray, periods_ahead: int = 5,
+                       alpha: float = EMA_ALPHA) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Previsão de tendência de várias séries em uma única chamada.
+        
+        Mesmo contrato de generate_trend_prediction, aplicado a cada linha de
+        uma matriz alinhada no tempo (ex: montada com align_history).
+        
+        Args:
+            matrix: Matriz (séries x pontos); NaN marca pontos ausentes
+            periods_ahead: Número de períodos à frente para prever
+            alpha: Fator de suavização da média móvel exponencial
             
-            # Calcular limites de confiança simples (desvio padrão dos últimos n pontos)
-            std = np.std(values[-10:]) if len(values) >= 10 else np.std(values)
-            confidence = [1.96 * std] * periods_ahead  # 95% de confiança
+        Returns:
+            Tupla (previsões, limites de confiança), ambas com forma
+            (séries x periods_ahead)
+        """
+        matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float64))
+        last = ZabbixAnalyzer.last_ema(matrix, alpha)
+        
+        # Desvio padrão dos últimos pontos de cada série (95% de confiança)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # Séries sem pontos recentes
+            std = np.nanstd(matrix[:, -CONFIDENCE_WINDOW:], axis=1)
+        
+        forecast = np.repeat(last[:, np.newaxis], periods_ahead, axis=1)
+        confidence = np.repeat((1.96 * std)[:, np.newaxis], periods_ahead, axis=1)
+        return (forecast, confidence)
+    
+    @staticmethod
+    def align_history(history_by_item: Dict[str, List[Dict[str, Any]]], interval: int,
+                      time_from: Optional[int] = None,
+                      time_till: Optional[int] = None) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Alinha o histórico de vários itens em uma grade de tempo comum.
+        
+        Cada célula recebe a média dos valores do item no intervalo; células
+        sem valores ficam com NaN.
+        
+        Args:
+            history_by_item: Histórico por item (ex: db_client.get_items_history)
+            interval: Largura de cada intervalo da grade em segundos
+            time_from: Início da grade (padrão: primeiro registro)
+            time_till: Fim da grade (padrão: último registro)
             
-            return (forecast, confidence)
-        except Exception as e:
-            logger.error(f"Erro ao gerar previsão de tendência: {e}")
-            return ([], [])
+        Returns:
+            Tupla (IDs dos itens, timestamps da grade, matriz itens x intervalos)
+        """
+        item_ids = list(history_by_item)
+        parsed = [parse_history(history_by_item[item_id]) for item_id in item_ids]
+        
+        clocks_all = [clocks for clocks, _ in parsed if len(clocks)]
+        if not clocks_all:
+            return (item_ids, np.empty(0, dtype=np.int64), np.full((len(item_ids), 0), np.nan))
+        
+        start = time_from if time_from is not None else min(int(clocks.min()) for clocks in clocks_all)
+        end = time_till if time_till is not None else max(int(clocks.max()) for clocks in clocks_all)
+        columns = (end - start) // interval + 1
+        
+        matrix = np.full((len(item_ids), columns), np.nan)
+        for row, (clocks, values) in enumerate(parsed):
+            keep = (clocks >= start) & (clocks <= end) & ~np.isnan(values)
+            if not keep.any():
+                continue
+            bins = (clocks[keep] - start) // interval
+            sums = np.bincount(bins, weights=values[keep], minlength=columns)
+            counts = np.bincount(bins, minlength=columns)
+            filled = counts > 0
+            matrix[row, filled] = sums[filled] / counts[filled]
+        
+        grid = start + np.arange(columns, dtype=np.int64) * interval
+        return (item_ids, grid, matrix)
     
     @staticmethod
     def generate_chart(df: pd.DataFrame, value_col: str = 'value', 
@@ -131,6 +257,28 @@ class ZabbixAnalyzer:
         """
         Gera um gráfico a partir dos dados e o retorna como uma string base64.
         
+        Mantido por compatibilidade; prefira generate_chart_bytes, que evita
+        a codificação em base64.
+        
+        Args:
+            Os mesmos de generate_chart_bytes (sempre em formato PNG)
+            
+        Returns:
+            String base64 do gráfico em formato PNG
+        """
+        image = ZabbixAnalyzer.generate_chart_bytes(
+            df, value_col, time_col, title, include_prediction, periods_ahead
+        )
+        return base64.b64encode(image).decode('utf-8') if image else ""
+    
+    @staticmethod
+    def generate_chart_bytes(df: pd.DataFrame, value_col: str = 'value', 
+                             time_col: str = 'timestamp', title: str = 'Dados do Zabbix',
+                             include_prediction: bool = False, periods_ahead: int = 5,
+                             image_format: str = 'png') -> bytes:
+        """
+        Gera um gráfico a partir dos dados e retorna os bytes da imagem.
+        
         Args:
             df: DataFrame com os dados
             value_col: Nome da coluna com os valores
@@ -138,12 +286,16 @@ class ZabbixAnalyzer:
             title: Título do gráfico
             include_prediction: Se deve incluir previsão de tendência
             periods_ahead: Número de períodos à frente para prever
+            image_format: Formato da imagem ('png' ou 'svg')
             
         Returns:
-            String base64 do gráfico em formato PNG
+            Bytes da imagem (vazio em caso de erro ou sem dados)
         """
         if df.empty or value_col not in df.columns or time_col not in df.columns:
-            return ""
+            return b""
+        
+        # Importado apenas ao gerar gráficos (evita o custo na importação do módulo)
+        import matplotlib.pyplot as plt
             
         try:
             plt.figure(figsize=(10, 6))
@@ -189,17 +341,15 @@ class ZabbixAnalyzer:
             plt.legend()
             plt.tight_layout()
             
-            # Converter para base64
             buffer = io.BytesIO()
-            plt.savefig(buffer, format='png')
-            buffer.seek(0)
-            image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+            plt.savefig(buffer, format=image_format)
             plt.close()
             
-            return image_base64
+            return buffer.getvalue()
         except Exception as e:
             logger.error(f"Erro ao gerar gráfico: {e}")
-            return ""
+            plt.close()
+            return b""
     
     @staticmethod
     def summarize_problems(problems: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -5,6 +5,9 @@ from typing import Dict, List, Any, Optional, Union, Tuple
 from datetime import datetime
 
 from zabbia.backend.config import settings
+from zabbia.backend.zabbix_projection import FieldProjection
+from zabbia.backend.services.catalog import host_catalog
+from zabbia.backend.utils.lazy import LazyProxy
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +15,75 @@ class ZabbixAPIException(Exception):
     """Exceção específica para erros da API do Zabbix"""
     pass
 
+# Projeções completas: padrão dos métodos cujos resultados são devolvidos
+# sem alteração pelas rotas HTTP (/hosts, /problems), mantendo o contrato público
+HOST_DEFAULT_PROJECTION = FieldProjection(
+    "host_default",
+    "extend",
+    selectInterfaces=["ip", "dns", "useip", "port", "type"],
+    selectGroups="extend",
+    selectTags="extend",
+    selectInventory=True
+)
+
+HOST_DETAIL_PROJECTION = FieldProjection(
+    "host_detail",
+    "extend",
+    selectInterfaces="extend",
+    selectGroups="extend",
+    selectInventory=True
+)
+
+PROBLEM_DEFAULT_PROJECTION = FieldProjection(
+    "problem_default",
+    "extend",
+    selectHosts=["hostid", "name"],
+    selectTags="extend"
+)
+
+TRIGGER_DEFAULT_PROJECTION = FieldProjection(
+    "trigger_default",
+    "extend",
+    selectHosts=["hostid", "name"],
+    selectDependencies="extend"
+)
+
+GRAPH_DEFAULT_PROJECTION = FieldProjection(
+    "graph_default",
+    "extend",
+    selectGraphItems="extend"
+)
+
+# Projeções reduzidas para os pontos de chamada internos (apenas os campos usados)
+HOST_LIST_PROJECTION = FieldProjection(
+    "host_list",
+    ["hostid", "host", "name", "status"],
+    selectInterfaces=["ip", "dns", "useip", "port", "type"]
+)
+
+HOST_REF_PROJECTION = FieldProjection(
+    "host_ref",
+    ["hostid", "host", "name"]
+)
+
+PROBLEM_LIST_PROJECTION = FieldProjection(
+    "problem_list",
+    ["eventid", "objectid", "name", "severity", "clock", "acknowledged"],
+    selectHosts=["hostid", "name"]
+)
+
+TRIGGER_LIST_PROJECTION = FieldProjection(
+    "trigger_list",
+    ["triggerid", "description", "priority", "value", "lastchange", "status"],
+    selectHosts=["hostid", "name"]
+)
+
+GRAPH_LIST_PROJECTION = FieldProjection(
+    "graph_list",
+    ["graphid", "name", "width", "height", "graphtype"],
+    selectGraphItems=["itemid", "color", "sortorder"]
+)
+
 class ZabbixAPIClient:
     """Cliente para interação com a API JSON-RPC do Zabbix
     
@@ -144,29 +216,28 @@ class ZabbixAPIClient:
             logger.error(f"Exceção ao chamar API Zabbix (método {method}): {str(e)}")
             raise ZabbixAPIException(f"Falha ao executar {method}: {str(e)}")
     
-    def get_hosts(self, filter_data: Dict = None) -> List[Dict]:
+    def get_hosts(
+        self, 
+        filter_data: Dict = None, 
+        projection: FieldProjection = HOST_DEFAULT_PROJECTION
+    ) -> List[Dict]:
         """Obtém lista de hosts do Zabbix
         
         Args:
             filter_data: Filtros opcionais para a busca de hosts
+            projection: Campos necessários no ponto de chamada
             
         Returns:
             Lista de hosts
         """
-        params = {
-            "output": "extend",
-            "selectInterfaces": ["ip", "dns", "useip", "port", "type"],
-            "selectGroups": "extend",
-            "selectTags": "extend",
-            "selectInventory": True,
-            "sortfield": "name"
-        }
+        params = projection.to_params()
+        params["sortfield"] = "name"
         
         # Adicionar filtros se fornecidos
         if filter_data:
             params.update(filter_data)
         
-        return self.api_call("host.get", params)
+        return projection.track(self.api_call("host.get", params))
     
     def get_host_groups(self) -> List[Dict]:
         """Obtém grupos de hosts do Zabbix
@@ -211,24 +282,28 @@ class ZabbixAPIClient:
         
         return self.api_call("item.get", params)
     
-    def get_problems(self, severity_from: int = None, severity_till: int = None) -> List[Dict]:
+    def get_problems(
+        self, 
+        severity_from: int = None, 
+        severity_till: int = None,
+        projection: FieldProjection = PROBLEM_DEFAULT_PROJECTION
+    ) -> List[Dict]:
         """Obtém problemas ativos do Zabbix
         
         Args:
             severity_from: Severidade mínima dos problemas (0-5)
             severity_till: Severidade máxima dos problemas (0-5)
+            projection: Campos necessários no ponto de chamada
             
         Returns:
             Lista de problemas ativos
         """
-        params = {
-            "output": "extend",
-            "selectHosts": ["hostid", "name"],
-            "selectTags": "extend",
+        params = projection.to_params()
+        params.update({
             "recent": True,
             "sortfield": ["eventid"],
             "sortorder": "DESC"
-        }
+        })
         
         # Adicionar filtro por severidade
         if severity_from is not None or severity_till is not None:
@@ -240,25 +315,29 @@ class ZabbixAPIClient:
             for sev in range(min_sev, max_sev + 1):
                 params["severities"].append(sev)
         
-        return self.api_call("problem.get", params)
+        return projection.track(self.api_call("problem.get", params))
     
-    def get_triggers(self, hostids: Union[List[str], str] = None, active: bool = True) -> List[Dict]:
+    def get_triggers(
+        self, 
+        hostids: Union[List[str], str] = None, 
+        active: bool = True,
+        projection: FieldProjection = TRIGGER_DEFAULT_PROJECTION
+    ) -> List[Dict]:
         """Obtém triggers do Zabbix
         
         Args:
             hostids: ID(s) do(s) host(s) para filtrar triggers
             active: Se True, retorna apenas triggers ativos
+            projection: Campos necessários no ponto de chamada
             
         Returns:
             Lista de triggers
         """
-        params = {
-            "output": "extend",
-            "selectHosts": ["hostid", "name"],
-            "selectDependencies": "extend",
+        params = projection.to_params()
+        params.update({
             "expandDescription": True,
             "sortfield": "description"
-        }
+        })
         
         # Adicionar filtro por host
         if hostids:
@@ -270,7 +349,7 @@ class ZabbixAPIClient:
         if active:
             params["filter"] = {"status": 0}  # 0 = enabled
         
-        return self.api_call("trigger.get", params)
+        return projection.track(self.api_call("trigger.get", params))
     
     def get_history(
         self, 
@@ -294,22 +373,27 @@ class ZabbixAPIClient:
         if isinstance(itemids, str):
             itemids = [itemids]
             
-        # Primeiro, obter informações sobre os itens para determinar o tipo
-        items = self.api_call("item.get", {
-            "output": ["itemid", "value_type"],
-            "itemids": itemids
-        })
+        # Obter o tipo dos itens pelo catálogo e consultar a API apenas para os desconhecidos
+        value_types = host_catalog.value_types(itemids)
+        unknown = [itemid for itemid in itemids if str(itemid) not in value_types]
         
-        if not items:
+        if unknown:
+            items = self.api_call("item.get", {
+                "output": ["itemid", "value_type"],
+                "itemids": unknown
+            })
+            for item in items or []:
+                value_types[item["itemid"]] = int(item["value_type"])
+        
+        if not value_types:
             return []
             
         # Agrupar itens por tipo
         items_by_type = {}
-        for item in items:
-            value_type = item["value_type"]
+        for itemid, value_type in value_types.items():
             if value_type not in items_by_type:
                 items_by_type[value_type] = []
-            items_by_type[value_type].append(item["itemid"])
+            items_by_type[value_type].append(itemid)
         
         # Buscar histórico para cada tipo de item
         result = []
@@ -334,44 +418,49 @@ class ZabbixAPIClient:
         
         return result
     
-    def get_host_by_name(self, hostname: str) -> Optional[Dict]:
+    def get_host_by_name(
+        self, 
+        hostname: str, 
+        projection: FieldProjection = HOST_DETAIL_PROJECTION
+    ) -> Optional[Dict]:
         """Obtém um host pelo nome
         
         Args:
             hostname: Nome ou padrão de nome do host
+            projection: Campos necessários no ponto de chamada
             
         Returns:
             Dados do host encontrado ou None
         """
-        params = {
-            "output": "extend",
-            "selectInterfaces": "extend",
-            "selectGroups": "extend",
-            "selectInventory": True,
+        params = projection.to_params()
+        params.update({
             "searchWildcardsEnabled": True,
-            "search": {"name": hostname}
-        }
+            "search": {"name": hostname},
+            "limit": 1
+        })
         
-        hosts = self.api_call("host.get", params)
+        hosts = projection.track(self.api_call("host.get", params))
         
         if hosts:
             return hosts[0]
         return None
     
-    def get_graphs(self, hostids: Union[List[str], str] = None) -> List[Dict]:
+    def get_graphs(
+        self, 
+        hostids: Union[List[str], str] = None,
+        projection: FieldProjection = GRAPH_DEFAULT_PROJECTION
+    ) -> List[Dict]:
         """Obtém gráficos do Zabbix
         
         Args:
             hostids: ID(s) do(s) host(s) para filtrar gráficos
+            projection: Campos necessários no ponto de chamada
             
         Returns:
             Lista de gráficos
         """
-        params = {
-            "output": "extend",
-            "selectGraphItems": "extend",
-            "sortfield": "name"
-        }
+        params = projection.to_params()
+        params["sortfield"] = "name"
         
         # Adicionar filtro por host
         if hostids:
@@ -379,7 +468,7 @@ class ZabbixAPIClient:
                 hostids = [hostids]
             params["hostids"] = hostids
         
-        return self.api_call("graph.get", params)
+        return projection.track(self.api_call("graph.get", params))
     
     def acknowledge_event(
         self, 
@@ -566,5 +655,8 @@ class ZabbixAPIClient:
         """Encerra a sessão HTTP e limpa recursos"""
         self.session.close()
 
-# Criar instância global do cliente
-api_client = ZabbixAPIClient() 
\ No newline at end of file
+# Instância global do cliente, criada (e autenticada) apenas no primeiro uso
+api_client = LazyProxy(ZabbixAPIClient)
+
+# O catálogo de hosts/itens usa o cliente global como fonte de dados
+host_catalog.bind(lambda method, params=None: api_client.api_call(method, params)) 
\ No newline at end of file
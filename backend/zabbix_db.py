@@ -4,6 +4,7 @@ from typing import List, Dict, Any, Optional, Union
 from contextlib import contextmanager
 
 from zabbia.backend.config import settings
+from zabbia.backend.services.catalog import host_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -263,8 +264,28 @@ class ZabbixDBClient:
         Returns:
             Lista com os últimos valores dos itens
         """
-        keys_condition = ' OR '.join([f"i.key_ LIKE '%{key}%'" for key in item_keys])
-        host_condition = f"AND h.host LIKE '%{host_pattern}%'" if host_pattern else ""
+        # Resolver as chaves pelo catálogo evita varreduras LIKE '%chave%' na tabela items;
+        # se o catálogo não conhece nenhum item correspondente, consulta o banco
+        params = []
+        item_ids = []
+        if host_catalog.loaded:
+            item_ids = sorted({
+                item['itemid']
+                for key in item_keys
+                for item in host_catalog.items_containing(key)
+            })
+            
+        if item_ids:
+            keys_condition = f"i.itemid IN ({', '.join(['%s'] * len(item_ids))})"
+            params.extend(item_ids)
+        else:
+            keys_condition = ' OR '.join(["i.key_ LIKE %s"] * len(item_keys))
+            params.extend(f"%{key}%" for key in item_keys)
+            
+        host_condition = ""
+        if host_pattern:
+            host_condition = "AND h.host LIKE %s"
+            params.append(f"%{host_pattern}%")
         
         query = f"""
         SELECT 
@@ -287,7 +308,7 @@ class ZabbixDBClient:
             h.host, i.name
         """
         
-        return self.execute_query(query)
+        return self.execute_query(query, tuple(params))
     
     def generate_availability_report(self, period_days: int = 30) -> List[Dict[str, Any]]:
         """Gera relatório de disponibilidade dos hosts
@@ -0,0 +1,214 @@
+import os
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Union, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Métodos select* cujo nome da chave no resultado não segue a regra padrão
+_SELECT_RESULT_KEYS = {
+    "selectGraphItems": "gitems",
+    "selectParentTemplates": "parentTemplates",
+    "selectHostGroups": "hostgroups",
+}
+
+def _result_key(select_param: str) -> str:
+    """Converte um parâmetro select* no nome da chave retornada pela API
+
+    Args:
+        select_param: Nome do parâmetro (ex: selectInterfaces)
+
+    Returns:
+        Nome da chave no resultado (ex: interfaces)
+    """
+    if select_param in _SELECT_RESULT_KEYS:
+        return _SELECT_RESULT_KEYS[select_param]
+    name = select_param[len("select"):]
+    return name[:1].lower() + name[1:]
+
+class ProjectionTracker:
+    """Registra os campos efetivamente lidos pelos pontos de chamada
+
+    Ativo apenas em modo de depuração (variável ZABBIA_PROJECTION_DEBUG=true).
+    Permite identificar campos que são buscados na API do Zabbix mas nunca usados.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """Inicializa o rastreador
+
+        Args:
+            enabled: Se True, os resultados das chamadas são instrumentados
+        """
+        self.enabled = enabled
+        self._fetched: Dict[str, set] = {}
+        self._used: Dict[str, set] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, fields: Iterable[str]) -> None:
+        """Registra os campos solicitados por uma projeção"""
+        with self._lock:
+            self._fetched.setdefault(name, set()).update(fields)
+            self._used.setdefault(name, set())
+
+    def mark_used(self, name: str, field: str) -> None:
+        """Marca um campo como lido pelo ponto de chamada"""
+        with self._lock:
+            self._used.setdefault(name, set()).add(field)
+
+    def report(self) -> Dict[str, List[str]]:
+        """Retorna os campos buscados mas nunca lidos, por projeção
+
+        Returns:
+            Dicionário {nome da projeção: lista de campos não utilizados}
+        """
+        with self._lock:
+            report = {
+                name: sorted(fields - self._used.get(name, set()))
+                for name, fields in self._fetched.items()
+            }
+
+        for name, unused in report.items():
+            if unused:
+                logger.debug(f"Projeção '{name}' buscou campos não utilizados: {', '.join(unused)}")
+
+        return report
+
+    def reset(self) -> None:
+        """Limpa os registros acumulados"""
+        with self._lock:
+            self._fetched.clear()
+            self._used.clear()
+
+class _TrackedRecord(dict):
+    """Dicionário que informa ao rastreador quais chaves foram lidas"""
+
+    def __init__(self, data: Dict[str, Any], name: str, prefix: str, tracker: ProjectionTracker):
+        super().__init__(data)
+        self._name = name
+        self._prefix = prefix
+        self._tracker = tracker
+
+    def _mark(self, key: Any) -> None:
+        self._tracker.mark_used(self._name, f"{self._prefix}{key}")
+
+    def __getitem__(self, key):
+        self._mark(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self._mark(key)
+        return super().get(key, default)
+
+    def _mark_all(self) -> None:
+        # Iteração, items() e cópias expõem todos os campos (ex: serialização da resposta)
+        for key in super().keys():
+            self._mark(key)
+
+    def __iter__(self):
+        self._mark_all()
+        return super().__iter__()
+
+    def items(self):
+        self._mark_all()
+        return super().items()
+
+    def values(self):
+        self._mark_all()
+        return super().values()
+
+    def copy(self):
+        self._mark_all()
+        return dict(super().items())
+
+class FieldProjection:
+    """Projeção de campos para os métodos *.get da API do Zabbix
+
+    Cada ponto de chamada declara apenas os campos de que precisa e o cliente
+    monta os parâmetros `output` e `select*` mínimos, em vez de `output: extend`.
+    """
+
+    def __init__(self, name: str, output: Union[List[str], str], **selects: Any):
+        """Inicializa a projeção
+
+        Args:
+            name: Nome do ponto de chamada (usado nos relatórios de depuração)
+            output: Campos do objeto principal
+            **selects: Parâmetros select* (ex: selectInterfaces=["ip"])
+        """
+        self.name = name
+        self.output = output if isinstance(output, str) else list(output)
+        self.selects = {key: value for key, value in selects.items() if key.startswith("select")}
+
+    def to_params(self) -> Dict[str, Any]:
+        """Monta os parâmetros de saída para a chamada à API
+
+        Returns:
+            Dicionário com `output` e os parâmetros select*
+        """
+        params: Dict[str, Any] = {
+            "output": self.output if isinstance(self.output, str) else list(self.output)
+        }
+        for key, value in self.selects.items():
+            params[key] = list(value) if isinstance(value, (list, tuple)) else value
+        return params
+
+    def extend(self, name: Optional[str] = None, output: Optional[List[str]] = None, **selects: Any) -> 'FieldProjection':
+        """Cria uma nova projeção a partir desta, com campos adicionais
+
+        Args:
+            name: Nome da nova projeção (opcional)
+            output: Campos adicionais do objeto principal
+            **selects: Parâmetros select* adicionais ou substitutos
+
+        Returns:
+            Nova instância de FieldProjection
+        """
+        base_output = [] if isinstance(self.output, str) else list(self.output)
+        merged_output = base_output + [f for f in (output or []) if f not in base_output]
+        merged_selects = dict(self.selects)
+        merged_selects.update(selects)
+        return FieldProjection(name or self.name, merged_output, **merged_selects)
+
+    def fields(self) -> List[str]:
+        """Lista os campos solicitados, com os sub-campos no formato chave.campo"""
+        fields = [] if isinstance(self.output, str) else list(self.output)
+        for key, value in self.selects.items():
+            result_key = _result_key(key)
+            if isinstance(value, (list, tuple)):
+                fields.extend(f"{result_key}.{field}" for field in value)
+            else:
+                fields.append(result_key)
+        return fields
+
+    def track(self, records: Optional[List[Dict[str, Any]]]) -> Optional[List[Dict[str, Any]]]:
+        """Instrumenta os registros retornados quando o modo de depuração está ativo
+
+        Args:
+            records: Registros retornados pela API
+
+        Returns:
+            Os mesmos registros (instrumentados em modo de depuração)
+        """
+        if not projection_tracker.enabled or not records:
+            return records
+
+        projection_tracker.register(self.name, self.fields())
+        select_keys = {_result_key(key) for key, value in self.selects.items() if isinstance(value, (list, tuple))}
+
+        tracked = []
+        for record in records:
+            data = dict(record)
+            for key in select_keys:
+                nested = data.get(key)
+                if isinstance(nested, list):
+                    data[key] = [
+                        _TrackedRecord(item, self.name, f"{key}.", projection_tracker) if isinstance(item, dict) else item
+                        for item in nested
+                    ]
+            tracked.append(_TrackedRecord(data, self.name, "", projection_tracker))
+        return tracked
+
+# Rastreador global de uso dos campos
+projection_tracker = ProjectionTracker(
+    enabled=os.getenv("ZABBIA_PROJECTION_DEBUG", "False").lower() == "true"
+)